@@ -0,0 +1,14 @@
+from .b_mapper import RowMapperBenchmark
+from .b_memory import ReserveMemoryBenchmark
+from .b_render import ListRenderBenchmark
+from .b_timeline import ReserveTimelineBenchmark
+from .b_load import BookingLoadBenchmark
+from .b_adapters import AdapterBenchmark, SeasonHistory
+from .b_e2e import EndToEndBenchmark
+from .load import LoadGenerator
+from .fake_api import FakeTelegramServer
+
+if __name__ == "__main__":
+    RowMapperBenchmark, ReserveMemoryBenchmark, ListRenderBenchmark
+    ReserveTimelineBenchmark, BookingLoadBenchmark, LoadGenerator
+    AdapterBenchmark, SeasonHistory, EndToEndBenchmark, FakeTelegramServer
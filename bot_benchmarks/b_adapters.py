@@ -0,0 +1,257 @@
+import os
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+from datetime import time as day_time
+
+from .base_benchmark import BaseBenchmark, percentile
+from wakebot.adapters.sqlite import SqliteWakeAdapter, SqliteSupboardAdapter
+from wakebot.adapters.sqlite import SqliteUserAdapter
+from wakebot.entities import Wake, Supboard, User
+
+
+class SeasonHistory:
+    """Synthetic reservation history generator
+
+    A season is a working period of a station (season_days long)
+    repeated every year. The last season is centered at today, so
+    a half of it is active (in the future).
+
+    Attributes:
+        seasons:
+            An integer count of seasons (years).
+        density:
+            An integer count of reservations per a season day.
+        user_count:
+            An integer count of users.
+        random:
+            A random generator of reservation values.
+    """
+
+    season_days = 150
+    first_hour = 9
+    last_hour = 21
+    cancel_rate = 0.05
+
+    def __init__(self, seasons: int = 1, density: int = 20,
+                 user_count: int = 500, seed: int = 1):
+        self.seasons = seasons
+        self.density = density
+        self.user_count = user_count
+        self.random = random.Random(seed)
+
+    @property
+    def days(self) -> iter:
+        """A iterator object of season day dates"""
+        today = date.today()
+        for season in range(self.seasons):
+            first = (today - timedelta(days=365 * season
+                                       + self.season_days // 2))
+            for day in range(self.season_days):
+                yield first + timedelta(days=day)
+
+    def create_users(self) -> list:
+        return [User(f"Firstname{i}", f"Lastname{i}",
+                     phone_number=f"+7999{i:07}", telegram_id=100000 + i)
+                for i in range(self.user_count)]
+
+    def create_start(self) -> day_time:
+        hours = self.last_hour - self.first_hour
+        return day_time(self.first_hour + self.random.randrange(hours),
+                        self.random.randrange(6) * 10)
+
+    def create_wake(self, user: User, start_date: date) -> Wake:
+        return Wake.from_values(None, user, start_date, self.create_start(),
+                                self.random.choice(("set", "hour")),
+                                self.random.randint(1, 3),
+                                self.random.randint(0, 1),
+                                self.random.randint(0, 1))
+
+    def create_supboard(self, user: User, start_date: date) -> Supboard:
+        return Supboard.from_values(None, user, start_date,
+                                    self.create_start(),
+                                    self.random.choice(("set", "hour")),
+                                    self.random.randint(1, 2),
+                                    self.random.randint(1, 3))
+
+    def seed(self, wake_adapter, sup_adapter, user_adapter) -> dict:
+        """Fill a storage with a synthetic history
+
+        Returns:
+            A dictionary of stored users, wake and supboard reservations
+        """
+        users = [user_adapter.append_data(user)
+                 for user in self.create_users()]
+        result = {"users": users, "wake": [], "supboard": []}
+
+        for day in self.days:
+            for _ in range(self.density):
+                for name, adapter, create in (
+                        ("wake", wake_adapter, self.create_wake),
+                        ("supboard", sup_adapter, self.create_supboard)):
+                    reserve = create(self.random.choice(users), day)
+                    canceled = self.random.random() < self.cancel_rate
+                    reserve = adapter.append_data(reserve)
+                    if canceled:
+                        reserve.canceled = True
+                        adapter.update_data(reserve)
+                    result[name].append(reserve)
+
+        return result
+
+
+class AdapterBenchmark(BaseBenchmark):
+    """Storage adapters over synthetic seasons"""
+
+    # A scenario name: (seasons, reservations per a day)
+    scenarios = {
+        "season": (1, 20),
+        "dense_season": (1, 100),
+        "five_years": (5, 20),
+    }
+    call_count = 200
+    page_size = 21
+
+    def create_sqlite_adapters(self) -> tuple:
+        connection = sqlite3.connect(":memory:")
+        return (SqliteWakeAdapter(connection),
+                SqliteSupboardAdapter(connection),
+                SqliteUserAdapter(connection))
+
+    def create_postgres_adapters(self, database_url: str) -> tuple:
+        import psycopg2
+        from wakebot.adapters.postgres import PostgressWakeAdapter
+        from wakebot.adapters.postgres import PostgressSupboardAdapter
+        from wakebot.adapters.postgres import PostgresUserAdapter
+
+        connection = psycopg2.connect(database_url)
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_wake_reserves, "
+                           "bench_sup_reserves, bench_users")
+        connection.commit()
+
+        return (PostgressWakeAdapter(connection,
+                                     table_name="bench_wake_reserves"),
+                PostgressSupboardAdapter(connection,
+                                         table_name="bench_sup_reserves"),
+                PostgresUserAdapter(connection, table_name="bench_users"))
+
+    def drop_postgres_tables(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE bench_wake_reserves, "
+                           "bench_sup_reserves, bench_users")
+        connection.commit()
+        connection.close()
+
+    def time_calls(self, func, args_list: list) -> dict:
+        """Get a per-call latency statistics of a callable in milliseconds"""
+        latencies = []
+        for args in args_list:
+            start = time.perf_counter()
+            func(*args)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        return {"calls": len(latencies),
+                "mean_ms": sum(latencies) / len(latencies),
+                "p50_ms": percentile(latencies, 50),
+                "p95_ms": percentile(latencies, 95),
+                "max_ms": max(latencies)}
+
+    def time_reserve_adapter(self, adapter, reserves: list,
+                             history: SeasonHistory, create) -> dict:
+        sample = [history.random.choice(reserves)
+                  for _ in range(self.call_count)]
+        users = [reserve.user for reserve in sample]
+
+        def get_all_active():
+            return list(adapter.get_active_reserves())
+
+        def get_active_page():
+            return list(adapter.get_active_reserves(limit=self.page_size))
+
+        def get_concurrent_reserves(reserve):
+            return list(adapter.get_concurrent_reserves(reserve))
+
+        def update(reserve):
+            reserve.set_count = reserve.set_count % 3 + 1
+            adapter.update_data(reserve)
+
+        today = date.today()
+        new_reserves = [(create(user, today + timedelta(days=1)),)
+                        for user in users]
+        calls = [("get_active_reserves", get_all_active,
+                  [()] * (self.call_count // 10)),
+                 ("get_active_reserves_page", get_active_page,
+                  [()] * self.call_count),
+                 ("get_concurrent_count", adapter.get_concurrent_count,
+                  [(reserve,) for reserve in sample]),
+                 ("get_concurrent_reserves", get_concurrent_reserves,
+                  [(reserve,) for reserve in sample]),
+                 ("append_data", adapter.append_data, new_reserves),
+                 ("update_data", update, [(reserve,) for reserve in sample])]
+
+        return {name: self.time_calls(func, args_list)
+                for name, func, args_list in calls}
+
+    def check_canceled(self, adapter, history: SeasonHistory):
+        """Check a stored share of canceled reservations of a seeding"""
+        stored = list(adapter.get_data())
+        canceled = sum(reserve.canceled for reserve in stored)
+        rate = canceled / len(stored)
+        assert abs(rate - history.cancel_rate) < history.cancel_rate / 2, (
+            f"Seeded canceled rate is {rate:.3f}, "
+            f"expected {history.cancel_rate}")
+
+    def run_scenario(self, adapters: tuple, seasons: int,
+                     density: int) -> dict:
+        """Seed a storage and time every adapter method
+
+        Returns:
+            A dictionary of seeding and per-method statistics
+        """
+        wake_adapter, sup_adapter, user_adapter = adapters
+        history = SeasonHistory(seasons, density)
+
+        start = time.perf_counter()
+        seeded = history.seed(wake_adapter, sup_adapter, user_adapter)
+        self.check_canceled(wake_adapter, history)
+        result = {"seasons": seasons,
+                  "density": density,
+                  "reserves": len(seeded["wake"]) + len(seeded["supboard"]),
+                  "seed_seconds": time.perf_counter() - start}
+
+        result["wake"] = self.time_reserve_adapter(
+            wake_adapter, seeded["wake"], history, history.create_wake)
+        result["supboard"] = self.time_reserve_adapter(
+            sup_adapter, seeded["supboard"], history,
+            history.create_supboard)
+
+        telegram_ids = [(history.random.choice(seeded["users"]).telegram_id,)
+                        for _ in range(self.call_count)]
+        result["user"] = {"get_user_by_telegram_id": self.time_calls(
+            user_adapter.get_user_by_telegram_id, telegram_ids)}
+
+        return result
+
+    def bench_sqlite(self):
+        """SQLite adapters"""
+        return {name: self.run_scenario(self.create_sqlite_adapters(),
+                                        seasons, density)
+                for name, (seasons, density) in self.scenarios.items()}
+
+    def bench_postgres(self):
+        """PostgreSQL adapters"""
+        database_url = os.environ.get("DATABASE_URL")
+        if not database_url:
+            return {"skipped": "DATABASE_URL is not set"}
+
+        result = {}
+        for name, (seasons, density) in self.scenarios.items():
+            adapters = self.create_postgres_adapters(database_url)
+            try:
+                result[name] = self.run_scenario(adapters, seasons, density)
+            finally:
+                self.drop_postgres_tables(adapters[0].connection)
+
+        return result
@@ -0,0 +1,26 @@
+from .base_benchmark import BaseBenchmark
+from .e2e import run_scenario
+from .fake_api import FakeTelegramServer
+
+
+class EndToEndBenchmark(BaseBenchmark):
+    """Booking flows through a fake Bot API server"""
+
+    user_count = 100
+
+    async def run(self, server: FakeTelegramServer) -> dict:
+        report = await run_scenario(server, self.user_count, timeout=5.0)
+        steps = report.pop("steps")
+        for name, latency in steps.items():
+            report[f"{name} p50/p95/p99 ms"] = (
+                f"{latency['p50']}/{latency['p95']}/{latency['p99']}")
+
+        return report
+
+    async def bench_local_api(self):
+        """Instant Bot API"""
+        return await self.run(FakeTelegramServer())
+
+    async def bench_slow_api(self):
+        """Bot API with 50 ms latency"""
+        return await self.run(FakeTelegramServer(latency=0.05))
@@ -0,0 +1,18 @@
+from .base_benchmark import BaseBenchmark
+from .load import LoadGenerator
+
+
+class BookingLoadBenchmark(BaseBenchmark):
+    """Concurrent booking flows"""
+
+    user_count = 200
+
+    async def bench_booking_flows(self):
+        """Wake and supboard booking flows"""
+        report = await LoadGenerator(self.user_count).run()
+        handlers = report.pop("handlers")
+        for name, latency in handlers.items():
+            report[f"{name} p50/p95/p99 ms"] = (
+                f"{latency['p50']}/{latency['p95']}/{latency['p99']}")
+
+        return report
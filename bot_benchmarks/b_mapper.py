@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from .base_benchmark import BaseBenchmark
+from wakebot.adapters.mapper import RowMapper
+from wakebot.adapters.postgres import PostgressWakeAdapter
+from wakebot.entities import Wake, User
+
+
+class RowMapperBenchmark(BaseBenchmark):
+    """Row to entity mapping"""
+
+    row_count = 100000
+
+    def setUp(self):
+        self.columns = PostgressWakeAdapter.columns
+        self.mapper = RowMapper(self.columns,
+                                PostgressWakeAdapter.create_wake)
+
+        start = datetime(2021, 6, 1, 10)
+        self.rows = []
+        for i in range(self.row_count):
+            start_time = start + timedelta(minutes=10 * i)
+            end_time = start_time + timedelta(minutes=10)
+            self.rows.append((
+                i, "Firstname", "Lastname", None, "Firstname Lastname",
+                100000 + i, "+7777", start_time, end_time, "set", 1,
+                i % 2, 0, False, None))
+
+    def get_wake_by_index(self, row):
+        """Column lookup by name for every field, a former mapping"""
+        user = User(row[self.columns.index("firstname")])
+        user.lastname = row[self.columns.index("lastname")]
+        user.middlename = row[self.columns.index("middlename")]
+        user.displayname = row[self.columns.index("displayname")]
+        user.telegram_id = row[self.columns.index("telegram_id")]
+        user.phone_number = row[self.columns.index("phone_number")]
+        start = row[self.columns.index("start_time")]
+
+        return Wake(id=row[self.columns.index("id")], user=user,
+                    start_date=start.date(), start_time=start.time(),
+                    set_type_id=row[self.columns.index("set_type_id")],
+                    set_count=row[self.columns.index("set_count")],
+                    board=row[self.columns.index("board")],
+                    hydro=row[self.columns.index("hydro")],
+                    canceled=row[self.columns.index("canceled")],
+                    cancel_telegram_id=row[
+                        self.columns.index("cancel_telegram_id")])
+
+    def get_result(self, seconds: float) -> dict:
+        return {"rows": self.row_count,
+                "seconds": seconds,
+                "rows_per_second": round(self.row_count / seconds)}
+
+    def bench_index_lookup(self):
+        """Map rows by column name lookup"""
+        return self.get_result(self.measure(
+            lambda: [self.get_wake_by_index(row) for row in self.rows]))
+
+    def bench_map_row(self):
+        """Map rows one by one by RowMapper"""
+        return self.get_result(self.measure(
+            lambda: [self.mapper.map_row(row) for row in self.rows]))
+
+    def bench_map_rows(self):
+        """Map rows in a batch by RowMapper"""
+        return self.get_result(self.measure(self.mapper.map_rows, self.rows))
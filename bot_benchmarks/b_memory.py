@@ -0,0 +1,59 @@
+import tracemalloc
+from datetime import date, time
+
+from .base_benchmark import BaseBenchmark
+from wakebot.entities import Wake, User, ReserveSetType
+
+
+class DictUser(User):
+    """A user with an instance dict like before slots"""
+
+
+class DictSetType(ReserveSetType):
+    """A set type with an instance dict"""
+
+
+class DictWake(Wake):
+    """A wakeboard reservation with an instance dict
+    and an own set type like before slots"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_type = DictSetType(self.set_type.set_id,
+                                    self.set_type.minutes)
+
+
+class ReserveMemoryBenchmark(BaseBenchmark):
+    """Reservation memory footprint"""
+
+    reserve_count = 10000
+    repeat = 1
+
+    def get_bytes_per_reserve(self, reserve_class, user_class) -> dict:
+        start_date = date(2021, 6, 1)
+
+        tracemalloc.start()
+        snapshot = tracemalloc.take_snapshot()
+        reserves = []
+        for i in range(self.reserve_count):
+            user = user_class("Firstname", "Lastname",
+                              phone_number="+7777", telegram_id=i)
+            reserves.append(reserve_class(
+                user, start_date, time(10 + i % 10, i % 6 * 10),
+                set_count=1 + i % 3, id=i, board=1))
+
+        stats = tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+        tracemalloc.stop()
+
+        size = sum(stat.size_diff for stat in stats)
+        return {"reserves": len(reserves),
+                "bytes": size,
+                "bytes_per_reserve": round(size / self.reserve_count)}
+
+    def bench_dict_reserves(self):
+        """Reservations with instance dicts"""
+        return self.get_bytes_per_reserve(DictWake, DictUser)
+
+    def bench_slots_reserves(self):
+        """Reservations with slots and shared set types"""
+        return self.get_bytes_per_reserve(Wake, User)
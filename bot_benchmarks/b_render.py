@@ -0,0 +1,51 @@
+from datetime import date, time, timedelta
+
+from .base_benchmark import BaseBenchmark
+from bot_tests.mocks.aiogram import Dispatcher
+from wakebot.adapters.data import MemoryDataAdapter
+from wakebot.adapters.state import StateManager
+from wakebot.entities import Wake, User
+from wakebot.processors import RuWake, WakeProcessor
+
+
+class ListRenderBenchmark(BaseBenchmark):
+    """Reservation list rendering"""
+
+    reserve_count = 10000
+
+    def setUp(self):
+        self.processor = WakeProcessor(Dispatcher(),
+                                       StateManager(MemoryDataAdapter()),
+                                       RuWake)
+        self.user = User("Firstname", phone_number="+7777")
+        self.reserves = self.create_reserves()
+
+    def create_reserves(self) -> list:
+        start_date = date(2021, 6, 1)
+        return [Wake.from_values(i, self.user,
+                                 start_date + timedelta(i // 60),
+                                 time(9 + i % 60 // 6, i % 6 * 10),
+                                 "set", 1 + i % 3, i % 2, i % 3, False, None)
+                for i in range(self.reserve_count)]
+
+    def render(self, reserves: list):
+        self.processor.create_list_text(reserves)
+        for reserve in reserves:
+            str(reserve)
+        for prev, reserve in zip(reserves, reserves[1:]):
+            reserve.check_concurrent(prev)
+
+    def get_result(self, seconds: float) -> dict:
+        return {"reserves": self.reserve_count,
+                "seconds": seconds,
+                "reserves_per_second": round(self.reserve_count / seconds)}
+
+    def bench_render_cold(self):
+        """Render a fresh reservations"""
+        return self.get_result(self.measure(
+            lambda: self.render(self.create_reserves())))
+
+    def bench_render_warm(self):
+        """Render a reservations with cached times"""
+        self.render(self.reserves)
+        return self.get_result(self.measure(self.render, self.reserves))
@@ -0,0 +1,63 @@
+import random
+from datetime import date, time, timedelta
+
+from .base_benchmark import BaseBenchmark
+from wakebot.adapters.timeline import ReserveTimeline, numpy
+from wakebot.entities import Wake, User
+
+
+class ReserveTimelineBenchmark(BaseBenchmark):
+    """Occupancy and conflict computation"""
+
+    reserve_count = 100000
+    pairwise_count = 2000
+    days = 365
+    repeat = 1
+
+    def setUp(self):
+        random.seed(1)
+        user = User("Firstname", phone_number="+7777")
+        first_day = date(2021, 1, 1)
+        self.reserves = [
+            Wake.from_values(i, user,
+                             first_day + timedelta(random.randrange(
+                                 self.days)),
+                             time(random.randint(9, 22),
+                                  random.randrange(0, 60, 10)),
+                             "set", random.randint(1, 3))
+            for i in range(self.reserve_count)]
+        self.first_day = first_day
+
+    def compute(self, use_numpy: bool) -> dict:
+        timeline = ReserveTimeline.from_reserves(self.reserves,
+                                                 use_numpy=use_numpy)
+        result = {}
+        result["occupancy"] = self.measure(
+            timeline.get_day_occupancy, self.first_day, self.days)
+        result["peak"] = self.measure(timeline.get_peak)
+        result["conflicts"] = self.measure(timeline.get_conflicts)
+        result["conflict_pairs"] = len(timeline.get_conflicts())
+
+        return result
+
+    def bench_python(self):
+        """Pure-Python timeline over 100k reservations"""
+        return self.compute(False)
+
+    def bench_numpy(self):
+        """NumPy timeline over 100k reservations"""
+        if not numpy:
+            return {"skipped": "NumPy is not installed"}
+
+        return self.compute(True)
+
+    def bench_pairwise(self):
+        """Pairwise check_concurrent over 2k reservations"""
+        reserves = self.reserves[:self.pairwise_count]
+
+        def check():
+            for i, reserve in enumerate(reserves):
+                for other in reserves[i + 1:]:
+                    reserve.check_concurrent(other)
+
+        return {"reserves": len(reserves), "seconds": self.measure(check)}
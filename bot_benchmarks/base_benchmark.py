@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import inspect
+import time
+import traceback
+
+
+class BaseBenchmark():
+    """A base class for a benchmarks
+
+    Every "bench_*" method is a benchmark. It returns a dict
+    of measured metrics which are printed and collected.
+    """
+    HEADER = '\033[95m'
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+    repeat = 3
+
+    def setUp(self):
+        pass
+
+    def measure(self, func, *args) -> float:
+        """Get the best of repeat run times of a callable in seconds"""
+        best = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            func(*args)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        return best
+
+    def print_result(self, bench_name, result: dict):
+        print(f"{bench_name}: {self.OKGREEN}DONE{self.ENDC}")
+        self.print_metrics(result)
+
+    def print_metrics(self, metrics: dict, indent: int = 4):
+        for metric, value in metrics.items():
+            if isinstance(value, dict):
+                print(" " * indent + f"{metric}:")
+                self.print_metrics(value, indent + 4)
+                continue
+
+            if isinstance(value, float):
+                value = f"{value:.6f}"
+            print(" " * indent + f"{metric}: {self.BOLD}{value}{self.ENDC}")
+
+    def print_error(self, bench_name, error):
+        print(f"{bench_name}: {self.FAIL}ERROR{self.ENDC}\n"
+              f"{self.BOLD}{error}{self.ENDC}")
+
+    def run_benchmarks(self) -> dict:
+        method_list = [getattr(self, bench) for bench in dir(self)
+                       if bench.startswith("bench_")
+                       and callable(getattr(self, bench))]
+
+        print(f"\n{'*'*5} {self.BOLD}Starting benchmarks:{self.ENDC} "
+              f"{self.__doc__} {'*'*5}\n")
+
+        results = {}
+        for bench in method_list:
+            self.setUp()
+            bench_name = bench.__doc__ if bench.__doc__ else bench.__name__
+
+            try:
+                if inspect.iscoroutinefunction(bench):
+                    result = asyncio.run(bench())
+                else:
+                    result = bench()
+                self.print_result(bench_name, result)
+                results[bench.__name__] = result
+            except Exception:
+                self.print_error(bench_name, "\n".join(
+                                 traceback.format_exc().splitlines()))
+
+        print(f"\n{'*'*5} {self.BOLD}End benchmarks:{self.ENDC} "
+              f"{self.__doc__} {'*'*5}\n")
+
+        return results
+
+
+def percentile(values: list, percent: float) -> float:
+    """Get a nearest-rank percentile of a values
+
+    Args:
+        values:
+            A list of numbers.
+        percent:
+            A percentile rank (0-100).
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(int(-(-len(ordered) * percent // 100)), 1)
+    return ordered[rank - 1]
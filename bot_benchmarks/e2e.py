@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import shlex
+import sqlite3
+import sys
+import time
+from datetime import date
+from typing import Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.bot import api
+
+from .base_benchmark import percentile
+from .fake_api import FakeTelegramServer
+from .load import get_booking_steps
+from wakebot.adapters.data import MemoryDataAdapter
+from wakebot.adapters.state import StateManager
+from wakebot.adapters.sqlite import SqliteWakeAdapter, SqliteSupboardAdapter
+from wakebot.adapters.sqlite import SqliteUserAdapter
+from wakebot.processors import RuWake, RuSupboard
+from wakebot.processors import WakeProcessor, SupboardProcessor
+
+
+def create_dispatcher(token: str) -> Dispatcher:
+    """Create a dispatcher with processors on an in-memory SQLite"""
+    connection = sqlite3.connect(":memory:")
+    user_adapter = SqliteUserAdapter(connection)
+    state_manager = StateManager(MemoryDataAdapter())
+
+    dispatcher = Dispatcher(Bot(token))
+    WakeProcessor(dispatcher, state_manager, RuWake,
+                  SqliteWakeAdapter(connection), user_adapter)
+    SupboardProcessor(dispatcher, state_manager, RuSupboard,
+                      SqliteSupboardAdapter(connection), user_adapter)
+
+    return dispatcher
+
+
+class EndToEndScenario:
+    """Booking flows through a fake Bot API server
+
+    Virtual users go through the same booking flow as LoadGenerator,
+    but updates travel through getUpdates of a local Bot API server
+    and replies through HTTP requests of a real aiogram bot, so
+    latencies include the polling and Bot API round trips. A step
+    latency is a time from an update push to a first bot reply
+    (a callback query answer or a sent message).
+
+    Attributes:
+        server:
+            A fake Bot API server the bot is pointed to.
+        user_count:
+            An integer count of virtual users.
+        think_time:
+            A float pause in seconds between user steps.
+        timeout:
+            A float time in seconds a reply is waited for.
+        latencies:
+            A dictionary of step latency lists by a step name.
+        booked, conflicts, timeouts:
+            Integer counts of applied and rejected reservations
+            and of steps without a reply.
+    """
+
+    phone_number = "+79990001122"
+    apply_errors = {"wake": RuWake.apply_error_callback,
+                    "sup": RuSupboard.apply_error_callback}
+
+    def __init__(self, server: FakeTelegramServer, user_count: int = 50,
+                 think_time: float = 0.0, timeout: float = 10.0,
+                 seed: int = 1):
+        self.server = server
+        self.user_count = user_count
+        self.think_time = think_time
+        self.timeout = timeout
+        self.random = random.Random(seed)
+
+        self.latencies = {}
+        self.booked = self.conflicts = self.timeouts = 0
+
+    async def step(self, name: str, chat_id: int, push,
+                   predicate) -> Optional[tuple]:
+        """Push an update and wait for a reply
+
+        Returns:
+            A (method, payload) reply tuple or None on a timeout
+        """
+        start_index = len(self.server.get_chat(chat_id).events)
+        start = time.perf_counter()
+        key = push()
+        try:
+            reply = await self.server.wait_event(
+                chat_id, predicate(key), start_index, self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return None
+
+        self.latencies.setdefault(name, []).append(
+            time.perf_counter() - start)
+        await asyncio.sleep(self.think_time)
+        return reply
+
+    async def send_message(self, name: str, chat_id: int,
+                           text: str) -> Optional[dict]:
+        reply = await self.step(
+            name, chat_id,
+            lambda: self.server.send_message(chat_id, text),
+            lambda _: lambda method, payload: method == "sendMessage")
+        return reply[1] if reply else None
+
+    async def press_button(self, chat_id: int, message_id: int,
+                           data: str) -> Optional[tuple]:
+        def is_reply(callback_id):
+            return lambda method, payload: (
+                method == "sendMessage"
+                or (method == "answerCallbackQuery"
+                    and payload["id"] == callback_id))
+
+        name = data if not data.isdigit() else "#"
+        return await self.step(
+            name, chat_id,
+            lambda: self.server.press_button(chat_id, message_id, data),
+            is_reply)
+
+    async def run_user(self, index: int):
+        """Run a booking flow of a virtual user"""
+        chat_id = 200000 + index
+        command = "wake" if index % 2 else "sup"
+
+        menu = await self.send_message("command", chat_id, f"/{command}")
+        if not menu:
+            return
+
+        for data in get_booking_steps(self.random):
+            if not await self.press_button(chat_id, menu["message_id"],
+                                           data):
+                return
+
+        book = await self.send_message("phone_message", chat_id,
+                                       self.phone_number)
+        if not book:
+            return
+
+        reply = await self.press_button(chat_id, book["message_id"],
+                                        "apply")
+        if not reply:
+            return
+        method, payload = reply
+        if payload.get("text") == self.apply_errors[command]:
+            self.conflicts += 1
+        else:
+            self.booked += 1
+
+    async def run(self) -> dict:
+        """Run all virtual users and get a report"""
+        start = time.perf_counter()
+        await asyncio.gather(*[self.run_user(i)
+                               for i in range(self.user_count)])
+        return self.get_report(time.perf_counter() - start)
+
+    def get_report(self, seconds: float) -> dict:
+        """Get a throughput, latency and Bot API traffic report
+
+        Latencies are in milliseconds.
+        """
+        steps = {}
+        for name, values in sorted(self.latencies.items()):
+            steps[name] = {
+                "count": len(values),
+                "p50": round(percentile(values, 50) * 1000, 3),
+                "p95": round(percentile(values, 95) * 1000, 3),
+                "p99": round(percentile(values, 99) * 1000, 3)}
+
+        updates = sum(len(values) for values in self.latencies.values())
+        return {"date": date.today().isoformat(),
+                "users": self.user_count,
+                "seconds": round(seconds, 3),
+                "updates": updates,
+                "updates_per_second": round(updates / seconds),
+                "booked": self.booked,
+                "conflicts": self.conflicts,
+                "timeouts": self.timeouts,
+                "api_calls": dict(self.server.calls),
+                "floods": self.server.floods,
+                "steps": steps}
+
+
+async def run_scenario(server: FakeTelegramServer, user_count: int = 50,
+                       think_time: float = 0.0, timeout: float = 10.0,
+                       bot_command: Optional[str] = None) -> dict:
+    """Run booking flows against an in-process bot or a bot process
+
+    Args:
+        server:
+            A fake Bot API server (not started).
+        user_count, think_time, timeout:
+            Optional. Scenario parameters, see EndToEndScenario.
+        bot_command:
+            Optional. A command runs a bot process (standalone/bot.py),
+            the server URL is passed in TELEGRAM_API_URL and the token
+            in TOKEN. An in-process bot is run by default.
+
+    Returns:
+        A scenario report
+    """
+    await server.start()
+    process = dispatcher = polling = None
+    api_url = api.API_URL
+    try:
+        if bot_command:
+            env = dict(os.environ, TOKEN=server.token,
+                       TELEGRAM_API_URL=server.api_url)
+            process = await asyncio.create_subprocess_exec(
+                *shlex.split(bot_command), env=env)
+        else:
+            api.API_URL = server.api_url
+            dispatcher = create_dispatcher(server.token)
+            polling = asyncio.ensure_future(
+                dispatcher.start_polling(timeout=1))
+
+        while not server.calls["getUpdates"]:
+            if process and process.returncode is not None:
+                raise RuntimeError(f"The bot exited with code"
+                                   f" {process.returncode}")
+            await asyncio.sleep(0.05)
+
+        scenario = EndToEndScenario(server, user_count, think_time,
+                                    timeout)
+        return await scenario.run()
+
+    finally:
+        if process and process.returncode is None:
+            process.terminate()
+            await process.wait()
+        if dispatcher:
+            dispatcher.stop_polling()
+            await polling
+            await dispatcher.bot.close()
+        api.API_URL = api_url
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Booking flows through a local fake Bot API server")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="a reply timeout in seconds")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="a Bot API method latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--flood-rate", type=float, default=0.0,
+                        help="a probability of a flood error")
+    parser.add_argument("--rate-limit", type=int,
+                        help="a maximum count of Bot API requests"
+                        " per second")
+    parser.add_argument("--bot-command",
+                        help="a bot process command, e.g."
+                        f" \"{sys.executable} standalone/bot.py\","
+                        " an in-process bot is run by default")
+    args = parser.parse_args()
+
+    server = FakeTelegramServer(latency=args.latency, jitter=args.jitter,
+                                flood_rate=args.flood_rate,
+                                rate_limit=args.rate_limit)
+    report = asyncio.run(run_scenario(server, args.users, args.think_time,
+                                      args.timeout, args.bot_command))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+import asyncio
+import json
+import random
+import time
+from collections import Counter, deque
+from itertools import count
+from typing import Callable, Optional
+
+from aiohttp import web
+
+
+class ApiError(Exception):
+    """A Bot API error response"""
+
+    def __init__(self, status: int, description: str,
+                 parameters: Optional[dict] = None):
+        super().__init__(description)
+        self.status = status
+        self.description = description
+        self.parameters = parameters
+
+
+class FakeChat:
+    """A private chat of a fake Bot API server
+
+    Attributes:
+        chat_id:
+            An integer chat (and user) identifier.
+        events:
+            A list of (method, payload) tuples of bot actions in the chat.
+        messages:
+            A dictionary of messages by a message identifier.
+    """
+
+    def __init__(self, chat_id: int):
+        self.chat_id = chat_id
+        self.events = []
+        self.messages = {}
+        self.message_ids = count(1)
+        self.waiters = []
+
+    def add_event(self, method: str, payload: dict):
+        self.events.append((method, payload))
+        for waiter in list(self.waiters):
+            predicate, future = waiter
+            if not future.done() and predicate(method, payload):
+                future.set_result((method, payload))
+                self.waiters.remove(waiter)
+
+
+class FakeTelegramServer:
+    """A local Bot API server for end-to-end load tests
+
+    A subset of the Bot API the bot uses is implemented in memory:
+    getMe, getUpdates, sendMessage, editMessageText,
+    editMessageReplyMarkup, answerCallbackQuery, deleteMessage,
+    setWebhook, deleteWebhook and getWebhookInfo. Virtual users send
+    messages and press buttons with send_message and press_button,
+    and wait for bot actions with wait_event. Webhook delivery is not
+    simulated, a webhook only blocks getUpdates as Telegram does.
+
+    An aiogram bot is pointed to the server by an API URL:
+
+        aiogram.bot.api.API_URL = server.api_url
+
+    Attributes:
+        token:
+            A bot token the server accepts.
+        latency:
+            A float delay in seconds of every method except getUpdates.
+        jitter:
+            A float maximum random addition to the latency.
+        flood_rate:
+            A float probability of a "Too Many Requests" error.
+        rate_limit:
+            Optional. An integer count of requests per second a flood
+            error is returned above (as Telegram limits a bot).
+        retry_after:
+            An integer retry_after of injected flood errors.
+        calls:
+            A counter of called methods.
+        floods:
+            An integer count of injected flood errors.
+    """
+
+    bot_user = {"id": 123456, "is_bot": True, "first_name": "Wakebot",
+                "username": "wakebot"}
+
+    def __init__(self, token: str = "123456:TEST", latency: float = 0.0,
+                 jitter: float = 0.0, flood_rate: float = 0.0,
+                 rate_limit: Optional[int] = None, retry_after: int = 1,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 1):
+        """A local Bot API server for end-to-end load tests
+
+        Args:
+            token:
+                Optional. A bot token the server accepts.
+            latency, jitter:
+                Optional. A float method delay and its random addition
+                in seconds.
+            flood_rate:
+                Optional. A float probability of a flood error.
+            rate_limit:
+                Optional. An integer maximum count of requests per second.
+            retry_after:
+                Optional. An integer retry_after of flood errors.
+            host, port:
+                Optional. An address to listen, a free port by default.
+            seed:
+                Optional. A random seed of injected errors.
+        """
+        self.token = token
+        self.latency = latency
+        self.jitter = jitter
+        self.flood_rate = flood_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.host = host
+        self.port = port
+        self.random = random.Random(seed)
+
+        self.calls = Counter()
+        self.floods = 0
+        self.chats = {}
+        self.webhook_url = ""
+
+        self.__updates = deque()
+        self.__update_ids = count(1)
+        self.__callback_ids = count(1)
+        self.__callback_chats = {}
+        self.__updated = asyncio.Event()
+        self.__requests = deque()
+        self.__runner = None
+        self.methods = {
+            "getMe": self.get_me,
+            "getUpdates": self.get_updates,
+            "sendMessage": self.send_bot_message,
+            "editMessageText": self.edit_message,
+            "editMessageReplyMarkup": self.edit_message,
+            "answerCallbackQuery": self.answer_callback_query,
+            "deleteMessage": self.delete_message,
+            "setWebhook": self.set_webhook,
+            "deleteWebhook": self.delete_webhook,
+            "getWebhookInfo": self.get_webhook_info,
+        }
+
+    @property
+    def api_url(self) -> str:
+        """An aiogram API URL format of the server"""
+        return f"http://{self.host}:{self.port}/bot{{token}}/{{method}}"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        self.__runner = web.AppRunner(app)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.__runner:
+            await self.__runner.cleanup()
+            self.__runner = None
+
+    def get_chat(self, chat_id: int) -> FakeChat:
+        chat = self.chats.get(chat_id)
+        if chat is None:
+            chat = self.chats[chat_id] = FakeChat(chat_id)
+        return chat
+
+    def create_user(self, chat_id: int) -> dict:
+        return {"id": chat_id, "is_bot": False,
+                "first_name": f"User{chat_id}"}
+
+    def push_update(self, **update) -> dict:
+        update["update_id"] = next(self.__update_ids)
+        self.__updates.append(update)
+        self.__updated.set()
+        return update
+
+    def send_message(self, chat_id: int, text: str) -> dict:
+        """Send a user message to the bot
+
+        Returns:
+            A sent message
+        """
+        chat = self.get_chat(chat_id)
+        message = {"message_id": next(chat.message_ids),
+                   "date": int(time.time()),
+                   "chat": {"id": chat_id, "type": "private"},
+                   "from": self.create_user(chat_id),
+                   "text": text}
+        if text.startswith("/"):
+            command = text.split(" ")[0]
+            message["entities"] = [{"type": "bot_command", "offset": 0,
+                                    "length": len(command)}]
+        chat.messages[message["message_id"]] = message
+        self.push_update(message=message)
+        return message
+
+    def press_button(self, chat_id: int, message_id: int, data: str) -> str:
+        """Press an inline button of a bot message
+
+        Returns:
+            A callback query identifier
+        """
+        chat = self.get_chat(chat_id)
+        callback_id = str(next(self.__callback_ids))
+        self.__callback_chats[callback_id] = chat_id
+        self.push_update(callback_query={
+            "id": callback_id, "from": self.create_user(chat_id),
+            "chat_instance": str(chat_id), "data": data,
+            "message": chat.messages.get(message_id) or {
+                "message_id": message_id, "date": 0,
+                "chat": {"id": chat_id, "type": "private"}}})
+        return callback_id
+
+    async def wait_event(self, chat_id: int,
+                         predicate: Callable[[str, dict], bool],
+                         start: int = 0, timeout: float = 10.0) -> tuple:
+        """Wait for a bot action in a chat
+
+        Args:
+            chat_id:
+                An integer chat identifier.
+            predicate:
+                A function of a method and a payload - f(method, payload).
+            start:
+                Optional. An index of chat events to look from.
+            timeout:
+                Optional. A float timeout in seconds.
+
+        Returns:
+            A (method, payload) tuple
+
+        Raises:
+            asyncio.TimeoutError: if there is no such action
+        """
+        chat = self.get_chat(chat_id)
+        for method, payload in chat.events[start:]:
+            if predicate(method, payload):
+                return method, payload
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (predicate, future)
+        chat.waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            if waiter in chat.waiters:
+                chat.waiters.remove(waiter)
+
+    def is_flooded(self) -> bool:
+        if self.flood_rate and self.random.random() < self.flood_rate:
+            return True
+
+        if self.rate_limit:
+            now = time.monotonic()
+            while self.__requests and self.__requests[0] <= now - 1:
+                self.__requests.popleft()
+            if len(self.__requests) >= self.rate_limit:
+                return True
+            self.__requests.append(now)
+
+        return False
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        if request.match_info["token"] != self.token:
+            return self.error_response(ApiError(401, "Unauthorized"))
+
+        handler = self.methods.get(method)
+        if not handler:
+            return self.error_response(
+                ApiError(404, "Not Found: method not found"))
+
+        if request.content_type == "application/json":
+            params = await request.json()
+        else:
+            params = dict(await request.post())
+
+        self.calls[method] += 1
+        try:
+            if method != "getUpdates":
+                await self.delay()
+                if self.is_flooded():
+                    self.floods += 1
+                    raise ApiError(
+                        429, "Too Many Requests: retry after"
+                        f" {self.retry_after}",
+                        {"retry_after": self.retry_after})
+            result = await handler(params)
+        except ApiError as error:
+            return self.error_response(error)
+
+        return web.json_response({"ok": True, "result": result})
+
+    async def delay(self):
+        delay = self.latency + self.random.random() * self.jitter
+        if delay:
+            await asyncio.sleep(delay)
+
+    def error_response(self, error: ApiError) -> web.Response:
+        body = {"ok": False, "error_code": error.status,
+                "description": error.description}
+        if error.parameters:
+            body["parameters"] = error.parameters
+        return web.json_response(body, status=error.status)
+
+    def get_message(self, params: dict) -> tuple:
+        chat = self.get_chat(int(params["chat_id"]))
+        message = chat.messages.get(int(params["message_id"]))
+        if not message:
+            raise ApiError(400, "Bad Request: message to edit not found")
+        return chat, message
+
+    async def get_me(self, params: dict):
+        return self.bot_user
+
+    async def get_updates(self, params: dict):
+        if self.webhook_url:
+            raise ApiError(409, "Conflict: can't use getUpdates method"
+                           " while webhook is active")
+
+        offset = int(params.get("offset") or 0)
+        while self.__updates and self.__updates[0]["update_id"] < offset:
+            self.__updates.popleft()
+
+        timeout = float(params.get("timeout") or 0)
+        if not self.__updates and timeout:
+            self.__updated.clear()
+            try:
+                await asyncio.wait_for(self.__updated.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        limit = int(params.get("limit") or 100)
+        return [update for _, update in zip(range(limit), self.__updates)]
+
+    async def send_bot_message(self, params: dict):
+        chat = self.get_chat(int(params["chat_id"]))
+        message = {"message_id": next(chat.message_ids),
+                   "date": int(time.time()),
+                   "chat": {"id": chat.chat_id, "type": "private"},
+                   "from": self.bot_user,
+                   "text": params.get("text", "")}
+        if params.get("reply_markup"):
+            message["reply_markup"] = json.loads(params["reply_markup"])
+
+        chat.messages[message["message_id"]] = message
+        chat.add_event("sendMessage", message)
+        return message
+
+    async def edit_message(self, params: dict):
+        chat, message = self.get_message(params)
+        edited = dict(message)
+        if "text" in params:
+            edited["text"] = params["text"]
+        reply_markup = params.get("reply_markup")
+        if reply_markup:
+            edited["reply_markup"] = json.loads(reply_markup)
+        else:
+            edited.pop("reply_markup", None)
+
+        if edited == message:
+            raise ApiError(400, "Bad Request: message is not modified")
+
+        chat.messages[message["message_id"]] = edited
+        chat.add_event("editMessageText", edited)
+        return edited
+
+    async def answer_callback_query(self, params: dict):
+        query_id = params["callback_query_id"]
+        chat_id = self.__callback_chats.pop(query_id, None)
+        if chat_id is None:
+            raise ApiError(400, "Bad Request: query is too old and"
+                           " response timeout expired or query ID"
+                           " is invalid")
+
+        self.get_chat(chat_id).add_event(
+            "answerCallbackQuery",
+            {"id": query_id, "text": params.get("text", "")})
+        return True
+
+    async def delete_message(self, params: dict):
+        chat, message = self.get_message(params)
+        del chat.messages[message["message_id"]]
+        chat.add_event("deleteMessage", message)
+        return True
+
+    async def set_webhook(self, params: dict):
+        self.webhook_url = params.get("url", "")
+        return True
+
+    async def delete_webhook(self, params: dict):
+        self.webhook_url = ""
+        return True
+
+    async def get_webhook_info(self, params: dict):
+        return {"url": self.webhook_url, "has_custom_certificate": False,
+                "pending_update_count": len(self.__updates)}
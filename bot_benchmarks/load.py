@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+import time
+from datetime import date
+
+from aiogram import types
+
+from .base_benchmark import percentile
+from bot_tests.mocks.aiogram import Dispatcher, Message, CallbackQuery
+from wakebot.adapters.data import MemoryDataAdapter
+from wakebot.adapters.state import StateManager
+from wakebot.adapters.sqlite import SqliteWakeAdapter, SqliteSupboardAdapter
+from wakebot.adapters.sqlite import SqliteUserAdapter
+from wakebot.processors import RuWake, RuSupboard
+from wakebot.processors import WakeProcessor, SupboardProcessor
+
+
+def get_booking_steps(choices: random.Random) -> list:
+    """Get callback data of booking flow steps before a phone number"""
+    return ["book", "date", str(choices.randint(1, 5)),
+            "time", str(choices.randint(10, 20)),
+            str(choices.randrange(0, 60, 10)), "phone"]
+
+
+class LoadGenerator:
+    """Booking flows load generator
+
+    Virtual users go through a full booking flow concurrently:
+    /wake (or /sup) - book - date - time - hour - minute - phone - apply.
+    Updates are dispatched in-process by a mocked dispatcher to the same
+    handlers and filters the bot registers, so latencies exclude network.
+
+    Attributes:
+        user_count:
+            An integer count of virtual users.
+        think_time:
+            A float pause in seconds between user steps.
+        dispatcher:
+            A mocked dispatcher the processors are registered in.
+        processors:
+            A dictionary of processors by a command.
+        latencies:
+            A dictionary of handler latency lists by a handler name.
+        booked:
+            An integer count of applied reservations.
+        conflicts:
+            An integer count of rejected (conflicted) reservations.
+        unhandled:
+            An integer count of updates without matched handler.
+    """
+
+    phone_number = "+79990001122"
+
+    def __init__(self, user_count: int = 100, think_time: float = 0.0,
+                 wake_adapter=None, sup_adapter=None, user_adapter=None,
+                 sup_count: int = 10, seed: int = 1):
+        """Booking flows load generator
+
+        Args:
+            user_count:
+                Optional. An integer count of virtual users.
+            think_time:
+                Optional. A float pause in seconds between user steps.
+            wake_adapter, sup_adapter, user_adapter:
+                Optional. A storage data adapters, an in-memory SQLite
+                database is used by default.
+            sup_count:
+                Optional. An integer count of supboards.
+            seed:
+                Optional. A random seed of user choices.
+        """
+        self.user_count = user_count
+        self.think_time = think_time
+        self.random = random.Random(seed)
+
+        if not (wake_adapter and sup_adapter and user_adapter):
+            connection = sqlite3.connect(":memory:")
+            wake_adapter = SqliteWakeAdapter(connection)
+            sup_adapter = SqliteSupboardAdapter(connection)
+            user_adapter = SqliteUserAdapter(connection)
+
+        self.dispatcher = Dispatcher()
+        state_manager = StateManager(MemoryDataAdapter())
+        sup_processor = SupboardProcessor(self.dispatcher, state_manager,
+                                          RuSupboard, sup_adapter,
+                                          user_adapter)
+        sup_processor.max_count = sup_count
+        self.processors = {
+            "wake": WakeProcessor(self.dispatcher, state_manager, RuWake,
+                                  wake_adapter, user_adapter),
+            "sup": sup_processor}
+
+        self.latencies = {}
+        self.booked = self.conflicts = self.unhandled = 0
+
+    def record(self, handler, start: float):
+        """Record a handler latency since start"""
+        latency = time.perf_counter() - start
+        if not handler:
+            self.unhandled += 1
+            return
+
+        name = f"{handler.__self__.state_type}.{handler.__name__}"
+        self.latencies.setdefault(name, []).append(latency)
+
+    async def send_message(self, message: Message):
+        start = time.perf_counter()
+        handler = await self.dispatcher.process_message(message)
+        self.record(handler, start)
+
+    async def send_callback_query(self, message: Message,
+                                  from_user: types.User,
+                                  data: str) -> CallbackQuery:
+        callback_query = CallbackQuery.create(message, from_user, data)
+
+        start = time.perf_counter()
+        handler = await self.dispatcher.process_callback_query(
+            callback_query)
+        self.record(handler, start)
+
+        await asyncio.sleep(self.think_time)
+        return callback_query
+
+    async def run_user(self, index: int):
+        """Run a booking flow of a virtual user"""
+        chat = types.Chat()
+        chat.id = 100000 + index
+        user = types.User()
+        user.id = chat.id
+        user.first_name = f"User{index}"
+
+        command = "wake" if index % 2 else "sup"
+        message = Message.create(chat, user, f"/{command}")
+        await self.send_message(message)
+        if not message.answers:
+            return
+        menu = message.answers[0]
+
+        for data in get_booking_steps(self.random):
+            await self.send_callback_query(menu, user, data)
+
+        message = Message.create(chat, user, self.phone_number)
+        await self.send_message(message)
+        if not message.answers:
+            return
+
+        callback_query = await self.send_callback_query(
+            message.answers[0], user, "apply")
+        strings = self.processors[command].strings
+        if callback_query.answer_text == strings.apply_error_callback:
+            self.conflicts += 1
+        else:
+            self.booked += 1
+
+    async def run(self) -> dict:
+        """Run all virtual users and get a report"""
+        start = time.perf_counter()
+        await asyncio.gather(*[self.run_user(i)
+                               for i in range(self.user_count)])
+        return self.get_report(time.perf_counter() - start)
+
+    def get_report(self, seconds: float) -> dict:
+        """Get a throughput and latency report
+
+        Latencies are in milliseconds.
+        """
+        updates = sum(len(values) for values in self.latencies.values())
+        handlers = {}
+        for name, values in sorted(self.latencies.items()):
+            handlers[name] = {
+                "count": len(values),
+                "p50": round(percentile(values, 50) * 1000, 3),
+                "p95": round(percentile(values, 95) * 1000, 3),
+                "p99": round(percentile(values, 99) * 1000, 3)}
+
+        return {"date": date.today().isoformat(),
+                "users": self.user_count,
+                "seconds": round(seconds, 3),
+                "updates": updates,
+                "updates_per_second": round(updates / seconds),
+                "booked": self.booked,
+                "conflicts": self.conflicts,
+                "unhandled": self.unhandled,
+                "handlers": handlers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Booking flows load test")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--sup-count", type=int, default=10)
+    parser.add_argument("--database-url",
+                        help="PostgreSQL database URL, SQLite in memory"
+                        " is used by default")
+    args = parser.parse_args()
+
+    adapters = {}
+    if args.database_url:
+        from wakebot.adapters.postgres import PostgressWakeAdapter
+        from wakebot.adapters.postgres import PostgressSupboardAdapter
+        from wakebot.adapters.postgres import PostgresUserAdapter
+
+        adapters["wake_adapter"] = PostgressWakeAdapter(
+            database_url=args.database_url, table_name="load_wake")
+        adapters["sup_adapter"] = PostgressSupboardAdapter(
+            database_url=args.database_url, table_name="load_supboard")
+        adapters["user_adapter"] = PostgresUserAdapter(
+            database_url=args.database_url, table_name="load_users")
+
+    generator = LoadGenerator(args.users, args.think_time,
+                              sup_count=args.sup_count, **adapters)
+    print(json.dumps(asyncio.run(generator.run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,16 @@
 from .t_adapters import MemoryDataAdapterTestCase
 from .t_state import StateManagerTestCase, StateProviderTestCase
+from .t_occupancy import MemoryOccupancyAdapterTestCase
+from .t_mapper import RowMapperTestCase
+from .t_timeline import ReserveTimelineTestCase
+from .t_tracing import QueryTracerTestCase
 
 if __name__ == "__main__":
     MemoryDataAdapterTestCase
     StateManagerTestCase
 
     StateProviderTestCase
+    MemoryOccupancyAdapterTestCase
+    RowMapperTestCase
+    ReserveTimelineTestCase
+    QueryTracerTestCase
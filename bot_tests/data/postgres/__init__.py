@@ -1,8 +1,12 @@
 from .t_wake import PostgresWakeAdapterTestCase
 from .t_user import PostgresUserAdapterTestCase
 from .t_supboard import PostgresSupboardAdapterTestCase
+from .t_occupancy import PostgresOccupancyAdapterTestCase
+from .t_tracing import PostgresQueryTracerTestCase
 
 if __name__ == "__main__":
     PostgresWakeAdapterTestCase
     PostgresUserAdapterTestCase
     PostgresSupboardAdapterTestCase
+    PostgresOccupancyAdapterTestCase
+    PostgresQueryTracerTestCase
@@ -0,0 +1,87 @@
+import os
+import psycopg2
+from datetime import date, time
+from ...base_test_case import BaseTestCase
+from wakebot.adapters.postgres import PostgresOccupancyAdapter
+from wakebot.adapters.postgres import PostgressWakeAdapter
+from wakebot.entities import Wake, User
+
+
+class PostgresOccupancyAdapterTestCase(BaseTestCase):
+    """PostgresOccupancyAdapter class"""
+    def __init__(self):
+        super().__init__()
+        DATABASE_URL = os.environ["DATABASE_URL"]
+        self.connection = psycopg2.connect(DATABASE_URL)
+
+    def setUp(self):
+        self.drop_table()
+        self.adapter = PostgresOccupancyAdapter(self.connection)
+        self.wake_adapter = PostgressWakeAdapter(
+            self.connection, occupancy_adapter=self.adapter)
+        self.user = User("Firstname", telegram_id=586, phone_number="+77777")
+        self.reserve = Wake(self.user, date.today(), time(10, 0),
+                            set_count=3)
+
+    def drop_table(self):
+        cursor = self.connection.cursor()
+
+        cursor.execute("DROP TABLE IF EXISTS occupancy")
+        cursor.execute("DROP TABLE IF EXISTS wake_reserves")
+
+        self.connection.commit()
+
+    async def test_append_data(self):
+        self.wake_adapter.append_data(self.reserve)
+        self.wake_adapter.append_data(self.reserve)
+
+        passed, alert = self.assert_params(
+            self.wake_adapter.get_day_occupancy(date.today())[120], 2)
+        assert passed, alert
+
+        stored = PostgresOccupancyAdapter(self.connection)
+        passed, alert = self.assert_params(
+            stored.get_day_total("wake_reserves", date.today()), 12)
+        assert passed, alert
+
+    async def test_update_data(self):
+        wake = self.wake_adapter.append_data(self.reserve)
+        wake.start_time = time(12, 0)
+        self.wake_adapter.update_data(wake)
+
+        stored = PostgresOccupancyAdapter(self.connection)
+        slots = stored.get_day_slots("wake_reserves", date.today())
+        passed, alert = self.assert_params((slots[120], slots[144]), (0, 1))
+        assert passed, alert
+
+        wake.canceled = True
+        self.wake_adapter.update_data(wake)
+
+        passed, alert = self.assert_params(
+            self.adapter.get_day_total("wake_reserves", date.today()), 0)
+        assert passed, alert
+
+    async def test_remove_data_by_keys(self):
+        wake = self.wake_adapter.append_data(self.reserve)
+        self.wake_adapter.remove_data_by_keys(wake.id)
+
+        passed, alert = self.assert_params(
+            self.adapter.get_day_total("wake_reserves", date.today()), 0)
+        assert passed, alert
+
+    async def test_rebuild_occupancy(self):
+        wake = self.wake_adapter.append_data(self.reserve)
+        self.wake_adapter.append_data(self.reserve)
+        wake.canceled = True
+        self.wake_adapter.update_data(wake)
+
+        self.wake_adapter.occupancy_adapter = None
+        self.wake_adapter.append_data(self.reserve)
+        self.wake_adapter.occupancy_adapter = self.adapter
+
+        self.wake_adapter.rebuild_occupancy()
+
+        stored = PostgresOccupancyAdapter(self.connection)
+        passed, alert = self.assert_params(
+            stored.get_day_total("wake_reserves", date.today()), 12)
+        assert passed, alert
@@ -81,6 +81,51 @@ class PostgresSupboardAdapterTestCase(BaseTestCase):
             passed, alert = self.assert_params(rows[i - 2], supboards[i])
             assert passed, alert
 
+    async def test_get_active_reserves_page(self):
+        reserves = []
+        self.reserve.start_time = time(datetime.today().time().hour + 1)
+        for i in range(8):
+            self.reserve.start_date = date.today() + timedelta(i // 2)
+            reserves.append(self.adapter.append_data(self.reserve))
+
+        rows = list(self.adapter.get_active_reserves(limit=3))
+        passed, alert = self.assert_params(
+            [row.id for row in rows], [1, 2, 3])
+        assert passed, alert
+
+        page_cursor = (rows[-1].start, rows[-1].id)
+        rows = list(self.adapter.get_active_reserves(page_cursor, limit=3))
+        passed, alert = self.assert_params(
+            [row.id for row in rows], [4, 5, 6])
+        assert passed, alert
+
+        page_cursor = (rows[0].start, rows[0].id)
+        rows = list(self.adapter.get_active_reserves(page_cursor, limit=2,
+                                                     backward=True))
+        passed, alert = self.assert_params(
+            [row.id for row in rows], [2, 3])
+        assert passed, alert
+
+    async def test_get_reserves_between(self):
+        reserves = []
+        for i in range(6):
+            self.reserve.start_date = date.today() + timedelta(i // 2)
+            reserves.append(self.adapter.append_data(self.reserve))
+
+        reserves[3].canceled = True
+        self.adapter.update_data(reserves[3])
+
+        start = datetime.combine(date.today() + timedelta(1), time())
+        end = datetime.combine(date.today() + timedelta(2), time())
+        rows = list(self.adapter.get_reserves_between(start, end))
+        passed, alert = self.assert_params([row.id for row in rows], [3])
+        assert passed, alert
+
+        rows = list(self.adapter.get_reserves_between(
+            start, end, include_canceled=True))
+        passed, alert = self.assert_params([row.id for row in rows], [3, 4])
+        assert passed, alert
+
     async def test_get_data_by_keys(self):
         supboards = []
         for i in range(4):
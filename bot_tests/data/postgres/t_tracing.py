@@ -0,0 +1,61 @@
+import os
+import psycopg2
+from datetime import date, time, timedelta
+from psycopg2 import sql
+from ...base_test_case import BaseTestCase
+from wakebot.adapters.postgres import PostgressWakeAdapter
+from wakebot.adapters.tracing import QueryTracer, TracedConnection
+from wakebot.entities import Wake, User
+
+
+class PostgresQueryTracerTestCase(BaseTestCase):
+    """QueryTracer class of a PostgreSQL connection"""
+    def __init__(self):
+        super().__init__()
+        DATABASE_URL = os.environ["DATABASE_URL"]
+        self.connection = psycopg2.connect(DATABASE_URL)
+
+    def setUp(self):
+        self.drop_table()
+        self.tracer = QueryTracer(slow_threshold=0)
+        self.adapter = PostgressWakeAdapter(
+            TracedConnection(self.connection, self.tracer))
+        self.user = User("Firstname", telegram_id=586, phone_number="+777")
+        self.start_date = date.today() + timedelta(1)
+
+    def drop_table(self):
+        cursor = self.connection.cursor()
+
+        cursor.execute("DROP TABLE IF EXISTS wake_reserves")
+
+        self.connection.commit()
+
+    async def test_execute_values(self):
+        self.tracer.reset()
+        ids = self.adapter.insert_many(
+            [(f"key-{i}", Wake(self.user, self.start_date, time(10 + i),
+                               set_count=1))
+             for i in range(3)])
+
+        passed, alert = self.assert_params(
+            (len(ids), len(list(self.adapter.get_active_reserves()))),
+            (3, 3))
+        assert passed, alert
+
+        insert = [item for item in self.tracer.get_stats()
+                  if item["statement"].startswith("INSERT")][0]
+        passed, alert = self.assert_params(
+            (insert["count"], insert["rows"], insert["callers"]),
+            (1, 3, ["PostgressWakeAdapter.insert_many"]))
+        assert passed, alert
+
+    async def test_composable(self):
+        self.tracer.reset()
+        with self.adapter.connection.cursor() as cursor:
+            cursor.execute(sql.SQL("SELECT {} FROM wake_reserves").format(
+                sql.Identifier("id")))
+            cursor.fetchall()
+
+        passed, alert = self.assert_params(
+            self.tracer.recent[-1].statement, 'SELECT "id" FROM wake_reserves')
+        assert passed, alert
@@ -1,8 +1,10 @@
 from .t_wake import SqliteWakeAdapterTestCase
 from .t_user import SqliteUserAdapterTestCase
 from .t_supboard import SqliteSupboardAdapterTestCase
+from .t_occupancy import SqliteOccupancyAdapterTestCase
 
 if __name__ == "__main__":
     SqliteWakeAdapterTestCase
     SqliteUserAdapterTestCase
     SqliteSupboardAdapterTestCase
+    SqliteOccupancyAdapterTestCase
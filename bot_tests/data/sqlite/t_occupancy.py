@@ -0,0 +1,104 @@
+import sqlite3
+from datetime import date, time
+from ...base_test_case import BaseTestCase
+from wakebot.adapters.sqlite import SqliteOccupancyAdapter
+from wakebot.adapters.sqlite import SqliteWakeAdapter
+from wakebot.entities import Wake, User
+
+
+class SqliteOccupancyAdapterTestCase(BaseTestCase):
+    """SqliteOccupancyAdapter class"""
+    def __init__(self):
+        super().__init__()
+        self.connection = sqlite3.connect("bot_tests/data/sqlite/wake.db")
+
+    def setUp(self):
+        self.drop_table()
+        self.adapter = SqliteOccupancyAdapter(self.connection)
+        self.wake_adapter = SqliteWakeAdapter(self.connection,
+                                              occupancy_adapter=self.adapter)
+        self.user = User("Firstname", telegram_id=586, phone_number="+77777")
+        self.reserve = Wake(self.user, date.today(), time(10, 0),
+                            set_count=3)
+
+    def drop_table(self):
+        cursor = self.connection.cursor()
+
+        cursor.execute("DROP TABLE IF EXISTS occupancy")
+        cursor.execute("DROP TABLE IF EXISTS wake_reserves")
+
+        self.connection.commit()
+
+    async def test_append_data(self):
+        self.wake_adapter.append_data(self.reserve)
+        self.wake_adapter.append_data(self.reserve)
+
+        passed, alert = self.assert_params(
+            self.wake_adapter.get_day_occupancy(date.today())[120], 2)
+        assert passed, alert
+
+        stored = SqliteOccupancyAdapter(self.connection)
+        passed, alert = self.assert_params(
+            stored.get_day_total("wake_reserves", date.today()), 12)
+        assert passed, alert
+
+    async def test_update_data(self):
+        wake = self.wake_adapter.append_data(self.reserve)
+        wake.start_time = time(12, 0)
+        self.wake_adapter.update_data(wake)
+
+        stored = SqliteOccupancyAdapter(self.connection)
+        slots = stored.get_day_slots("wake_reserves", date.today())
+        passed, alert = self.assert_params((slots[120], slots[144]), (0, 1))
+        assert passed, alert
+
+        wake.canceled = True
+        self.wake_adapter.update_data(wake)
+
+        passed, alert = self.assert_params(
+            self.adapter.get_day_total("wake_reserves", date.today()), 0)
+        assert passed, alert
+
+    async def test_remove_data_by_keys(self):
+        wake = self.wake_adapter.append_data(self.reserve)
+        self.wake_adapter.remove_data_by_keys(wake.id)
+
+        passed, alert = self.assert_params(
+            self.adapter.get_day_total("wake_reserves", date.today()), 0)
+        assert passed, alert
+
+    async def test_rebuild_occupancy(self):
+        wake = self.wake_adapter.append_data(self.reserve)
+        self.wake_adapter.append_data(self.reserve)
+        wake.canceled = True
+        self.wake_adapter.update_data(wake)
+
+        self.wake_adapter.occupancy_adapter = None
+        self.wake_adapter.append_data(self.reserve)
+        self.wake_adapter.occupancy_adapter = self.adapter
+
+        self.wake_adapter.rebuild_occupancy()
+
+        stored = SqliteOccupancyAdapter(self.connection)
+        passed, alert = self.assert_params(
+            stored.get_day_total("wake_reserves", date.today()), 12)
+        assert passed, alert
+
+    async def test_shared_table(self):
+        now = [0.0]
+        other = SqliteOccupancyAdapter(self.connection, ttl=5)
+        other.clock = lambda: now[0]
+
+        passed, alert = self.assert_params(
+            other.get_day_total("wake_reserves", date.today()), 0)
+        assert passed, alert
+
+        self.wake_adapter.append_data(self.reserve)
+        passed, alert = self.assert_params(
+            other.get_day_total("wake_reserves", date.today()), 0)
+        assert passed, alert
+
+        now[0] = 5.0
+        passed, alert = self.assert_params(
+            other.get_day_total("wake_reserves", date.today()), 6)
+        assert passed, alert
@@ -50,6 +50,23 @@ class SqliteWakeAdapterTestCase(BaseTestCase):
         passed, alert = self.assert_params(wake4.id, 4)
         assert passed, alert
 
+    async def test_append_data_idempotency_key(self):
+        wake1 = self.adapter.append_data(self.reserve, idempotency_key="1-1")
+        wake2 = self.adapter.append_data(self.reserve, idempotency_key="1-1")
+        wake3 = self.adapter.append_data(self.reserve, idempotency_key="1-2")
+        wake4 = self.adapter.append_data(self.reserve)
+
+        passed, alert = self.assert_params(wake2.id, wake1.id)
+        assert passed, alert
+
+        passed, alert = self.assert_params(len({wake1.id, wake3.id, wake4.id}),
+                                           3)
+        assert passed, alert
+
+        passed, alert = self.assert_params(len(list(self.adapter.get_data())),
+                                           3)
+        assert passed, alert
+
     async def test_get_data(self):
         wakes = []
         for i in range(4):
@@ -78,6 +95,51 @@ class SqliteWakeAdapterTestCase(BaseTestCase):
             passed, alert = self.assert_params(rows[i - 2], wakes[i])
             assert passed, alert
 
+    async def test_get_active_reserves_page(self):
+        reserves = []
+        self.reserve.start_time = time(datetime.today().time().hour + 1)
+        for i in range(8):
+            self.reserve.start_date = date.today() + timedelta(i // 2)
+            reserves.append(self.adapter.append_data(self.reserve))
+
+        rows = list(self.adapter.get_active_reserves(limit=3))
+        passed, alert = self.assert_params(
+            [row.id for row in rows], [1, 2, 3])
+        assert passed, alert
+
+        page_cursor = (rows[-1].start, rows[-1].id)
+        rows = list(self.adapter.get_active_reserves(page_cursor, limit=3))
+        passed, alert = self.assert_params(
+            [row.id for row in rows], [4, 5, 6])
+        assert passed, alert
+
+        page_cursor = (rows[0].start, rows[0].id)
+        rows = list(self.adapter.get_active_reserves(page_cursor, limit=2,
+                                                     backward=True))
+        passed, alert = self.assert_params(
+            [row.id for row in rows], [2, 3])
+        assert passed, alert
+
+    async def test_get_reserves_between(self):
+        reserves = []
+        for i in range(6):
+            self.reserve.start_date = date.today() + timedelta(i // 2)
+            reserves.append(self.adapter.append_data(self.reserve))
+
+        reserves[3].canceled = True
+        self.adapter.update_data(reserves[3])
+
+        start = datetime.combine(date.today() + timedelta(1), time())
+        end = datetime.combine(date.today() + timedelta(2), time())
+        rows = list(self.adapter.get_reserves_between(start, end))
+        passed, alert = self.assert_params([row.id for row in rows], [3])
+        assert passed, alert
+
+        rows = list(self.adapter.get_reserves_between(
+            start, end, include_canceled=True))
+        passed, alert = self.assert_params([row.id for row in rows], [3, 4])
+        assert passed, alert
+
     async def test_get_data_by_keys(self):
         wakes = []
         for i in range(4):
@@ -162,3 +224,40 @@ class SqliteWakeAdapterTestCase(BaseTestCase):
 
         passed, alert = self.assert_params(count, 2)
         assert passed, alert
+
+    async def test_append_many(self):
+        start_date = date.today() + timedelta(1)
+        stored = self.adapter.append_data(
+            Wake(self.user, start_date + timedelta(1), self.start_time))
+        occurrences = [Wake(self.user, start_date + timedelta(i),
+                            self.start_time) for i in range(3)]
+        # An occurrence overlapped with a previous one of the batch
+        occurrences.append(Wake(self.user, start_date,
+                                time(self.start_time.hour, 5)))
+
+        passed, alert = self.assert_params(
+            self.adapter.get_concurrent_counts(occurrences), [0, 1, 0, 0])
+        assert passed, alert
+
+        appended, conflicts = self.adapter.append_many(
+            occurrences, max_count=1, idempotency_key="1-1")
+        passed, alert = self.assert_params(
+            ([wake.start for wake in appended],
+             [wake.start for wake in conflicts]),
+            ([occurrences[0].start, occurrences[2].start],
+             [occurrences[1].start, occurrences[3].start]))
+        assert passed, alert
+
+        stored_ids = [wake.id for wake in self.adapter.get_data()]
+        passed, alert = self.assert_params(
+            [wake.id for wake in appended], stored_ids[1:])
+        assert passed, alert
+
+        # A repeated batch returns stored reservations
+        repeated, _ = self.adapter.append_many(
+            occurrences, max_count=1, idempotency_key="1-1")
+        passed, alert = self.assert_params(
+            ([wake.id for wake in repeated],
+             len(list(self.adapter.get_data())), stored.id),
+            (stored_ids[1:], 3, stored_ids[0]))
+        assert passed, alert
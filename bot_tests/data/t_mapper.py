@@ -0,0 +1,33 @@
+from ..base_test_case import BaseTestCase
+
+from wakebot.adapters.mapper import RowMapper
+
+
+class RowMapperTestCase(BaseTestCase):
+    """RowMapper class"""
+
+    def setUp(self):
+        self.columns = ("id", "firstname", "end_time", "start_time")
+        self.mapper = RowMapper(self.columns, self.create_item)
+
+    @staticmethod
+    def create_item(start_time, id, firstname):
+        return (id, firstname, start_time)
+
+    async def test_map_row(self):
+        item = self.mapper.map_row((1, "Firstname", 11, 10))
+
+        passed, alert = self.assert_params(item, (1, "Firstname", 10))
+        assert passed, alert
+
+    async def test_map_rows(self):
+        rows = [(1, "Firstname", 11, 10), (2, "Lastname", 21, 20)]
+        items = self.mapper.map_rows(rows)
+
+        passed, alert = self.assert_params(
+            items, [(1, "Firstname", 10), (2, "Lastname", 20)])
+        assert passed, alert
+
+    async def test_map_rows_empty(self):
+        passed, alert = self.assert_params(self.mapper.map_rows([]), [])
+        assert passed, alert
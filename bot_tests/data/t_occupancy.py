@@ -0,0 +1,74 @@
+from datetime import date, time, timedelta
+from ..base_test_case import BaseTestCase
+from wakebot.adapters.data import MemoryOccupancyAdapter
+from wakebot.entities import Wake, User
+
+
+class MemoryOccupancyAdapterTestCase(BaseTestCase):
+    """MemoryOccupancyAdapter class"""
+
+    def setUp(self):
+        self.adapter = MemoryOccupancyAdapter()
+        self.user = User("Firstname", telegram_id=586, phone_number="+77777")
+        self.reserve = Wake(self.user, date.today(), time(10, 0),
+                            set_count=3)
+
+    async def test_get_reserve_slots(self):
+        slots = list(self.adapter.get_reserve_slots(self.reserve))
+
+        passed, alert = self.assert_params(len(slots), 6)
+        assert passed, alert
+        passed, alert = self.assert_params(slots[0], (date.today(), 120))
+        assert passed, alert
+        passed, alert = self.assert_params(slots[-1], (date.today(), 125))
+        assert passed, alert
+
+    async def test_get_reserve_slots_midnight(self):
+        self.reserve.start_time = time(23, 50)
+        slots = list(self.adapter.get_reserve_slots(self.reserve))
+
+        passed, alert = self.assert_params(slots[1], (date.today(), 287))
+        assert passed, alert
+        passed, alert = self.assert_params(
+            slots[2], (date.today() + timedelta(1), 0))
+        assert passed, alert
+
+    async def test_replace_reserve(self):
+        self.adapter.replace_reserve("wake", None, self.reserve)
+        self.adapter.replace_reserve("wake", None, self.reserve)
+
+        passed, alert = self.assert_params(
+            self.adapter.get_day_total("wake", date.today()), 12)
+        assert passed, alert
+
+        moved = self.reserve.__copy__()
+        moved.start_time = time(11, 0)
+        self.adapter.replace_reserve("wake", self.reserve, moved)
+        slots = self.adapter.get_day_slots("wake", date.today())
+
+        passed, alert = self.assert_params(slots[120], 1)
+        assert passed, alert
+        passed, alert = self.assert_params(slots[132], 1)
+        assert passed, alert
+
+        moved.canceled = True
+        self.adapter.replace_reserve("wake", self.reserve, moved)
+
+        passed, alert = self.assert_params(
+            self.adapter.get_day_total("wake", date.today()), 6)
+        assert passed, alert
+
+    async def test_rebuild(self):
+        self.adapter.replace_reserve("wake", None, self.reserve)
+        self.adapter.replace_reserve("sup", None, self.reserve)
+
+        canceled = self.reserve.__copy__()
+        canceled.canceled = True
+        self.adapter.rebuild("wake", [self.reserve, self.reserve, canceled])
+
+        passed, alert = self.assert_params(
+            self.adapter.get_day_total("wake", date.today()), 12)
+        assert passed, alert
+        passed, alert = self.assert_params(
+            self.adapter.get_day_total("sup", date.today()), 6)
+        assert passed, alert
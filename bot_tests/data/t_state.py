@@ -1,3 +1,4 @@
+import asyncio
 from ..base_test_case import BaseTestCase
 
 from aiogram.types import Chat, User
@@ -72,6 +73,20 @@ class StateManagerTestCase(BaseTestCase):
         passed, alert = self.assert_params(state_mgr.state, "main")
         assert passed, alert
 
+    async def test_set_params(self):
+        state_mgr = StateManager(self.data_adapter, 101, 111, 122)
+
+        state_mgr.set_params({"list_cursor": None, "list_last": 10})
+        state_mgr.set_state("list")
+
+        state_mgr = StateManager(self.data_adapter, 101, 111, 122)
+        passed, alert = self.assert_params(state_mgr.params["list_last"], 10)
+        assert passed, alert
+
+        state_mgr = StateManager(self.data_adapter, 101, 111, 121)
+        passed, alert = self.assert_params(state_mgr.params, {})
+        assert passed, alert
+
     async def test_set_state(self):
         state_mgr = StateManager(self.data_adapter, 101, 111)
 
@@ -84,6 +99,21 @@ class StateManagerTestCase(BaseTestCase):
         passed, alert = self.assert_params(state_data["state"], "book2")
         assert passed, alert
 
+    async def test_concurrent_updates(self):
+        state_mgr = StateManager(self.data_adapter)
+
+        async def process(chat_id: int, state: str):
+            state_mgr.get_state(chat_id, 111)
+            await asyncio.sleep(0.01)
+            state_mgr.set_state(state, "reserve")
+
+        await asyncio.gather(process(101, "book"), process(102, "list"))
+
+        states = [self.data_adapter.get_data_by_keys(key)["state"]
+                  for key in ("101-111", "102-111")]
+        passed, alert = self.assert_params(states, ["book", "list"])
+        assert passed, alert
+
 
 class StateProviderTestCase(BaseTestCase):
     """StateProvider class"""
@@ -0,0 +1,93 @@
+import random
+from datetime import date, time, timedelta
+
+from ..base_test_case import BaseTestCase
+from wakebot.adapters.timeline import ReserveTimeline
+from wakebot.entities import Supboard, User
+
+
+class ReserveTimelineTestCase(BaseTestCase):
+    """ReserveTimeline class"""
+
+    def setUp(self):
+        self.user = User("Firstname", phone_number="+7777")
+        self.day = date(2021, 6, 1)
+
+        random.seed(13)
+        self.reserves = []
+        for i in range(60):
+            reserve = Supboard(self.user,
+                               self.day + timedelta(random.randint(0, 1)),
+                               time(random.randint(9, 23),
+                                    random.randrange(0, 60, 10)),
+                               set_count=random.randint(1, 3),
+                               count=random.randint(1, 2), id=i)
+            self.reserves.append(reserve)
+
+    def get_timelines(self) -> list:
+        return [ReserveTimeline.from_reserves(self.reserves, use_numpy=True),
+                ReserveTimeline.from_reserves(self.reserves, use_numpy=False)]
+
+    async def test_occupancy(self):
+        reserve = Supboard(self.user, self.day, time(23, 30), count=2)
+        timeline = ReserveTimeline.from_reserves([reserve])
+
+        slots = timeline.get_day_occupancy(self.day, 2)
+        passed, alert = self.assert_params(len(slots), 576)
+        assert passed, alert
+        passed, alert = self.assert_params(sum(slots), 12)
+        assert passed, alert
+        passed, alert = self.assert_params(slots[281:289],
+                                           [0, 2, 2, 2, 2, 2, 2, 0])
+        assert passed, alert
+
+    async def test_implementations_equal(self):
+        first, second = self.get_timelines()
+
+        passed, alert = self.assert_params(
+            first.get_day_occupancy(self.day, 2),
+            second.get_day_occupancy(self.day, 2))
+        assert passed, alert
+        passed, alert = self.assert_params(first.get_peak(),
+                                           second.get_peak())
+        assert passed, alert
+        passed, alert = self.assert_params(first.get_conflicts(),
+                                           second.get_conflicts())
+        assert passed, alert
+
+    async def test_conflicts(self):
+        expected = []
+        for i, reserve in enumerate(self.reserves):
+            for j in range(i + 1, len(self.reserves)):
+                other = self.reserves[j]
+                if reserve.check_concurrent(other) > reserve.count:
+                    expected.append((i, j))
+
+        for timeline in self.get_timelines():
+            passed, alert = self.assert_params(timeline.get_conflicts(),
+                                               expected)
+            assert passed, alert
+
+    async def test_peak(self):
+        reserves = [Supboard(self.user, self.day, time(10), count=2),
+                    Supboard(self.user, self.day, time(10, 20), count=1),
+                    Supboard(self.user, self.day, time(10, 30), count=3),
+                    Supboard(self.user, self.day, time(10, 30), count=1)]
+        reserves[3].canceled = True
+
+        for use_numpy in (True, False):
+            timeline = ReserveTimeline.from_reserves(reserves,
+                                                     use_numpy=use_numpy)
+            passed, alert = self.assert_params(timeline.get_peak(), 4)
+            assert passed, alert
+
+    async def test_empty(self):
+        for use_numpy in (True, False):
+            timeline = ReserveTimeline([], [], [], use_numpy=use_numpy)
+            passed, alert = self.assert_params(timeline.get_peak(), 0)
+            assert passed, alert
+            passed, alert = self.assert_params(timeline.get_conflicts(), [])
+            assert passed, alert
+            passed, alert = self.assert_params(
+                sum(timeline.get_day_occupancy(self.day)), 0)
+            assert passed, alert
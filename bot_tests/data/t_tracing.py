@@ -0,0 +1,94 @@
+import logging
+import sqlite3
+from datetime import date, time, timedelta
+from ..base_test_case import BaseTestCase
+
+from wakebot.adapters.sqlite import SqliteWakeAdapter
+from wakebot.adapters.tracing import QueryTracer, TracedConnection
+from wakebot.adapters.tracing import normalize_statement
+from wakebot.entities import Wake, User
+
+
+class LogRecorder(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class QueryTracerTestCase(BaseTestCase):
+    """QueryTracer class"""
+
+    def setUp(self):
+        self.tracer = QueryTracer(size=5, slow_threshold=None)
+        self.connection = TracedConnection(sqlite3.connect(":memory:"),
+                                           self.tracer)
+        self.adapter = SqliteWakeAdapter(self.connection)
+        self.user = User("Firstname", telegram_id=586, phone_number="+77777")
+        self.start_date = date.today() + timedelta(1)
+
+    def append_reserves(self, count: int):
+        for i in range(count):
+            self.adapter.append_data(
+                Wake(self.user, self.start_date, time(10 + i), set_count=1))
+
+    async def test_normalize_statement(self):
+        passed, alert = self.assert_params(
+            normalize_statement("SELECT  id FROM wp38_wake\n"
+                                " WHERE id = 12 and name = 'it''s'"
+                                " and start >= %s"),
+            "SELECT id FROM wp38_wake WHERE id = ? and name = ? and"
+            " start >= ?")
+        assert passed, alert
+
+    async def test_statement_stats(self):
+        self.tracer.reset()
+        self.append_reserves(3)
+        reserves = list(self.adapter.get_active_reserves())
+
+        stats = self.tracer.get_stats()
+        insert = [item for item in stats
+                  if item["statement"].startswith("INSERT")][0]
+        passed, alert = self.assert_params(
+            (insert["count"], insert["rows"], insert["callers"]),
+            (3, 3, ["SqliteWakeAdapter.append_data"]))
+        assert passed, alert
+
+        select = [item for item in stats
+                  if item["statement"].startswith("SELECT")][0]
+        passed, alert = self.assert_params(
+            (select["count"], select["rows"], select["callers"]),
+            (1, len(reserves), ["SqliteWakeAdapter.get_active_reserves"]))
+        assert passed, alert
+
+    async def test_ring_buffer(self):
+        self.append_reserves(10)
+
+        passed, alert = self.assert_params(len(self.tracer.recent), 5)
+        assert passed, alert
+        passed, alert = self.assert_params(
+            self.tracer.recent[-1].caller, "SqliteWakeAdapter.append_data")
+        assert passed, alert
+
+    async def test_slow_query_log(self):
+        recorder = LogRecorder()
+        logger = logging.getLogger("wakebot.sql")
+        logger.addHandler(recorder)
+        try:
+            self.tracer.slow_threshold = 0
+            self.tracer.explain = True
+            self.append_reserves(1)
+            list(self.adapter.get_active_reserves())
+        finally:
+            logger.removeHandler(recorder)
+
+        passed, alert = self.assert_params(self.tracer.slow_count, 2)
+        assert passed, alert
+        message, *plan = recorder.messages[-1].splitlines()
+        passed, alert = self.assert_params(
+            "SqliteWakeAdapter.get_active_reserves" in message, True)
+        assert passed, alert
+        passed, alert = self.assert_params("wake_reserves" in plan[0], True)
+        assert passed, alert
@@ -2,6 +2,8 @@ from .t_reserve import ReserveTestCase
 from .t_wake import WakeTestCase
 from .t_user import UserTestCase
 from .t_supboard import SupboardTestCase
+from .t_recurrence import RecurrenceTestCase
 
 if __name__ == "__main__":
     ReserveTestCase, UserTestCase, WakeTestCase, SupboardTestCase
+    RecurrenceTestCase
@@ -0,0 +1,43 @@
+from ..base_test_case import BaseTestCase
+from datetime import date, time, datetime
+
+from wakebot.entities import Recurrence, Supboard, User
+
+
+class RecurrenceTestCase(BaseTestCase):
+    """A Recurrence class tests """
+
+    def setUp(self):
+        self.user = User("Firstname", phone_number="+777")
+        # Tuesdays and Thursdays of June 2021
+        self.recurrence = Recurrence((3, 1, 3), date(2021, 6, 30))
+
+    async def test_get_dates(self):
+        dates = self.recurrence.get_dates(date(2021, 6, 1))
+
+        passed, alert = self.assert_params(
+            (self.recurrence.weekdays, len(dates), dates[:3], dates[-1]),
+            ((1, 3), 9, [date(2021, 6, 1), date(2021, 6, 3),
+                         date(2021, 6, 8)], date(2021, 6, 29)))
+        assert passed, alert
+
+        passed, alert = self.assert_params(
+            self.recurrence.get_dates(date(2021, 7, 1)), [])
+        assert passed, alert
+
+    async def test_expand(self):
+        reserve = Supboard(self.user, date(2021, 6, 2), time(18),
+                           set_count=2, count=3, id=10)
+        occurrences = self.recurrence.expand(reserve)
+
+        passed, alert = self.assert_params(
+            [occurrence.start for occurrence in occurrences[:2]],
+            [datetime(2021, 6, 3, 18), datetime(2021, 6, 8, 18)])
+        assert passed, alert
+
+        first = occurrences[0]
+        passed, alert = self.assert_params(
+            (len(occurrences), first.id, first.count, first.set_count,
+             reserve.start_date),
+            (8, None, 3, 2, date(2021, 6, 2)))
+        assert passed, alert
@@ -1,7 +1,9 @@
 from ..base_test_case import BaseTestCase
 from datetime import date, time, datetime, timedelta
 
-from wakebot.entities import Reserve, User
+from wakebot.entities import Reserve, ReserveSetType, User
+from wakebot.entities import to_epoch_minutes, from_epoch_minutes
+from wakebot.entities import epoch_minutes_to_date
 
 
 class ReserveTestCase(BaseTestCase):
@@ -183,3 +185,60 @@ class ReserveTestCase(BaseTestCase):
         conflict_count = reserve1.check_concurrent(reserve2)
         passed, alert = self.assert_params(conflict_count, 2)
         assert passed, alert
+
+    async def test_set_type_shared(self):
+        """Общий экземпляр типа сета"""
+        reserve = Reserve(self.user, self.start_date, self.start_time)
+
+        passed, alert = self.assert_params(
+            reserve.set_type is self.reserve.set_type, True)
+        assert passed, alert
+        passed, alert = self.assert_params(
+            reserve.set_type is ReserveSetType.get("set", 5), True)
+        assert passed, alert
+
+        reserve = Reserve(self.user, self.start_date, self.start_time, "hour")
+        passed, alert = self.assert_params(reserve.set_type.minutes, 60)
+        assert passed, alert
+
+    async def test_cached_times(self):
+        """Кэширование вычисляемого времени"""
+        reserve = self.reserve
+        passed, alert = self.assert_params(reserve.end is reserve.end, True)
+        assert passed, alert
+
+        reserve.set_count = 2
+        passed, alert = self.assert_params(reserve.end_time, time(10, 10))
+        assert passed, alert
+
+        reserve.set_type = ReserveSetType.get("hour", 60)
+        passed, alert = self.assert_params(reserve.end_time, time(12, 0))
+        assert passed, alert
+
+        reserve.start_date = date(2021, 6, 1)
+        passed, alert = self.assert_params(reserve.start,
+                                           datetime(2021, 6, 1, 10))
+        assert passed, alert
+
+        reserve.start_time = time(11)
+        passed, alert = self.assert_params(reserve.end,
+                                           datetime(2021, 6, 1, 13))
+        assert passed, alert
+
+    async def test_epoch_minutes(self):
+        """Время резервирования в минутах от начала эпохи"""
+        reserve = Reserve(self.user, date(1970, 1, 2), time(1, 30),
+                          set_count=3)
+
+        passed, alert = self.assert_params(reserve.start_minute, 1530)
+        assert passed, alert
+        passed, alert = self.assert_params(reserve.end_minute, 1545)
+        assert passed, alert
+
+        start = datetime(2021, 6, 1, 23, 55)
+        minutes = to_epoch_minutes(start)
+        passed, alert = self.assert_params(from_epoch_minutes(minutes), start)
+        assert passed, alert
+        passed, alert = self.assert_params(
+            epoch_minutes_to_date(minutes + 5), date(2021, 6, 2))
+        assert passed, alert
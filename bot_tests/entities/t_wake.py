@@ -131,3 +131,18 @@ class WakeTestCase(BaseTestCase):
                         self.start_time,)
         passed, alert = self.assert_params(reserve1, self.reserve)
         assert not passed, alert
+
+    async def test_from_values(self):
+        """Создание объекта из сохраненных значений"""
+        reserve = Wake.from_values(7, self.user,
+                                   self.start_date, self.start_time,
+                                   "set", 3, 1, 1, None, None)
+
+        passed, alert = self.assert_params(reserve, self.reserve)
+        assert passed, alert
+        passed, alert = self.assert_params(reserve.id, 7)
+        assert passed, alert
+        passed, alert = self.assert_params(reserve.canceled, False)
+        assert passed, alert
+        passed, alert = self.assert_params(reserve.set_type.minutes, 10)
+        assert passed, alert
@@ -0,0 +1,8 @@
+from .t_registry import MetricsRegistryTestCase
+from .t_middleware import MetricsMiddlewareTestCase
+from .t_watchdog import LoopWatchdogTestCase
+from .t_profiler import SamplingProfilerTestCase
+
+if __name__ == "__main__":
+    MetricsRegistryTestCase, MetricsMiddlewareTestCase, LoopWatchdogTestCase
+    SamplingProfilerTestCase
@@ -0,0 +1,132 @@
+from ..base_test_case import BaseTestCase
+
+from aiogram import Bot, Dispatcher, types
+from wakebot.metrics import MetricsRegistry, MetricsMiddleware
+from wakebot.metrics import MetricsServer, instrument_bot
+from wakebot.metrics.middleware import get_callback_action
+
+
+class Handlers:
+    async def callback_apply(self, callback_query):
+        pass
+
+    async def callback_fail(self, callback_query):
+        raise RuntimeError("Handler failure")
+
+
+class MetricsMiddlewareTestCase(BaseTestCase):
+    """MetricsMiddleware class"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.handlers = Handlers()
+
+    def create_dispatcher(self) -> Dispatcher:
+        dispatcher = Dispatcher(Bot("123456:TEST"))
+        dispatcher.middleware.setup(MetricsMiddleware(self.registry))
+        dispatcher.register_callback_query_handler(
+            self.handlers.callback_apply,
+            lambda callback_query: callback_query.data == "apply")
+        dispatcher.register_callback_query_handler(
+            self.handlers.callback_fail,
+            lambda callback_query: callback_query.data.startswith("cancel"))
+        return dispatcher
+
+    def create_update(self, data: str) -> types.Update:
+        return types.Update.to_object({
+            "update_id": 1,
+            "callback_query": {
+                "id": "1",
+                "from": {"id": 111, "is_bot": False, "first_name": "Test"},
+                "message": {"message_id": 1, "date": 0,
+                            "chat": {"id": 101, "type": "private"}},
+                "chat_instance": "1",
+                "data": data}})
+
+    async def test_callback_action(self):
+        passed, alert = self.assert_params(
+            [get_callback_action(data)
+             for data in ("apply", "12", "cancel-12", None)],
+            ["apply", "#", "cancel", ""])
+        assert passed, alert
+
+    async def test_handler_latency(self):
+        dispatcher = self.create_dispatcher()
+        await dispatcher.process_update(self.create_update("apply"))
+        await dispatcher.process_update(self.create_update("unknown"))
+
+        labels = {"update": "callback_query",
+                  "handler": "Handlers.callback_apply",
+                  "action": "apply"}
+        latency = self.registry.metrics["wakebot_handler_seconds"]
+        passed, alert = self.assert_params(latency.get(**labels), 1)
+        assert passed, alert
+
+        in_flight = self.registry.metrics["wakebot_handlers_in_flight"]
+        passed, alert = self.assert_params(in_flight.get(**labels), 0)
+        assert passed, alert
+
+        unhandled = self.registry.metrics["wakebot_updates_unhandled_total"]
+        passed, alert = self.assert_params(
+            unhandled.get(update="callback_query"), 1)
+        assert passed, alert
+
+    async def test_handler_errors(self):
+        dispatcher = self.create_dispatcher()
+        try:
+            await dispatcher.process_update(self.create_update("cancel-12"))
+        except RuntimeError:
+            pass
+
+        labels = {"update": "callback_query",
+                  "handler": "Handlers.callback_fail",
+                  "action": "cancel"}
+        errors = self.registry.metrics["wakebot_handler_errors_total"]
+        passed, alert = self.assert_params(errors.get(**labels), 1)
+        assert passed, alert
+
+        errors.values.clear()
+        await dispatcher.process_update(self.create_update("apply"))
+        passed, alert = self.assert_params(errors.values, {})
+        assert passed, alert
+
+    async def test_bot_api_calls(self):
+        class TestBot:
+            async def request(self, method, data=None, files=None):
+                if method == "sendMessage":
+                    raise RuntimeError("Bot API failure")
+                return True
+
+        bot = instrument_bot(TestBot(), self.registry)
+        await bot.request("answerCallbackQuery")
+        try:
+            await bot.request("sendMessage")
+        except RuntimeError:
+            pass
+
+        latency = self.registry.metrics["wakebot_bot_api_seconds"]
+        passed, alert = self.assert_params(
+            latency.get(method="answerCallbackQuery"), 1)
+        assert passed, alert
+
+        errors = self.registry.metrics["wakebot_bot_api_errors_total"]
+        passed, alert = self.assert_params(
+            errors.get(method="sendMessage"), 1)
+        assert passed, alert
+
+    async def test_metrics_server(self):
+        from aiohttp import ClientSession
+
+        self.registry.counter("test_total", "Test counter").inc()
+        server = MetricsServer(self.registry, "127.0.0.1", 0)
+        await server.start()
+        try:
+            async with ClientSession() as session:
+                url = f"http://127.0.0.1:{server.port}/metrics"
+                async with session.get(url) as response:
+                    text = await response.text()
+        finally:
+            await server.stop()
+
+        passed, alert = self.assert_params(text, self.registry.render())
+        assert passed, alert
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import time
+from ..base_test_case import BaseTestCase
+
+from bot_tests.mocks.aiogram import Dispatcher, Message
+from aiogram import types
+from wakebot.adapters.data import MemoryDataAdapter
+from wakebot.adapters.state import StateManager
+from wakebot.metrics import SamplingProfiler
+from wakebot.processors.common import StatedProcessor
+
+
+class RenderProcessor(StatedProcessor):
+    async def callback_list(self, seconds: float):
+        self.render(seconds)
+
+    def render(self, seconds: float):
+        time.sleep(seconds)
+
+
+class SamplingProfilerTestCase(BaseTestCase):
+    """SamplingProfiler class"""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.profiler = SamplingProfiler(sample_rate=2, interval=0.002,
+                                         path=self.path)
+        self.processor = RenderProcessor(
+            Dispatcher(), StateManager(MemoryDataAdapter()))
+
+    async def handle(self, seconds: float):
+        data = {}
+        await self.profiler.on_process_callback_query(None, data)
+        await self.processor.callback_list(seconds)
+        await self.profiler.on_post_process_callback_query(None, [], data)
+
+    async def test_sample_rate(self):
+        try:
+            for _ in range(6):
+                await self.handle(0.001)
+        finally:
+            self.profiler.stop()
+
+        passed, alert = self.assert_params(
+            (self.profiler.updates, self.profiler.sampled), (6, 3))
+        assert passed, alert
+
+    async def test_collapsed_stacks(self):
+        try:
+            await self.handle(0.1)
+            await self.handle(0.1)
+        finally:
+            self.profiler.stop()
+
+        stacks = self.profiler.stacks["RenderProcessor.callback_list"]
+        passed, alert = self.assert_params(
+            "RenderProcessor.callback_list;RenderProcessor.render" in stacks,
+            True)
+        assert passed, alert
+
+        path = self.profiler.dump("profile.txt")
+        passed, alert = self.assert_params(
+            path, os.path.join(self.path, "profile.txt"))
+        assert passed, alert
+
+        with open(path) as profile:
+            stack, count = profile.readline().rsplit(" ", 1)
+        passed, alert = self.assert_params(
+            (stack, int(count) > 5),
+            ("RenderProcessor.callback_list;RenderProcessor.render", True))
+        assert passed, alert
+
+    async def test_profile_command(self):
+        dispatcher = Dispatcher()
+        self.profiler.register_command(dispatcher, [111])
+        user = types.User(id=111)
+        message = Message.create(types.Chat(id=101), user, "/profile reset")
+        self.profiler.stacks["Handler"] = {}
+
+        await dispatcher.process_message(message)
+
+        passed, alert = self.assert_params(
+            (message.answers[0].text, self.profiler.stacks),
+            ("Profile is reset", {}))
+        assert passed, alert
+
+        message = Message.create(types.Chat(id=101), types.User(id=112),
+                                 "/profile reset")
+        passed, alert = self.assert_params(
+            await dispatcher.process_message(message), None)
+        assert passed, alert
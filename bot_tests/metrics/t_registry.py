@@ -0,0 +1,69 @@
+from ..base_test_case import BaseTestCase
+
+from wakebot.metrics import MetricsRegistry
+
+
+class MetricsRegistryTestCase(BaseTestCase):
+    """MetricsRegistry class"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    async def test_counter(self):
+        counter = self.registry.counter("test_total", "Test counter",
+                                        ("handler",))
+        counter.inc(handler="a")
+        counter.inc(2, handler="a")
+        counter.inc(handler='b"')
+
+        passed, alert = self.assert_params(counter.get(handler="a"), 3)
+        assert passed, alert
+        passed, alert = self.assert_params(
+            self.registry.render(),
+            "# HELP test_total Test counter\n"
+            "# TYPE test_total counter\n"
+            'test_total{handler="a"} 3\n'
+            'test_total{handler="b\\""} 1\n')
+        assert passed, alert
+
+    async def test_gauge(self):
+        gauge = self.registry.gauge("test_gauge", "Test gauge")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        passed, alert = self.assert_params(gauge.get(), 1)
+        assert passed, alert
+        gauge.set(0.5)
+        passed, alert = self.assert_params(
+            self.registry.render().splitlines()[-1], "test_gauge 0.5")
+        assert passed, alert
+
+    async def test_histogram(self):
+        histogram = self.registry.histogram("test_seconds", "Test histogram",
+                                            ("method",), (0.1, 1))
+        histogram.observe(0.1, method="get")
+        histogram.observe(0.5, method="get")
+        histogram.observe(2, method="get")
+
+        passed, alert = self.assert_params(
+            self.registry.render().splitlines()[2:],
+            ['test_seconds_bucket{method="get",le="0.1"} 1',
+             'test_seconds_bucket{method="get",le="1"} 2',
+             'test_seconds_bucket{method="get",le="+Inf"} 3',
+             'test_seconds_sum{method="get"} 2.6',
+             'test_seconds_count{method="get"} 3'])
+        assert passed, alert
+
+    async def test_shared_metric(self):
+        counter = self.registry.counter("test_total", "Test counter")
+
+        passed, alert = self.assert_params(
+            self.registry.counter("test_total", "Test counter"), counter)
+        assert passed, alert
+
+        try:
+            self.registry.gauge("test_total", "Test gauge")
+        except ValueError:
+            return
+        assert False, "A metric type conflict is not detected"
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from ..base_test_case import BaseTestCase
+
+from bot_tests.mocks.aiogram import Dispatcher
+from wakebot.adapters.data import MemoryDataAdapter
+from wakebot.adapters.state import StateManager
+from wakebot.metrics import MetricsRegistry, LoopWatchdog
+from wakebot.processors.common import StatedProcessor
+
+
+class BlockingProcessor(StatedProcessor):
+    async def callback_book(self, seconds: float):
+        self.query_storage(seconds)
+
+    def query_storage(self, seconds: float):
+        time.sleep(seconds)
+
+
+class LoopWatchdogTestCase(BaseTestCase):
+    """LoopWatchdog class"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.watchdog = LoopWatchdog(self.registry, interval=0.01,
+                                     threshold=0.1)
+        self.processor = BlockingProcessor(
+            Dispatcher(), StateManager(MemoryDataAdapter()))
+
+    async def test_stall(self):
+        await self.watchdog.start()
+        try:
+            await asyncio.sleep(0.05)
+            await self.processor.callback_book(0.3)
+            await asyncio.sleep(0.05)
+        finally:
+            await self.watchdog.stop()
+
+        passed, alert = self.assert_params(len(self.watchdog.stalls), 1)
+        assert passed, alert
+
+        stall = self.watchdog.stalls[0]
+        passed, alert = self.assert_params(
+            stall.handler, "BlockingProcessor.callback_book")
+        assert passed, alert
+        passed, alert = self.assert_params(
+            "query_storage" in stall.stack[-1], True)
+        assert passed, alert
+
+        stall_count = self.registry.metrics["wakebot_loop_stalls_total"]
+        passed, alert = self.assert_params(
+            stall_count.get(handler="BlockingProcessor.callback_book"), 1)
+        assert passed, alert
+
+        lag = self.registry.metrics["wakebot_loop_lag_seconds"]
+        passed, alert = self.assert_params(lag.get_sum() >= 0.25, True)
+        assert passed, alert
+
+    async def test_no_stall(self):
+        await self.watchdog.start()
+        try:
+            for _ in range(10):
+                await self.processor.callback_book(0.01)
+                await asyncio.sleep(0.01)
+        finally:
+            await self.watchdog.stop()
+
+        passed, alert = self.assert_params(len(self.watchdog.stalls), 0)
+        assert passed, alert
@@ -1,7 +1,15 @@
+from itertools import count
+
+from aiogram import types
+
+
 class Bot:
 
+    sent_count = 0
+
     async def send_message(self, chat_id, text, parse_mode, reply_markup=None):
         self.text = text
+        self.sent_count += 1
 
 
 class Dispatcher:
@@ -9,12 +17,131 @@ class Dispatcher:
 
     bot = Bot()
 
-    def register_message_handler(self, callback, commands=None):
-        pass
+    def __init__(self):
+        self.message_handlers = []
+        self.callback_query_handlers = []
+
+    def register_message_handler(self, callback, *custom_filters,
+                                 commands=None):
+        self.message_handlers.append((callback, custom_filters, commands))
+
+    def register_callback_query_handler(self, callback, *custom_filters):
+        self.callback_query_handlers.append((callback, custom_filters, None))
+
+    def get_handler(self, handlers: list, update, text: str = None):
+        """Find a first registered handler matched an update"""
+        for callback, custom_filters, commands in handlers:
+            if commands:
+                command = (text or "").split(" ")[0][1:]
+                if command not in commands:
+                    continue
+
+            if all(custom_filter(update) for custom_filter in custom_filters):
+                return callback
+
+        return None
+
+    async def process_message(self, message):
+        """Proceed a message by a first matched handler
+
+        Returns:
+            A called handler or None
+        """
+        handler = self.get_handler(self.message_handlers, message,
+                                   message.text)
+        if handler:
+            await handler(message)
+
+        return handler
+
+    async def process_callback_query(self, callback_query):
+        """Proceed a callback query by a first matched handler
+
+        Returns:
+            A called handler or None
+        """
+        handler = self.get_handler(self.callback_query_handlers,
+                                   callback_query)
+        if handler:
+            await handler(callback_query)
+
+        return handler
+
 
-    def register_callback_query_handler(self, callback, filters=None):
-        pass
+class Message(types.Message):
+    """ Имитатор сообщения телеграм """
+
+    message_ids = count(1000)
+
+    @classmethod
+    def create(cls, chat: types.Chat, from_user: types.User,
+               text: str = None):
+        message = cls()
+        message.message_id = next(cls.message_ids)
+        message.chat = chat
+        message.from_user = from_user
+        message.text = text
+        message.answers = []
+        return message
+
+    async def answer(self, text, parse_mode=None, reply_markup=None,
+                     **kwargs):
+        answer = self.create(self.chat, self.from_user, text)
+        answer.reply_markup = reply_markup
+        self.answers.append(answer)
+        return answer
+
+    async def edit_text(self, text, parse_mode=None, reply_markup=None,
+                        **kwargs):
+        self.text = text
+        self.reply_markup = reply_markup
+        return self
+
+    async def delete(self):
+        return True
 
 
 class CallbackQuery:
     bot = Bot()
+
+    @classmethod
+    def create(cls, message: Message, from_user: types.User, data: str):
+        callback_query = cls()
+        callback_query.message = message
+        callback_query.from_user = from_user
+        callback_query.data = data
+        return callback_query
+
+    async def answer(self, text=None, **kwargs):
+        self.answer_text = text
+
+
+def create_message_update(update_id: int, text: str,
+                          chat_id: int = 101) -> dict:
+    """Create a raw message update of a private chat
+
+    A command text gets a bot_command entity.
+    """
+    user = {"id": chat_id, "is_bot": False, "first_name": "Test"}
+    message = {"message_id": update_id, "date": 0, "text": text,
+               "chat": {"id": chat_id, "type": "private"}, "from": user}
+    if text.startswith("/"):
+        message["entities"] = [{"type": "bot_command", "offset": 0,
+                                "length": len(text.split(" ")[0])}]
+
+    return {"update_id": update_id, "message": message}
+
+
+def create_callback_update(update_id: int, data: str, user_id: int = 101,
+                           query_id: str = None) -> dict:
+    """Create a raw callback query update of a private chat
+
+    A query identifier is an update identifier by default.
+    """
+    user = {"id": user_id, "is_bot": False, "first_name": "Test"}
+    return {"update_id": update_id,
+            "callback_query": {
+                "id": query_id or str(update_id), "from": user,
+                "chat_instance": "1", "data": data,
+                "message": {"message_id": 1, "date": 0, "from": user,
+                            "chat": {"id": user_id, "type": "private"}}}}
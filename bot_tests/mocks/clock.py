@@ -0,0 +1,12 @@
+class FakeClock:
+    """A manually advanced clock
+
+    A clock returns its now value, a float of seconds (a monotonic
+    clock) or a datetime (a local time clock).
+    """
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
@@ -3,7 +3,7 @@ from ..mocks.aiogram import Bot, Dispatcher, CallbackQuery
 
 from datetime import date, time, timedelta
 
-from wakebot.adapters.data import MemoryDataAdapter
+from wakebot.adapters.data import MemoryDataAdapter, ReserveDataAdapter
 from wakebot.adapters.state import StateManager
 from wakebot.processors import RuReserve, ReserveProcessor
 from wakebot.entities import Reserve
@@ -407,6 +407,26 @@ class ReserveProcessorTestCase(BaseTestCase):
         self.check_state(state_key, self.create_list_text(),
                          reply_markup, "reserve", "hour")
 
+    async def test_work_hours(self):
+        """Share work hours of Hour menu and a day occupancy"""
+        self.processor.first_hour = 10
+        self.processor.work_hours = 2
+        passed, alert = self.assert_params(
+            self.processor.create_hour_keyboard(),
+            self.create_hour_keyboard(10, 2))
+        assert passed, alert
+
+        day = date.today()
+        slots = [0] * 24 * 60
+        slots[600:660] = [1] * 60
+        self.processor.max_count = 1
+        self.processor.data_adapter = ReserveDataAdapter()
+        self.processor.data_adapter.get_day_occupancy = lambda day: slots
+        passed, alert = self.assert_params(
+            self.processor.create_date_button_text(day),
+            day.strftime(self.strings.date_format) + " (50%)")
+        assert passed, alert
+
     async def test_callback_book_phone(self):
         """Proceed press Phone button in Book menu"""
         callback = self.test_callback_query
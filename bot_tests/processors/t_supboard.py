@@ -108,7 +108,7 @@ class SupboardProcessorTestCase(ReserveProcessorTestCase):
     def create_main_text(self):
         return self.strings.hello_message
 
-    def create_list_text(self):
+    def create_list_text(self, admin_menu=False):
         if not self.reserves:
             return self.strings.list_empty
 
@@ -126,6 +126,15 @@ class SupboardProcessorTestCase(ReserveProcessorTestCase):
             result += f" x {reserve.count}"
             result += "\n"
 
+        if admin_menu:
+            # A one reservation a day
+            result += f"\n{self.strings.load_header}\n"
+            for reserve in self.reserves[2:]:
+                result += self.strings.load_text.format(
+                    day=reserve.start_date.strftime(self.strings.date_format),
+                    peak=reserve.count, max_count=self.processor.max_count,
+                    conflicts=0) + "\n"
+
         return result
 
     def create_book_text(self, show_contact=False):
@@ -219,9 +228,26 @@ class SupboardProcessorTestCase(ReserveProcessorTestCase):
 
         await self.processor.callback_main(callback)
 
-        self.check_state(state_key, self.create_list_text(),
+        self.check_state(state_key, self.create_list_text(True),
                          reply_markup, "sup", "list")
 
+    async def test_create_load_text(self):
+        """Create an admin day load text"""
+        self.prepare_data()
+        day = date.today() + timedelta(30)
+        for start_time, count in ((time(10), 4), (time(10, 15), 3),
+                                  (time(12), 1)):
+            self.supboard_adapter.append_data(
+                Supboard(sup_users[0], start_date=day, start_time=start_time,
+                         set_count=1, count=count))
+
+        day_text = day.strftime(self.strings.date_format)
+        passed, alert = self.assert_params(
+            self.processor.create_load_text([day, day]),
+            f"\n{self.strings.load_header}\n{self.strings.icon_stop} "
+            f"{day_text}: пик 7 из 6, пересечений 1\n")
+        assert passed, alert
+
     async def test_callback_book_date(self):
         """Proceed press Date button in Book menu"""
         callback = self.test_callback_query
@@ -291,7 +317,7 @@ class SupboardProcessorTestCase(ReserveProcessorTestCase):
         passed, alert = self.assert_params(reserve.canceled, True)
         assert passed, alert
 
-        text = self.create_list_text()
+        text = self.create_list_text(True)
         reply_markup = self.create_list_keyboard(True)
         self.check_state(state_key, text,
                          reply_markup, "sup", "list")
@@ -109,7 +109,7 @@ class WakeProcessorTestCase(ReserveProcessorTestCase):
     def create_main_text(self):
         return self.strings.hello_message
 
-    def create_list_text(self):
+    def create_list_text(self, admin_menu=False):
         if not self.reserves:
             return self.strings.list_empty
 
@@ -130,6 +130,15 @@ class WakeProcessorTestCase(ReserveProcessorTestCase):
                        if reserve.hydro else "")
             result += "\n"
 
+        if admin_menu:
+            # A one reservation a day
+            result += f"\n{self.strings.load_header}\n"
+            for reserve in self.reserves[2:]:
+                result += self.strings.load_text.format(
+                    day=reserve.start_date.strftime(self.strings.date_format),
+                    peak=reserve.count, max_count=self.processor.max_count,
+                    conflicts=0) + "\n"
+
         return result
 
     def create_book_text(self, show_contact=False):
@@ -227,7 +236,7 @@ class WakeProcessorTestCase(ReserveProcessorTestCase):
 
         await self.processor.callback_main(callback)
 
-        self.check_state(state_key, self.create_list_text(),
+        self.check_state(state_key, self.create_list_text(True),
                          reply_markup, "wake", "list")
 
     async def test_callback_book_date(self):
@@ -446,11 +455,54 @@ class WakeProcessorTestCase(ReserveProcessorTestCase):
         passed, alert = self.assert_params(reserve.canceled, True)
         assert passed, alert
 
-        text = self.create_list_text()
+        text = self.create_list_text(True)
         reply_markup = self.create_list_keyboard(True)
         self.check_state(state_key, text,
                          reply_markup, "wake", "list")
 
+    async def test_callback_list_pages(self):
+        """Proceed press Next and Prev buttons in List menu"""
+        self.prepare_data()
+        self.processor.list_page_size = 4
+
+        callback = self.test_callback_query
+        callback.data = "list"
+        state_key = "101-111-121"
+        self.append_state(state_key, "wake", "main")
+        self.processor.check_filter(callback.message, "wake", "main")
+        await self.processor.callback_main(callback)
+
+        buttons = self.message.reply_markup.inline_keyboard
+        passed, alert = self.assert_params(
+            [button.callback_data for button in buttons[-2]], ["next"])
+        assert passed, alert
+
+        callback.data = "next"
+        self.processor.check_filter(callback.message, "wake", "list")
+        await self.processor.callback_list(callback)
+
+        buttons = self.message.reply_markup.inline_keyboard
+        passed, alert = self.assert_params(
+            [button.callback_data for button in buttons[0]],
+            [str(self.reserves[6].id), str(self.reserves[7].id)])
+        assert passed, alert
+        passed, alert = self.assert_params(
+            [button.callback_data for button in buttons[-2]], ["prev"])
+        assert passed, alert
+
+        callback.data = "prev"
+        self.processor.check_filter(callback.message, "wake", "list")
+        await self.processor.callback_list(callback)
+
+        buttons = self.message.reply_markup.inline_keyboard
+        passed, alert = self.assert_params(
+            [button.callback_data for button in buttons[0]],
+            [str(reserve.id) for reserve in self.reserves[2:6]])
+        assert passed, alert
+        passed, alert = self.assert_params(
+            [button.callback_data for button in buttons[-2]], ["next"])
+        assert passed, alert
+
 
 if __name__ == "__main__":
     WakeProcessorTestCase().run_tests_async()
@@ -0,0 +1,93 @@
+import asyncio
+import multiprocessing
+from .base_test_case import BaseTestCase
+from .mocks.aiogram import create_message_update
+
+from aiogram import Bot, Dispatcher
+from wakebot.cluster import ChatSequencer, WorkerPool, get_chat_id
+from wakebot.cluster import run_worker
+
+
+def run_echo_worker(connection, results):
+    dispatcher = Dispatcher(Bot("123456:TEST"))
+
+    async def echo(message):
+        await asyncio.sleep(0.01)
+        results.put((multiprocessing.current_process().name,
+                     message.chat.id, message.text))
+
+    dispatcher.register_message_handler(echo, state="*")
+    asyncio.run(run_worker(dispatcher, connection))
+
+
+class ClusterTestCase(BaseTestCase):
+    """Multi-worker mode"""
+
+    async def test_get_chat_id(self):
+        updates = [create_message_update(1, "text"),
+                   {"update_id": 2, "callback_query": {
+                       "from": {"id": 111}, "message": {"chat": {"id": 102}}}},
+                   {"update_id": 3, "inline_query": {"from": {"id": 111}}},
+                   {"update_id": 4}]
+
+        passed, alert = self.assert_params(
+            [get_chat_id(update) for update in updates], [101, 102, 111, 0])
+        assert passed, alert
+
+    async def test_chat_sequencer(self):
+        handled = []
+
+        async def handle(item):
+            chat_id, number = item
+            await asyncio.sleep(0.05 if chat_id == 1 else 0.01)
+            handled.append(item)
+
+        sequencer = ChatSequencer(handle)
+        for number in range(3):
+            sequencer.submit(1, (1, number))
+            sequencer.submit(2, (2, number))
+        passed, alert = self.assert_params(sequencer.pending, 6)
+        assert passed, alert
+
+        await sequencer.join()
+
+        passed, alert = self.assert_params(
+            [item for item in handled if item[0] == 1],
+            [(1, 0), (1, 1), (1, 2)])
+        assert passed, alert
+        passed, alert = self.assert_params(
+            handled[:3], [(2, 0), (2, 1), (2, 2)])
+        assert passed, alert
+
+    async def test_worker_pool(self):
+        # The test runner script is not importable by spawned processes
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        pool = WorkerPool(run_echo_worker, 2, (results,), "fork")
+        pool.start()
+        try:
+            for number in range(10):
+                await pool.dispatch(create_message_update(
+                    number, str(number), 100 + number % 4))
+        finally:
+            pool.stop(10)
+
+        received = [results.get(timeout=5) for _ in range(10)]
+        workers = {}
+        for worker, chat_id, text in received:
+            workers.setdefault(chat_id, set()).add(worker)
+
+        passed, alert = self.assert_params(
+            {chat_id: len(names) for chat_id, names in workers.items()},
+            {100: 1, 101: 1, 102: 1, 103: 1})
+        assert passed, alert
+        passed, alert = self.assert_params(
+            workers[100] != workers[101] and workers[100] == workers[102],
+            True)
+        assert passed, alert
+        passed, alert = self.assert_params(
+            [text for _, chat_id, text in received if chat_id == 101],
+            ["1", "5", "9"])
+        assert passed, alert
+        passed, alert = self.assert_params(pool.dispatched, [5, 5])
+        assert passed, alert
@@ -0,0 +1,92 @@
+import asyncio
+from .base_test_case import BaseTestCase
+
+from aiogram import Bot
+from wakebot.coalescing import EditCoalescer, get_message_key
+
+
+class EditCoalescerTestCase(BaseTestCase):
+    """EditCoalescer class"""
+
+    def create_bot(self, window: float = 0.02) -> Bot:
+        bot = Bot("123456:TEST")
+        self.requests = []
+
+        async def request(method, data=None, files=None, **kwargs):
+            self.requests.append((method, dict(data or {})))
+            return True
+
+        bot.request = request
+        self.coalescer = EditCoalescer(window)
+        return self.coalescer.install(bot)
+
+    async def test_get_message_key(self):
+        keys = [get_message_key({"chat_id": 1, "message_id": 2}),
+                get_message_key({"inline_message_id": "abc"}),
+                get_message_key({"chat_id": 1})]
+
+        passed, alert = self.assert_params(keys, [(1, 2), ("abc",), None])
+        assert passed, alert
+
+    async def test_last_edit_wins(self):
+        bot = self.create_bot()
+        for text in ("1", "2", "3"):
+            result = await bot.edit_message_text(text, 1, 10)
+            await bot.answer_callback_query(text)
+        await bot.edit_message_text("other", 2, 10)
+
+        answers = [method for method, _ in self.requests]
+        passed, alert = self.assert_params(answers,
+                                           ["answerCallbackQuery"] * 3)
+        assert passed, alert
+
+        passed, alert = self.assert_params(result, True)
+        assert passed, alert
+
+        await asyncio.sleep(0.05)
+        edits = [(data["chat_id"], data["text"])
+                 for method, data in self.requests[3:]]
+        passed, alert = self.assert_params(sorted(edits),
+                                           [(1, "3"), (2, "other")])
+        assert passed, alert
+
+        passed, alert = self.assert_params(
+            (self.coalescer.requested, self.coalescer.sent,
+             self.coalescer.coalesced), (4, 2, 2))
+        assert passed, alert
+
+        await bot.close()
+
+    async def test_method_order(self):
+        bot = self.create_bot()
+        await bot.edit_message_reply_markup(1, 10)
+        await bot.edit_message_text("text", 1, 10)
+        await self.coalescer.flush()
+
+        methods = [method for method, _ in self.requests]
+        passed, alert = self.assert_params(
+            methods, ["editMessageReplyMarkup", "editMessageText"])
+        assert passed, alert
+
+        passed, alert = self.assert_params(self.coalescer.pending, 0)
+        assert passed, alert
+
+        await bot.close()
+
+    async def test_delete_message(self):
+        bot = self.create_bot()
+        await bot.edit_message_text("text", 1, 10)
+        await bot.edit_message_text("other", 2, 10)
+        await bot.delete_message(1, 10)
+        await asyncio.sleep(0.05)
+
+        passed, alert = self.assert_params(
+            [(method, data["chat_id"]) for method, data in self.requests],
+            [("deleteMessage", 1), ("editMessageText", 2)])
+        assert passed, alert
+
+        passed, alert = self.assert_params(
+            (self.coalescer.pending, self.coalescer.sent), (0, 1))
+        assert passed, alert
+
+        await bot.close()
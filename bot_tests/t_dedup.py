@@ -0,0 +1,59 @@
+from .base_test_case import BaseTestCase
+from .mocks.aiogram import create_callback_update
+from .mocks.clock import FakeClock
+
+from aiogram import Bot, Dispatcher, types
+from wakebot.dedup import RecentSet, DeduplicationMiddleware
+
+
+class DeduplicationTestCase(BaseTestCase):
+    """Update and callback query de-duplication"""
+
+    async def test_recent_set(self):
+        clock = FakeClock()
+        keys = RecentSet(size=2, ttl=10, clock=clock)
+
+        added = [keys.add(1), keys.add(1), keys.add(2)]
+        passed, alert = self.assert_params(added, [True, False, True])
+        assert passed, alert
+
+        # The oldest key is dropped on overflow
+        keys.add(3)
+        passed, alert = self.assert_params((1 in keys, 2 in keys, len(keys)),
+                                           (False, True, 2))
+        assert passed, alert
+
+        # Keys are forgotten after the time window
+        clock.now = 11
+        passed, alert = self.assert_params((len(keys), keys.add(2)),
+                                           (2, True))
+        assert passed, alert
+        passed, alert = self.assert_params(len(keys), 1)
+        assert passed, alert
+
+    async def test_middleware(self):
+        dispatcher = Dispatcher(Bot("123456:TEST"))
+        middleware = DeduplicationMiddleware()
+        dispatcher.middleware.setup(middleware)
+
+        handled = []
+
+        async def apply(callback_query: types.CallbackQuery):
+            handled.append(callback_query.id)
+
+        dispatcher.register_callback_query_handler(apply, state="*")
+
+        updates = [create_callback_update(1, "apply", query_id="q1"),
+                   # a redelivered update
+                   create_callback_update(1, "apply", query_id="q1"),
+                   # a resent callback
+                   create_callback_update(2, "apply", query_id="q1"),
+                   create_callback_update(3, "apply", query_id="q2")]
+        for update in updates:
+            await dispatcher.process_updates([types.Update.to_object(update)])
+
+        passed, alert = self.assert_params(handled, ["q1", "q2"])
+        assert passed, alert
+        passed, alert = self.assert_params(
+            (middleware.dropped, len(middleware.updates)), (2, 3))
+        assert passed, alert
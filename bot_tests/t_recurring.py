@@ -0,0 +1,133 @@
+import sqlite3
+from datetime import date, time, timedelta
+from .base_test_case import BaseTestCase
+
+from aiogram import Bot, Dispatcher, types
+from wakebot.adapters.data import MemoryDataAdapter
+from wakebot.adapters.sqlite import SqliteSupboardAdapter
+from wakebot.adapters.state import StateManager
+from wakebot.entities import Supboard, User
+from wakebot.processors import RuSupboard, SupboardProcessor
+
+
+class RecurringReserveTestCase(BaseTestCase):
+    """Recurring reservations of ReserveProcessor class"""
+
+    def setUp(self):
+        self.user = User("Admin", telegram_id=101, phone_number="+79990001122")
+
+    def create_processor(self):
+        self.bot = Bot("123456:TEST")
+        Bot.set_current(self.bot)
+        self.requests = []
+
+        async def request(method, data=None, files=None, **kwargs):
+            self.requests.append((method, dict(data or {})))
+            if method == "sendMessage":
+                return {"message_id": 7, "date": 0, "text": data["text"],
+                        "from": {"id": 123456, "is_bot": True,
+                                 "first_name": "Bot"},
+                        "chat": {"id": data["chat_id"], "type": "private"}}
+            return True
+
+        self.bot.request = request
+        self.adapter = SqliteSupboardAdapter(sqlite3.connect(":memory:"))
+        self.states = MemoryDataAdapter()
+        self.processor = SupboardProcessor(Dispatcher(self.bot),
+                                           StateManager(self.states),
+                                           RuSupboard, self.adapter)
+        self.processor.max_count = 2
+        self.processor.admin_telegram_ids[:] = [101, 102]
+
+    def create_message(self, text: str) -> types.Message:
+        return types.Message.to_object(
+            {"message_id": 5, "date": 0, "text": text,
+             "from": {"id": 101, "is_bot": False, "first_name": "Admin"},
+             "chat": {"id": 101, "type": "private"}})
+
+    async def test_parse_recurrence(self):
+        self.create_processor()
+        start = date(2021, 6, 1)
+        parse = self.processor.parse_recurrence
+
+        passed, alert = self.assert_params(
+            [parse(text, start) and parse(text, start).weekdays
+             for text in ("вт чт 30.06.2021", "Вт, ЧТ 30.06.2021",
+                          "вт 31.05.2021", "вт 30.06", "30.06.2021",
+                          "вт пн 2021-06-30", "ср 01.01.2030", "")],
+            [(1, 3), (1, 3), None, None, None, None, None, None])
+        assert passed, alert
+
+    async def test_message_repeat(self):
+        self.create_processor()
+        first = date.today() + timedelta(1)
+        stored = self.adapter.append_data(
+            Supboard(User("U", telegram_id=5, phone_number="+7"),
+                     first + timedelta(7), time(18), count=2))
+        draft = Supboard(self.user, first, time(18))
+
+        state_manager = self.processor.state_manager
+        state_manager.get_state(101, 101)
+        state_manager.set_state(state_type="sup", state="repeat",
+                                data=draft)
+
+        weekday = RuSupboard.repeat_weekdays[first.weekday()]
+        until = (first + timedelta(20)).strftime(RuSupboard.date_format)
+        await self.processor.message_repeat(
+            self.create_message(f"{weekday} {until}"))
+
+        active = [reserve.start_date
+                  for reserve in self.adapter.get_active_reserves()
+                  if reserve.id != stored.id]
+        passed, alert = self.assert_params(
+            active, [first, first + timedelta(14)])
+        assert passed, alert
+
+        texts = {data["chat_id"]: data["text"] for method, data
+                 in self.requests if method == "sendMessage"}
+        conflict_day = (first + timedelta(7)).strftime(
+            RuSupboard.date_format)
+        passed, alert = self.assert_params(
+            (sorted(texts), f"⛔️ {conflict_day} 18:00" in texts[101],
+             texts[102] == texts[101], self.states.storage),
+            ([101, 102], True, True, {}))
+        assert passed, alert
+
+    async def test_message_repeat_error(self):
+        self.create_processor()
+        draft = Supboard(self.user, date.today() + timedelta(1), time(18))
+        state_manager = self.processor.state_manager
+        state_manager.get_state(101, 101)
+        state_manager.set_state(state_type="sup", state="repeat",
+                                data=draft)
+
+        await self.processor.message_repeat(self.create_message("каждый"))
+
+        texts = [data["text"] for method, data in self.requests
+                 if method == "sendMessage"]
+        passed, alert = self.assert_params(
+            (texts[-1], list(self.adapter.get_data()),
+             state_manager.state, state_manager.data is draft),
+            (RuSupboard.repeat_error_message, [], "book", True))
+        assert passed, alert
+
+    async def test_repeat_button(self):
+        self.create_processor()
+        state_manager = self.processor.state_manager
+        state_manager.get_state(101, 101)
+        state_manager.set_state(
+            state_type="sup", state="book",
+            data=Supboard(self.user, date.today() + timedelta(1), time(18)))
+
+        _, reply_markup, _, _ = self.processor.create_book_message()
+        buttons = [row[0].callback_data
+                   for row in reply_markup.inline_keyboard]
+        passed, alert = self.assert_params(buttons[-2:], ["repeat", "back"])
+        assert passed, alert
+
+        self.processor.admin_telegram_ids.clear()
+        _, reply_markup, _, _ = self.processor.create_book_message()
+        passed, alert = self.assert_params(
+            "repeat" in [row[0].callback_data
+                         for row in reply_markup.inline_keyboard], False)
+        assert passed, alert
@@ -0,0 +1,179 @@
+import asyncio
+import sqlite3
+from datetime import date, datetime, time, timedelta
+from .base_test_case import BaseTestCase
+from .mocks.clock import FakeClock
+
+from aiogram import Bot, Dispatcher, types
+from wakebot.adapters.data import MemoryDataAdapter
+from wakebot.adapters.sqlite import SqliteWakeAdapter
+from wakebot.adapters.state import StateManager
+from wakebot.entities import Wake, User
+from wakebot.processors import RuWake, WakeProcessor
+from wakebot.reminders import ReminderScheduler
+
+
+class ReminderSchedulerTestCase(BaseTestCase):
+    """ReminderScheduler class"""
+
+    def create_bot(self) -> Bot:
+        bot = Bot("123456:TEST")
+        self.requests = []
+
+        async def request(method, data=None, files=None, **kwargs):
+            self.requests.append((data.get("chat_id"), data.get("text")))
+            if method == "answerCallbackQuery":
+                return True
+            return {"message_id": 1, "date": 0,
+                    "chat": {"id": data["chat_id"], "type": "private"}}
+
+        bot.request = request
+        return bot
+
+    async def test_pop_due(self):
+        clock = FakeClock(datetime(2021, 6, 1, 9, 0))
+        scheduler = ReminderScheduler(self.create_bot(),
+                                      lead=timedelta(minutes=30),
+                                      clock=clock)
+        start = clock.now + timedelta(hours=1)
+
+        results = [scheduler.schedule("c", start + timedelta(minutes=20),
+                                      1, "c"),
+                   scheduler.schedule("a", start, 1, "a"),
+                   scheduler.schedule("b", start + timedelta(minutes=10),
+                                      1, "b"),
+                   scheduler.schedule("late", clock.now, 1, "late")]
+        passed, alert = self.assert_params(results, [True, True, True, False])
+        assert passed, alert
+
+        # A rescheduled reminder is moved, a cancelled one is skipped
+        scheduler.schedule("a", start + timedelta(minutes=15), 1, "a")
+        scheduler.cancel("b")
+        passed, alert = self.assert_params(
+            (scheduler.pending, "b" in scheduler), (2, False))
+        assert passed, alert
+
+        clock.now = start - timedelta(minutes=20)
+        passed, alert = self.assert_params(
+            scheduler.pop_due(), [])
+        assert passed, alert
+
+        clock.now = start
+        passed, alert = self.assert_params(
+            [reminder.key for reminder in scheduler.pop_due()], ["a", "c"])
+        assert passed, alert
+
+        passed, alert = self.assert_params(
+            (scheduler.pending, scheduler.get_delay()), (0, None))
+        assert passed, alert
+
+        await scheduler.bot.close()
+
+    async def test_compact(self):
+        clock = FakeClock(datetime(2021, 6, 1, 9, 0))
+        scheduler = ReminderScheduler(self.create_bot(), clock=clock)
+        start = clock.now + timedelta(days=1)
+        for i in range(1000):
+            scheduler.schedule("a", start + timedelta(minutes=i), 1, "a")
+
+        heap = scheduler._ReminderScheduler__heap
+        passed, alert = self.assert_params(
+            (scheduler.pending, len(heap) <= 66), (1, True))
+        assert passed, alert
+
+        clock.now = start + timedelta(days=1)
+        passed, alert = self.assert_params(
+            [reminder.remind_at for reminder in scheduler.pop_due()],
+            [start + timedelta(minutes=999) - scheduler.lead])
+        assert passed, alert
+
+        await scheduler.bot.close()
+
+    async def test_send(self):
+        scheduler = ReminderScheduler(self.create_bot(),
+                                      lead=timedelta(minutes=30), rate=100)
+        scheduler.start()
+        start = datetime.now() + scheduler.lead
+        scheduler.schedule("late", start + timedelta(seconds=0.2), 2, "late")
+        scheduler.schedule("soon", start + timedelta(seconds=0.05), 1, "soon")
+        scheduler.schedule("gone", start + timedelta(seconds=0.1), 3, "gone")
+        scheduler.cancel("gone")
+
+        await asyncio.sleep(0.3)
+        passed, alert = self.assert_params(
+            (self.requests, scheduler.sent, scheduler.pending),
+            ([(1, "soon"), (2, "late")], 2, 0))
+        assert passed, alert
+
+        await scheduler.stop()
+        await scheduler.bot.close()
+
+    async def test_load_reminders(self):
+        bot = self.create_bot()
+        adapter = SqliteWakeAdapter(sqlite3.connect(":memory:"))
+        processor = WakeProcessor(Dispatcher(bot),
+                                  StateManager(MemoryDataAdapter()),
+                                  RuWake, adapter)
+        processor.reminder_scheduler = ReminderScheduler(bot)
+
+        user = User("Firstname", telegram_id=101, phone_number="+77777")
+        tomorrow = date.today() + timedelta(days=1)
+        active = adapter.append_data(Wake(user, tomorrow, time(10)))
+        canceled = adapter.append_data(Wake(user, tomorrow, time(11)))
+        canceled.canceled = True
+        adapter.update_data(canceled)
+
+        count = processor.load_reminders()
+        passed, alert = self.assert_params(
+            (count, ("wake", active.id) in processor.reminder_scheduler,
+             ("wake", canceled.id) in processor.reminder_scheduler),
+            (1, True, False))
+        assert passed, alert
+
+        reminder = processor.reminder_scheduler.get(("wake", active.id))
+        passed, alert = self.assert_params(
+            (reminder.chat_id, reminder.remind_at,
+             "Вейкборд начинается через 30 минут" in reminder.text),
+            (101, active.start - timedelta(minutes=30), True))
+        assert passed, alert
+
+        await bot.close()
+
+    async def test_book_apply(self):
+        bot = self.create_bot()
+        Bot.set_current(bot)
+        adapter = SqliteWakeAdapter(sqlite3.connect(":memory:"))
+        processor = WakeProcessor(Dispatcher(bot),
+                                  StateManager(MemoryDataAdapter()),
+                                  RuWake, adapter)
+        processor.max_count = 2
+        processor.reminder_scheduler = ReminderScheduler(bot)
+
+        tomorrow = date.today() + timedelta(days=1)
+        stored = []
+        for telegram_id, message_id in ((101, 1), (102, 2)):
+            user = User("Firstname", telegram_id=telegram_id,
+                        phone_number="+77777")
+            processor.state_manager.get_state(telegram_id, telegram_id)
+            processor.state_manager.set_state(
+                state_type="wake", state="book",
+                data=Wake(user, tomorrow, time(10)))
+            await processor.callback_book(types.CallbackQuery.to_object(
+                {"id": str(message_id), "chat_instance": "1",
+                 "data": "apply",
+                 "from": {"id": telegram_id, "is_bot": False,
+                          "first_name": "U"},
+                 "message": {"message_id": message_id, "date": 0,
+                             "chat": {"id": telegram_id,
+                                      "type": "private"}}}))
+            stored.append(adapter.get_data_by_idempotency_key(
+                f"{telegram_id}-{message_id}"))
+
+        scheduler = processor.reminder_scheduler
+        passed, alert = self.assert_params(
+            (scheduler.pending, ("wake", stored[0].id) in scheduler,
+             ("wake", stored[1].id) in scheduler, ("wake", None) in scheduler),
+            (2, True, True, False))
+        assert passed, alert
+
+        await bot.close()
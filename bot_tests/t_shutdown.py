@@ -0,0 +1,87 @@
+import asyncio
+from .base_test_case import BaseTestCase
+from .mocks.aiogram import create_message_update
+
+from aiogram import Bot, Dispatcher, types
+from wakebot.shutdown import GracefulShutdown
+
+
+class GracefulShutdownTestCase(BaseTestCase):
+    """GracefulShutdown class"""
+
+    def create_dispatcher(self) -> Dispatcher:
+        dispatcher = Dispatcher(Bot("123456:TEST"))
+        self.handled = []
+
+        async def handle(message: types.Message):
+            await asyncio.sleep(float(message.text))
+            self.handled.append(message.message_id)
+
+        dispatcher.register_message_handler(handle, state="*")
+        return dispatcher
+
+    async def test_shutdown(self):
+        dispatcher = self.create_dispatcher()
+        shutdown = GracefulShutdown(dispatcher, timeout=0.1)
+        dispatcher.middleware.setup(shutdown)
+
+        offsets = []
+
+        async def get_updates(offset=None, limit=None, timeout=None):
+            offsets.append(offset)
+            return []
+
+        dispatcher.bot.get_updates = get_updates
+        events = []
+        shutdown.on_flush(lambda: events.append("flush"))
+        shutdown.on_close(lambda: events.append("close"))
+
+        tasks = [asyncio.ensure_future(dispatcher.process_updates(
+                    [types.Update.to_object(
+                        create_message_update(update_id, delay))]))
+                 for update_id, delay in ((1, "0.01"), (2, "5"), (3, "0.05"))]
+        await asyncio.sleep(0.001)
+        passed, alert = self.assert_params(shutdown.in_flight, 3)
+        assert passed, alert
+
+        shutdown_task = asyncio.ensure_future(shutdown.shutdown())
+        await asyncio.sleep(0)
+        await dispatcher.process_updates([types.Update.to_object(
+            create_message_update(4, "0"))])
+        report = await shutdown_task
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        passed, alert = self.assert_params(
+            (sorted(self.handled), report.drained, report.abandoned,
+             report.rejected, report.offset, offsets, events),
+            ([1, 3], 2, [2], 1, 2, [2], ["flush", "close"]))
+        assert passed, alert
+
+        await dispatcher.bot.close()
+
+    async def test_shutdown_callback_errors(self):
+        dispatcher = self.create_dispatcher()
+        shutdown = GracefulShutdown(dispatcher)
+        dispatcher.middleware.setup(shutdown)
+        closed = []
+
+        def fail():
+            raise RuntimeError("Close failure")
+
+        async def close():
+            closed.append(True)
+
+        shutdown.on_close(fail)
+        shutdown.on_close(close)
+
+        report = await shutdown.shutdown()
+
+        passed, alert = self.assert_params(
+            (report.drained, report.offset, len(report.errors), closed),
+            (0, None, 1, [True]))
+        assert passed, alert
+
+        passed, alert = self.assert_params(await shutdown.shutdown(), report)
+        assert passed, alert
+
+        await dispatcher.bot.close()
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from .base_test_case import BaseTestCase
+from .mocks.aiogram import create_message_update
+
+from aiogram import Bot, Dispatcher, types
+from wakebot.metrics import MetricsRegistry
+from wakebot.startup import Startup
+
+
+class FakeAdapter:
+    def __init__(self, delay: float = 0.05, error: Exception = None,
+                 failures: int = 1):
+        self.delay = delay
+        self.error = error
+        self.failures = failures
+        self.connection = None
+        self.calls = []
+
+    def connect(self):
+        time.sleep(self.delay)
+        self.calls.append("connect")
+        self.connection = self
+
+    def create_table(self):
+        if self.error and self.failures:
+            self.failures -= 1
+            raise self.error
+        self.calls.append("create_table")
+
+    def close(self):
+        self.calls.append("close")
+
+
+class StartupTestCase(BaseTestCase):
+    """Deferred storage startup"""
+
+    async def test_run(self):
+        adapters = [FakeAdapter(0.05) for _ in range(4)]
+        registry = MetricsRegistry()
+        startup = Startup(adapters, registry=registry)
+        warmed = []
+        startup.add_warmer("admins", lambda: warmed.append(startup.is_ready),
+                           required=True)
+        startup.add_warmer("reminders", lambda: warmed.append(True))
+
+        passed, alert = self.assert_params(startup.is_ready, False)
+        assert passed, alert
+
+        await startup.start()
+        passed, alert = self.assert_params(
+            [adapter.calls for adapter in adapters],
+            [["connect", "create_table"]] * 4)
+        assert passed, alert
+
+        # Adapters are connected concurrently
+        passed, alert = self.assert_params(
+            startup.timings["connect"] < 0.15, True)
+        assert passed, alert
+
+        # A required warmer is run before a storage is ready
+        passed, alert = self.assert_params(
+            (startup.is_ready, warmed, startup.start().done()),
+            (True, [False, True], True))
+        assert passed, alert
+
+        gauge = registry.metrics["wakebot_startup_seconds"]
+        passed, alert = self.assert_params(
+            sorted(startup.timings),
+            ["connect", "ready", "schema", "warm:admins", "warm:reminders"])
+        assert passed, alert
+        passed, alert = self.assert_params(
+            gauge.get(phase="ready"), startup.timings["ready"])
+        assert passed, alert
+
+        startup.close()
+        passed, alert = self.assert_params(adapters[0].calls[-1], "close")
+        assert passed, alert
+
+    async def test_serve_immediately(self):
+        startup = Startup([FakeAdapter(0.1)])
+        dispatcher = Dispatcher(Bot("123456:TEST"))
+        dispatcher.middleware.setup(startup)
+        handled = []
+
+        async def cmd_start(message: types.Message):
+            handled.append("start")
+
+        async def cmd_wake(message: types.Message):
+            handled.append("wake")
+
+        dispatcher.register_message_handler(cmd_start, commands=["start"])
+        dispatcher.register_message_handler(cmd_wake, commands=["wake"])
+        startup.serve_immediately(cmd_start)
+        startup.start()
+
+        wake = asyncio.ensure_future(
+            dispatcher.process_update(
+                types.Update.to_object(create_message_update(1, "/wake"))))
+        await asyncio.sleep(0.01)
+        await dispatcher.process_update(
+            types.Update.to_object(create_message_update(2, "/start")))
+
+        passed, alert = self.assert_params(
+            (handled, startup.waited), (["start"], 1))
+        assert passed, alert
+
+        await wake
+        passed, alert = self.assert_params(handled, ["start", "wake"])
+        assert passed, alert
+
+        await dispatcher.bot.close()
+
+    async def test_retry(self):
+        adapter = FakeAdapter(0.0, RuntimeError("no database"), failures=2)
+        startup = Startup([adapter], retry_delay=0.05)
+        startup.start()
+        await asyncio.sleep(0.02)
+
+        passed, alert = self.assert_params(
+            (startup.is_ready, startup.failures), (False, 1))
+        assert passed, alert
+
+        await startup.wait_ready()
+        passed, alert = self.assert_params(
+            (startup.is_ready, startup.failures, adapter.calls),
+            (True, 2, ["connect"] * 3 + ["create_table"]))
+        assert passed, alert
@@ -0,0 +1,86 @@
+from .base_test_case import BaseTestCase
+from .mocks.aiogram import create_callback_update
+from .mocks.clock import FakeClock
+
+from aiogram import Bot, Dispatcher, types
+from wakebot.metrics import MetricsRegistry
+from wakebot.throttling import TokenBucket, ThrottlingMiddleware
+
+
+class ThrottlingTestCase(BaseTestCase):
+    """Token bucket throttling"""
+
+    async def test_token_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+        passed, alert = self.assert_params(
+            [bucket.consume() for _ in range(4)], [True, True, True, False])
+        assert passed, alert
+
+        clock.now = 0.5
+        passed, alert = self.assert_params(
+            [bucket.consume(), bucket.consume()], [True, False])
+        assert passed, alert
+
+        clock.now = 100
+        passed, alert = self.assert_params(bucket.tokens, 0)
+        assert passed, alert
+        bucket.consume()
+        passed, alert = self.assert_params(bucket.tokens, 2)
+        assert passed, alert
+
+    async def test_middleware(self):
+        clock = FakeClock()
+        registry = MetricsRegistry()
+        middleware = ThrottlingMiddleware(
+            {"*": (1, 2), "next": (1, 1)}, global_rate=1, global_capacity=4,
+            registry=registry, answer_text="Slow down", clock=clock)
+
+        dispatcher = Dispatcher(Bot("123456:TEST"))
+        dispatcher.middleware.setup(middleware)
+        Bot.set_current(dispatcher.bot)
+        requests = []
+
+        async def request(method, data=None, files=None, **kwargs):
+            requests.append((method, data.get("text")))
+            return True
+
+        dispatcher.bot.request = request
+        handled = []
+
+        async def handle(callback_query: types.CallbackQuery):
+            handled.append((callback_query.from_user.id, callback_query.data))
+
+        dispatcher.register_callback_query_handler(handle, state="*")
+
+        taps = [(101, "book"), (101, "book"), (101, "book"),
+                (101, "next"), (101, "next"),
+                (102, "book"), (103, "book")]
+        for update_id, (user_id, data) in enumerate(taps, 1):
+            await dispatcher.process_updates(
+                [types.Update.to_object(
+                    create_callback_update(update_id, data, user_id))])
+
+        passed, alert = self.assert_params(
+            handled, [(101, "book"), (101, "book"), (101, "next"),
+                      (102, "book")])
+        assert passed, alert
+
+        passed, alert = self.assert_params(
+            requests, [("answerCallbackQuery", "Slow down")] * 3)
+        assert passed, alert
+
+        counter = registry.metrics["wakebot_updates_throttled_total"]
+        counts = [counter.get(update="callback_query", category=category,
+                              scope=scope)
+                  for category, scope in (("book", "user"), ("next", "user"),
+                                          ("book", "global"))]
+        passed, alert = self.assert_params(counts, [1, 1, 1])
+        assert passed, alert
+
+        passed, alert = self.assert_params(
+            middleware.get_bucket(103, "book").tokens, 2)
+        assert passed, alert
+
+        await dispatcher.bot.close()
@@ -0,0 +1,181 @@
+import asyncio
+import sqlite3
+from datetime import date, datetime, time, timedelta
+from .base_test_case import BaseTestCase
+from .mocks.clock import FakeClock
+
+from aiogram import Bot, Dispatcher, types
+from wakebot.adapters.data import MemoryDataAdapter
+from wakebot.adapters.sqlite import SqliteSupboardAdapter
+from wakebot.adapters.state import StateManager
+from wakebot.entities import Supboard, User
+from wakebot.processors import RuSupboard, SupboardProcessor
+from wakebot.waitlist import Waitlist
+
+
+def create_user(telegram_id: int) -> User:
+    return User(f"User{telegram_id}", telegram_id=telegram_id,
+                phone_number="+79990001122")
+
+
+class WaitlistTestCase(BaseTestCase):
+    """Waitlist class"""
+
+    async def test_get_candidates(self):
+        clock = FakeClock(datetime(2021, 6, 1, 9, 0))
+        waitlist = Waitlist(clock=clock)
+        day = clock.now.date()
+
+        first = waitlist.add("sup", Supboard(create_user(1), day, time(10)), 1)
+        later = waitlist.add("sup", Supboard(create_user(2), day, time(12)), 2)
+        third = waitlist.add(
+            "sup", Supboard(create_user(3), day, time(10, 30)), 3)
+        waitlist.add("wake", Supboard(create_user(4), day, time(10)), 4)
+        waitlist.add("sup", Supboard(create_user(5), day + timedelta(days=1),
+                                     time(10)), 5)
+        repeated = waitlist.add(
+            "sup", Supboard(create_user(1), day, time(10)), 1)
+
+        passed, alert = self.assert_params(
+            (waitlist.pending, repeated is first), (5, True))
+        assert passed, alert
+
+        freed = Supboard(create_user(9), day, time(10), set_count=2)
+        passed, alert = self.assert_params(
+            [entry.id for entry in waitlist.get_candidates("sup", freed)],
+            [first.id, third.id])
+        assert passed, alert
+
+        # Started drafts are dropped
+        clock.now = datetime.combine(day, time(10, 15))
+        passed, alert = self.assert_params(
+            [entry.id for entry in waitlist.get_candidates("sup", freed)],
+            [third.id])
+        assert passed, alert
+
+        passed, alert = self.assert_params(
+            (waitlist.pending, first.id in waitlist, later.id in waitlist),
+            (4, False, True))
+        assert passed, alert
+
+    async def test_offer(self):
+        waitlist = Waitlist(claim_timeout=0.05)
+        day = date.today() + timedelta(days=1)
+        first = waitlist.add("sup", Supboard(create_user(1), day, time(10)), 1)
+        second = waitlist.add("sup", Supboard(create_user(2), day, time(10)),
+                              2)
+        expired = []
+
+        waitlist.offer(first, expired.append)
+        passed, alert = self.assert_params(
+            ([entry.id for entry in waitlist.get_candidates(
+                "sup", first.reserve)], waitlist.claim(second.id)),
+            ([second.id], None))
+        assert passed, alert
+
+        await asyncio.sleep(0.1)
+        passed, alert = self.assert_params(
+            (expired, waitlist.claim(first.id), first.id in waitlist),
+            ([first], None, False))
+        assert passed, alert
+
+        waitlist.offer(second)
+        passed, alert = self.assert_params(
+            (waitlist.withdraw(second.id), second.timer,
+             waitlist.claim(second.id),
+             [entry.id for entry in waitlist.get_candidates(
+                 "sup", second.reserve)]),
+            (second, None, None, [second.id]))
+        assert passed, alert
+
+        waitlist.offer(second)
+        passed, alert = self.assert_params(
+            (waitlist.claim(second.id), waitlist.pending), (second, 0))
+        assert passed, alert
+
+    async def test_promote_waitlist(self):
+        bot = Bot("123456:TEST")
+        Bot.set_current(bot)
+        requests = []
+
+        async def request(method, data=None, files=None, **kwargs):
+            requests.append((method, dict(data or {})))
+            if method in ("sendMessage", "editMessageText"):
+                return {"message_id": 7, "date": 0, "text": data["text"],
+                        "chat": {"id": data["chat_id"], "type": "private"}}
+            return True
+
+        bot.request = request
+        adapter = SqliteSupboardAdapter(sqlite3.connect(":memory:"))
+        processor = SupboardProcessor(Dispatcher(bot),
+                                      StateManager(MemoryDataAdapter()),
+                                      RuSupboard, adapter)
+        processor.waitlist = Waitlist()
+
+        day = date.today() + timedelta(days=1)
+        booked = adapter.append_data(Supboard(create_user(101), day,
+                                              time(10)))
+        draft = Supboard(create_user(202), day, time(10, 15))
+        entry = processor.waitlist.add("sup", draft, 202)
+
+        await processor.promote_waitlist(booked)
+        passed, alert = self.assert_params(requests, [])
+        assert passed, alert
+
+        booked.canceled = True
+        adapter.update_data(booked)
+        await processor.promote_waitlist(booked)
+
+        method, data = requests.pop()
+        passed, alert = self.assert_params(
+            (method, data["chat_id"], f"claim-sup-{entry.id}" in
+             data["reply_markup"]),
+            ("sendMessage", 202, True))
+        assert passed, alert
+
+        def press():
+            return types.CallbackQuery.to_object(
+                {"id": "1", "chat_instance": "1",
+                 "data": f"claim-sup-{entry.id}",
+                 "from": {"id": 202, "is_bot": False, "first_name": "U"},
+                 "message": {"message_id": 7, "date": 0,
+                             "chat": {"id": 202, "type": "private"}}})
+
+        blocker = adapter.append_data(Supboard(create_user(303), day,
+                                               time(10)))
+        await processor.callback_claim(press())
+        answers = [data["text"] for method, data in requests
+                   if method == "answerCallbackQuery"]
+        passed, alert = self.assert_params(
+            (answers, processor.waitlist.get(entry.id), entry.offered_until),
+            ([RuSupboard.apply_error_callback], entry, None))
+        assert passed, alert
+
+        requests.clear()
+        blocker.canceled = True
+        adapter.update_data(blocker)
+        await processor.promote_waitlist(blocker)
+        passed, alert = self.assert_params(
+            [method for method, data in requests], ["sendMessage"])
+        assert passed, alert
+
+        requests.clear()
+        await processor.callback_claim(press())
+        active = [reserve.user.telegram_id
+                  for reserve in adapter.get_active_reserves()]
+        answers = [data["text"] for method, data in requests
+                   if method == "answerCallbackQuery"]
+        passed, alert = self.assert_params(
+            (active, answers, processor.waitlist.pending),
+            ([202], [RuSupboard.apply_button_callback], 0))
+        assert passed, alert
+
+        requests.clear()
+        await processor.callback_claim(press())
+        answers = [data["text"] for method, data in requests
+                   if method == "answerCallbackQuery"]
+        passed, alert = self.assert_params(
+            answers, [RuSupboard.claim_expired_callback])
+        assert passed, alert
+
+        await bot.close()
@@ -0,0 +1,40 @@
+import argparse
+import json
+import platform
+from datetime import datetime
+
+from bot_benchmarks import RowMapperBenchmark, ReserveMemoryBenchmark
+from bot_benchmarks import ListRenderBenchmark, ReserveTimelineBenchmark
+from bot_benchmarks import BookingLoadBenchmark, AdapterBenchmark
+from bot_benchmarks import EndToEndBenchmark
+
+benchmarks = {
+    "mapper": RowMapperBenchmark,
+    "memory": ReserveMemoryBenchmark,
+    "render": ListRenderBenchmark,
+    "timeline": ReserveTimelineBenchmark,
+    "load": BookingLoadBenchmark,
+    "adapters": AdapterBenchmark,
+    "e2e": EndToEndBenchmark,
+}
+
+parser = argparse.ArgumentParser(description="Run benchmarks")
+parser.add_argument("names", nargs="*", metavar="name",
+                    help="benchmarks to run: " + ", ".join(benchmarks)
+                    + " (all by default)")
+parser.add_argument("--output", help="a JSON file path to write results")
+args = parser.parse_args()
+
+unknown = set(args.names) - set(benchmarks)
+if unknown:
+    parser.error("unknown benchmarks: " + ", ".join(sorted(unknown)))
+
+results = {"python": platform.python_version(),
+           "started": datetime.now().isoformat(timespec="seconds")}
+
+for name in args.names or benchmarks:
+    results[name] = benchmarks[name]().run_benchmarks()
+
+if args.output:
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2, default=str)
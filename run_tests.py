@@ -1,21 +1,41 @@
 from bot_tests.data.t_state import StateManagerTestCase
 from bot_tests.data.t_state import StateProviderTestCase
 from bot_tests.data.t_adapters import MemoryDataAdapterTestCase
+from bot_tests.data.t_occupancy import MemoryOccupancyAdapterTestCase
+from bot_tests.data.t_mapper import RowMapperTestCase
+from bot_tests.data.t_timeline import ReserveTimelineTestCase
+from bot_tests.data.t_tracing import QueryTracerTestCase
 
 from bot_tests.entities import ReserveTestCase, UserTestCase, WakeTestCase
-from bot_tests.entities import SupboardTestCase
+from bot_tests.entities import SupboardTestCase, RecurrenceTestCase
 from bot_tests.processors import DefaultProcessorTestCase
 from bot_tests.processors import ReserveProcessorTestCase
 from bot_tests.processors import WakeProcessorTestCase
 from bot_tests.processors import SupboardProcessorTestCase
+from bot_tests.metrics import MetricsRegistryTestCase
+from bot_tests.metrics import MetricsMiddlewareTestCase
+from bot_tests.metrics import LoopWatchdogTestCase
+from bot_tests.metrics import SamplingProfilerTestCase
+from bot_tests.t_cluster import ClusterTestCase
+from bot_tests.t_dedup import DeduplicationTestCase
+from bot_tests.t_shutdown import GracefulShutdownTestCase
+from bot_tests.t_coalescing import EditCoalescerTestCase
+from bot_tests.t_throttling import ThrottlingTestCase
+from bot_tests.t_startup import StartupTestCase
+from bot_tests.t_reminders import ReminderSchedulerTestCase
+from bot_tests.t_waitlist import WaitlistTestCase
+from bot_tests.t_recurring import RecurringReserveTestCase
 
 from bot_tests.data.sqlite import SqliteUserAdapterTestCase
 from bot_tests.data.sqlite import SqliteWakeAdapterTestCase
 from bot_tests.data.sqlite import SqliteSupboardAdapterTestCase
+from bot_tests.data.sqlite import SqliteOccupancyAdapterTestCase
 
 from bot_tests.data.postgres import PostgresSupboardAdapterTestCase
 from bot_tests.data.postgres import PostgresWakeAdapterTestCase
 from bot_tests.data.postgres import PostgresUserAdapterTestCase
+from bot_tests.data.postgres import PostgresOccupancyAdapterTestCase
+from bot_tests.data.postgres import PostgresQueryTracerTestCase
 
 test_count = fail_count = 0
 
@@ -31,6 +51,22 @@ tests, fails = MemoryDataAdapterTestCase().run_tests_async()
 test_count += tests
 fail_count += fails
 
+tests, fails = MemoryOccupancyAdapterTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = RowMapperTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = ReserveTimelineTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = QueryTracerTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
 tests, fails = UserTestCase().run_tests_async()
 test_count += tests
 fail_count += fails
@@ -47,6 +83,10 @@ tests, fails = SupboardTestCase().run_tests_async()
 test_count += tests
 fail_count += fails
 
+tests, fails = RecurrenceTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
 tests, fails = DefaultProcessorTestCase().run_tests_async()
 test_count += tests
 fail_count += fails
@@ -63,6 +103,55 @@ tests, fails = SupboardProcessorTestCase().run_tests_async()
 test_count += tests
 fail_count += fails
 
+tests, fails = MetricsRegistryTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = MetricsMiddlewareTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = LoopWatchdogTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = SamplingProfilerTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = ClusterTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = DeduplicationTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = GracefulShutdownTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = EditCoalescerTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = ThrottlingTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+tests, fails = StartupTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+tests, fails = ReminderSchedulerTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+tests, fails = WaitlistTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = RecurringReserveTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
 tests, fails = SqliteSupboardAdapterTestCase().run_tests_async()
 test_count += tests
 fail_count += fails
@@ -75,6 +164,10 @@ tests, fails = SqliteUserAdapterTestCase().run_tests_async()
 test_count += tests
 fail_count += fails
 
+tests, fails = SqliteOccupancyAdapterTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
 tests, fails = PostgresSupboardAdapterTestCase().run_tests_async()
 test_count += tests
 fail_count += fails
@@ -87,4 +180,12 @@ tests, fails = PostgresUserAdapterTestCase().run_tests_async()
 test_count += tests
 fail_count += fails
 
+tests, fails = PostgresOccupancyAdapterTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
+tests, fails = PostgresQueryTracerTestCase().run_tests_async()
+test_count += tests
+fail_count += fails
+
 print(f"\nRan {test_count} test (failure = {fail_count}) ")
@@ -1,7 +1,12 @@
+import asyncio
+import logging
 import psycopg2
 import os
+from datetime import timedelta
+from functools import partial
 
 from aiogram import Bot
+from aiogram.bot import api
 from aiogram.dispatcher import Dispatcher
 from aiogram.utils import executor
 from aiogram.contrib.middlewares.logging import LoggingMiddleware
@@ -13,6 +18,18 @@ from wakebot.adapters.state import StateManager
 from wakebot.adapters.postgres import PostgressWakeAdapter
 from wakebot.adapters.postgres import PostgressSupboardAdapter
 from wakebot.adapters.postgres import PostgresUserAdapter
+from wakebot.adapters.postgres import PostgresOccupancyAdapter
+from wakebot.adapters.tracing import QueryTracer, TracedConnection
+from wakebot.metrics import MetricsRegistry, MetricsMiddleware
+from wakebot.metrics import MetricsServer, LoopWatchdog, instrument_bot
+from wakebot.metrics import SamplingProfiler
+from wakebot.dedup import DeduplicationMiddleware
+from wakebot.shutdown import GracefulShutdown
+from wakebot.coalescing import EditCoalescer
+from wakebot.throttling import ThrottlingMiddleware
+from wakebot.startup import Startup
+from wakebot.reminders import ReminderScheduler
+from wakebot.waitlist import Waitlist
 
 from config import DefaultStrings, WakeStrings, SupboardStrings
 
@@ -21,39 +38,201 @@ DATABASE_URL = os.environ.get("DATABASE_URL")
 board_count = os.environ.get("BOARD_COUNT")
 hydro_count = os.environ.get("HYDRO_COUNT")
 sup_count = os.environ.get("SUP_COUNT")
+metrics_port = os.environ.get("METRICS_PORT")
+loop_stall_ms = os.environ.get("LOOP_STALL_MS")
+profile_rate = os.environ.get("PROFILE_RATE")
+slow_query_ms = os.environ.get("SLOW_QUERY_MS")
+explain_slow_queries = os.environ.get("EXPLAIN_SLOW_QUERIES")
+shutdown_timeout = os.environ.get("SHUTDOWN_TIMEOUT")
+edit_window_ms = os.environ.get("EDIT_WINDOW_MS", "250")
+telegram_api_url = os.environ.get("TELEGRAM_API_URL")
+throttle_rate = os.environ.get("THROTTLE_RATE", "2")
+throttle_burst = os.environ.get("THROTTLE_BURST", "6")
+global_rate_limit = os.environ.get("GLOBAL_RATE_LIMIT")
+reminder_minutes = os.environ.get("REMINDER_MINUTES", "30")
+reminder_rate = os.environ.get("REMINDER_RATE", "20")
+claim_minutes = os.environ.get("WAITLIST_CLAIM_MINUTES", "10")
+
+if telegram_api_url:
+    # A local Bot API server, e.g. bot_benchmarks/fake_api.py
+    api.API_URL = telegram_api_url
 
 bot = Bot(token=TOKEN)
 dp = Dispatcher(bot)
 dp.middleware.setup(LoggingMiddleware())
+# A dyno is killed in 30 seconds after SIGTERM
+graceful_shutdown = GracefulShutdown(
+    dp, timeout=float(shutdown_timeout) if shutdown_timeout else 20.0)
+dp.middleware.setup(graceful_shutdown)
+dp.middleware.setup(DeduplicationMiddleware())
+
+metrics_registry = metrics_server = loop_watchdog = None
+if metrics_port:
+    metrics_registry = MetricsRegistry()
+    dp.middleware.setup(MetricsMiddleware(metrics_registry))
+    instrument_bot(bot, metrics_registry)
+    metrics_server = MetricsServer(metrics_registry, port=int(metrics_port))
+    loop_watchdog = LoopWatchdog(
+        metrics_registry,
+        threshold=float(loop_stall_ms or 250) / 1000)
 
+if float(throttle_rate):
+    rate, burst = float(throttle_rate), float(throttle_burst)
+    # List pages query active reservations, they are limited stricter
+    dp.middleware.setup(ThrottlingMiddleware(
+        {"*": (rate, burst), "next": (rate / 2, burst / 2),
+         "prev": (rate / 2, burst / 2)},
+        global_rate=float(global_rate_limit) if global_rate_limit else None,
+        registry=metrics_registry))
+
+# Installed after the metrics, so only sent edits are measured
+if float(edit_window_ms):
+    edit_coalescer = EditCoalescer(float(edit_window_ms) / 1000)
+    edit_coalescer.install(bot)
+    graceful_shutdown.on_flush(edit_coalescer.flush)
 
 state_manager = StateManager(MemoryDataAdapter())
 
+query_tracer = None
+if slow_query_ms:
+    query_tracer = QueryTracer(slow_threshold=float(slow_query_ms) / 1000,
+                               explain=bool(explain_slow_queries))
+
+
+def connect():
+    connection = psycopg2.connect(DATABASE_URL)
+    if query_tracer:
+        connection = TracedConnection(connection, query_tracer)
+    return connection
+
+
+# Adapters are connected by the startup after polling is started
 default_processor = DefaultProcessor(dp, DefaultStrings)
-connection = psycopg2.connect(DATABASE_URL)
 user_adapter = PostgresUserAdapter(database_url=DATABASE_URL,
-                                   table_name="wp38_users")
+                                   table_name="wp38_users",
+                                   connection_factory=connect, lazy=True)
+occupancy_adapter = PostgresOccupancyAdapter(database_url=DATABASE_URL,
+                                             table_name="wp38_occupancy",
+                                             connection_factory=connect,
+                                             lazy=True)
 
 wake_adapter = PostgressWakeAdapter(database_url=DATABASE_URL,
-                                    table_name="wp38_wake")
+                                    table_name="wp38_wake",
+                                    occupancy_adapter=occupancy_adapter,
+                                    connection_factory=connect, lazy=True)
 wake_processor = WakeProcessor(dp,
                                state_manager=state_manager,
                                strings=WakeStrings,
                                data_adapter=wake_adapter,
-                               user_data_adapter=user_adapter)
+                               user_data_adapter=user_adapter,
+                               lazy=True)
 wake_processor.logger_id = 586350636
 wake_processor.board_count = int(board_count) if board_count else 5
 wake_processor.hydro_count = int(hydro_count) if hydro_count else 10
 
 sup_adapter = PostgressSupboardAdapter(database_url=DATABASE_URL,
-                                       table_name="wp38_supboard")
+                                       table_name="wp38_supboard",
+                                       occupancy_adapter=occupancy_adapter,
+                                       connection_factory=connect,
+                                       lazy=True)
 sup_processor = SupboardProcessor(dp,
                                   state_manager=state_manager,
                                   strings=SupboardStrings,
                                   data_adapter=sup_adapter,
-                                  user_data_adapter=user_adapter)
+                                  user_data_adapter=user_adapter,
+                                  lazy=True)
 sup_processor.max_count = int(sup_count) if sup_count else 10
 sup_processor.logger_id = 586350636
 
+profiler_admin_ids = [wake_processor.logger_id]
+
+
+def load_admins():
+    """Load administrators once for both processors"""
+    admin_telegram_ids = wake_processor.load_admins()
+    sup_processor.admin_telegram_ids[:] = admin_telegram_ids
+    profiler_admin_ids[1:] = admin_telegram_ids
+
+
+startup = Startup(
+    (user_adapter, occupancy_adapter, wake_adapter, sup_adapter),
+    registry=metrics_registry)
+startup.serve_immediately(default_processor.cmd_start,
+                          default_processor.cmd_help)
+# Admins get an admin menu and notifications from a first update
+startup.add_warmer("admins", load_admins, required=True)
+dp.middleware.setup(startup)
+graceful_shutdown.on_close(startup.close)
+
+reminder_scheduler = None
+if float(reminder_minutes):
+    reminder_scheduler = ReminderScheduler(
+        bot, lead=timedelta(minutes=float(reminder_minutes)),
+        rate=float(reminder_rate), parse_mode=WakeStrings.parse_mode)
+
+
+def load_reminders(loop: asyncio.AbstractEventLoop):
+    """Read active reservations in an executor thread
+
+    The scheduler is not thread-safe, reminders are scheduled
+    in the loop thread. The callback is queued ahead of the executor
+    result, so reminders exist once the warmer is done.
+    """
+    wake_reserves = list(wake_adapter.get_active_reserves())
+    sup_reserves = list(sup_adapter.get_active_reserves())
+    loop.call_soon_threadsafe(schedule_reminders, wake_reserves,
+                              sup_reserves)
+
+
+def schedule_reminders(wake_reserves: list, sup_reserves: list):
+    count = (wake_processor.load_reminders(wake_reserves)
+             + sup_processor.load_reminders(sup_reserves))
+    logging.getLogger("wakebot.reminders").info(
+        f"{count} reminders are scheduled")
+
+
+profiler = None
+if profile_rate:
+    profiler = SamplingProfiler(int(profile_rate))
+    dp.middleware.setup(profiler)
+    profiler.register_command(dp, profiler_admin_ids)
+
+
+async def on_startup(dispatcher):
+    graceful_shutdown.install_signals(dispatcher.loop)
+    if reminder_scheduler:
+        # Cluster workers do not run reminders, a standalone bot does
+        wake_processor.reminder_scheduler = reminder_scheduler
+        sup_processor.reminder_scheduler = reminder_scheduler
+        # Reminders are loaded before handlers are served, so
+        # a cancellation can't precede its reminder
+        startup.add_warmer("reminders",
+                           partial(load_reminders, dispatcher.loop),
+                           required=True)
+        reminder_scheduler.start()
+        graceful_shutdown.on_close(reminder_scheduler.stop)
+    if float(claim_minutes):
+        # A waitlist is in memory, cluster workers do not share it
+        waitlist = Waitlist(claim_timeout=float(claim_minutes) * 60)
+        wake_processor.waitlist = waitlist
+        sup_processor.waitlist = waitlist
+    startup.start()
+    if profiler:
+        profiler.install_signal(dispatcher.loop)
+    if metrics_server:
+        await metrics_server.start()
+        await loop_watchdog.start()
+
+
+async def on_shutdown(dispatcher):
+    await graceful_shutdown.shutdown()
+    if profiler:
+        profiler.stop()
+    if metrics_server:
+        await loop_watchdog.stop()
+        await metrics_server.stop()
+
+
 if __name__ == "__main__":
-    executor.start_polling(dp)
+    executor.start_polling(dp, on_startup=on_startup,
+                           on_shutdown=on_shutdown)
@@ -0,0 +1,39 @@
+import asyncio
+import os
+
+from aiogram import Bot
+from aiohttp import web
+
+from wakebot.cluster import WorkerPool, create_webhook_app, run_worker
+
+TOKEN = os.environ["TOKEN"]
+WEBHOOK_URL = os.environ.get("WEBHOOK_URL")
+WEBHOOK_PATH = os.environ.get("WEBHOOK_PATH", "/webhook")
+WORKER_COUNT = int(os.environ.get("WORKER_COUNT") or os.cpu_count())
+PORT = int(os.environ.get("PORT", 8080))
+
+
+def run_bot_worker(connection):
+    """Run a bot worker process with its own dispatcher and connections"""
+    import bot
+
+    asyncio.run(run_worker(bot.dp, connection))
+
+
+if __name__ == "__main__":
+    pool = WorkerPool(run_bot_worker, WORKER_COUNT)
+    app = create_webhook_app(pool, WEBHOOK_PATH)
+    front_bot = Bot(token=TOKEN)
+
+    async def on_startup(app):
+        pool.start()
+        if WEBHOOK_URL:
+            await front_bot.set_webhook(WEBHOOK_URL + WEBHOOK_PATH)
+
+    async def on_shutdown(app):
+        pool.stop()
+        await front_bot.close()
+
+    app.on_startup.append(on_startup)
+    app.on_shutdown.append(on_shutdown)
+    web.run_app(app, port=PORT)
@@ -0,0 +1,35 @@
+import os
+import sys
+
+from wakebot.adapters.postgres import PostgressWakeAdapter
+from wakebot.adapters.postgres import PostgressSupboardAdapter
+from wakebot.adapters.postgres import PostgresOccupancyAdapter
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+
+
+def rebuild_occupancy():
+    """Rebuild slot occupancy table from scratch"""
+    occupancy_adapter = PostgresOccupancyAdapter(database_url=DATABASE_URL,
+                                                 table_name="wp38_occupancy")
+
+    wake_adapter = PostgressWakeAdapter(database_url=DATABASE_URL,
+                                        table_name="wp38_wake",
+                                        occupancy_adapter=occupancy_adapter)
+    wake_adapter.rebuild_occupancy()
+
+    sup_adapter = PostgressSupboardAdapter(database_url=DATABASE_URL,
+                                           table_name="wp38_supboard",
+                                           occupancy_adapter=occupancy_adapter)
+    sup_adapter.rebuild_occupancy()
+
+
+commands = {}
+commands["rebuild_occupancy"] = rebuild_occupancy
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(f"Usage: python {sys.argv[0]} <{'|'.join(commands)}>")
+        sys.exit(1)
+
+    commands[sys.argv[1]]()
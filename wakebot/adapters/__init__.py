@@ -1,7 +1,11 @@
 from .data import BaseDataAdapter
 from .data import MemoryDataAdapter
+from .data import MemoryOccupancyAdapter
 from .data import ReserveDataAdapter
 from .state import StateManager
+from .timeline import ReserveTimeline
+from .tracing import QueryTracer, TracedConnection
 
 if __name__ == "__main__":
     BaseDataAdapter, MemoryDataAdapter, ReserveDataAdapter, StateManager
+    MemoryOccupancyAdapter, ReserveTimeline, QueryTracer, TracedConnection
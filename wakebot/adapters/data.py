@@ -1,6 +1,10 @@
-from typing import Union
+from typing import Callable, Optional, Union
+from datetime import date, datetime
+from time import monotonic
+from uuid import uuid4
 from ..entities.reserve import Reserve
 from ..entities.user import User
+from ..entities.epoch import epoch_minutes_to_date
 
 
 class BaseDataAdapter:
@@ -136,7 +140,14 @@ class MemoryDataAdapter(BaseDataAdapter):
 
 
 class ReserveDataAdapter:
-    """A base wakeboard reservation adapter class"""
+    """A base wakeboard reservation adapter class
+
+    Attributes:
+        occupancy_adapter:
+            Optional. A slot occupancy adapter updated on every change
+    """
+
+    occupancy_adapter = None
 
     def get_data(self) -> iter:
         """Get a full set of data from storage
@@ -158,11 +169,41 @@ class ReserveDataAdapter:
         """
         return NotImplementedError
 
-    def get_active_reserves(self) -> iter:
+    def get_active_reserves(self,
+                            page_cursor: Optional[tuple] = None,
+                            limit: Optional[int] = None,
+                            backward: bool = False) -> iter:
         """Get an active wakeboard reservations from storage
 
+        Args:
+            page_cursor:
+                Optional. A (start, id) tuple of a page boundary reservation.
+                Reservations after the boundary are returned
+                (or before it if backward).
+            limit:
+                Optional. A maximum count of reservations (a page size).
+            backward:
+                Optional. A boolean indicates to get a page before cursor.
+
         Returns:
-            A iterator object of given data
+            A iterator object of given data ordered by start and id
+        """
+        raise NotImplementedError
+
+    def get_reserves_between(self, start: datetime, end: datetime,
+                             include_canceled: bool = False) -> iter:
+        """Get a reservations are started in a time range
+
+        Args:
+            start:
+                A range start datetime (inclusive).
+            end:
+                A range end datetime (exclusive).
+            include_canceled:
+                Optional. A boolean indicates to include canceled reservations.
+
+        Returns:
+            A iterator object of given data ordered by start and id
         """
         raise NotImplementedError
 
@@ -182,15 +223,124 @@ class ReserveDataAdapter:
         """
         raise NotImplementedError
 
-    def append_data(self, reserve: Reserve) -> Reserve:
+    def get_concurrent_counts(self, reserves: list) -> list:
+        """Get a concurrent reservations counts of a batch by one query
+
+        Args:
+            reserves:
+                A list of reservations (e.g. recurring occurrences)
+
+        Returns:
+            A list of integer counts in the reservations order
+        """
+        raise NotImplementedError
+
+    def get_ids_by_idempotency_keys(self, keys: list) -> dict:
+        """Get a stored reservation identifiers by idempotency keys
+
+        Returns:
+            A dictionary of integer identifiers by stored keys
+        """
+        raise NotImplementedError
+
+    def check_capacity(self, reserves: list, max_count: int) -> list:
+        """Check a batch of reservations fits a capacity
+
+        Stored concurrent counts are got by one query, counts of
+        preceding fitting reservations of the batch are added to them,
+        so overlapped reservations of a batch are not overbooked.
+
+        Returns:
+            A list of booleans in the reservations order
+        """
+        result = []
+        fitting = []
+        counts = self.get_concurrent_counts(reserves) if reserves else []
+        for reserve, count in zip(reserves, counts):
+            count += sum(other.count for other in fitting
+                         if other.start < reserve.end
+                         and reserve.start < other.end)
+            fits = count + reserve.count <= max_count
+            if fits:
+                fitting.append(reserve)
+            result.append(fits)
+
+        return result
+
+    def append_data(self, reserve: Reserve,
+                    idempotency_key: Optional[str] = None) -> Reserve:
         """Append new data to storage
 
         Args:
             reserve:
                 An instance of entity wake class.
+            idempotency_key:
+                Optional. A unique key of the insert. A stored reservation
+                is returned instead of a new one on a repeated key.
         """
         return NotImplementedError
 
+    def append_many(self, reserves: list, max_count: Optional[int] = None,
+                    idempotency_key: Optional[str] = None) -> tuple:
+        """Append a batch of reservations in one transaction
+
+        Reservations are checked against a capacity by one query and
+        fitting ones are inserted by one statement, instead of a check
+        and an insert per reservation.
+
+        Args:
+            reserves:
+                A list of reservations (e.g. recurring occurrences).
+            max_count:
+                Optional. A capacity reservations are checked against,
+                conflicting ones are not appended.
+            idempotency_key:
+                Optional. A unique key of the batch. Reservations stored
+                with the key are returned instead of new ones on
+                a repeated key.
+
+        Returns:
+            An (appended, conflicts) tuple of reservation lists,
+            appended reservations have identifiers.
+        """
+        batch_key = idempotency_key or uuid4().hex
+        keys = [f"{batch_key}-{i}" for i in range(len(reserves))]
+        ids = self.get_ids_by_idempotency_keys(keys) if keys else {}
+
+        pending = [(key, reserve) for key, reserve in zip(keys, reserves)
+                   if key not in ids]
+        fits = [True] * len(pending)
+        if max_count is not None:
+            fits = self.check_capacity(
+                [reserve for _, reserve in pending], max_count)
+
+        accepted = [row for row, fit in zip(pending, fits) if fit]
+        conflicts = [reserve for (_, reserve), fit in zip(pending, fits)
+                     if not fit]
+        if accepted:
+            ids.update(self.insert_many(accepted))
+
+        appended = []
+        for key, reserve in zip(keys, reserves):
+            if key in ids:
+                result = reserve.__deepcopy__()
+                result.id = ids[key]
+                appended.append(result)
+
+        return appended, conflicts
+
+    def insert_many(self, rows: list) -> dict:
+        """Insert reservations in one transaction
+
+        Args:
+            rows:
+                A list of (idempotency key, reservation) tuples
+
+        Returns:
+            A dictionary of integer identifiers by idempotency keys
+        """
+        raise NotImplementedError
+
     def update_data(self, reserve: Reserve):
         """Append new data to storage
 
@@ -212,6 +362,22 @@ class ReserveDataAdapter:
         """
         return NotImplementedError
 
+    def rebuild_occupancy(self):
+        """Rebuild slot occupancy of the adapter from scratch"""
+        return NotImplementedError
+
+    def get_day_occupancy(self, day: date) -> Union[list, None]:
+        """Get a day slot occupancy of the adapter
+
+        Args:
+            day:
+                A date of occupancy
+
+        Returns:
+            A list of slot counters or None if occupancy isn't tracked
+        """
+        return None
+
 
 class UserDataAdapter:
     """A base user adapter class"""
@@ -285,3 +451,260 @@ class UserDataAdapter:
             A iterator object of given data
         """
         return NotImplementedError
+
+
+class OccupancyDataAdapter:
+    """A base slot occupancy adapter class
+
+    An occupancy is a per-resource, per-day counter table. A day is divided
+    by slots of slot_minutes length and every slot contains a sum of
+    reservation counts that take the slot.
+
+    Attributes:
+        slot_minutes:
+            An integer slot duration in minutes
+        slot_count:
+            An integer count of slots per day
+    """
+
+    slot_minutes = 5
+    slot_count = 24 * 60 // slot_minutes
+
+    def get_day_slots(self, resource: str, day: date) -> list:
+        """Get a slot counters of a day
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            day:
+                A date of occupancy
+
+        Returns:
+            A list of slot_count integer counters
+        """
+        return NotImplementedError
+
+    def get_day_total(self, resource: str, day: date) -> int:
+        """Get a sum of slot counters of a day
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            day:
+                A date of occupancy
+
+        Returns:
+            An integer count of taken slots
+        """
+        return NotImplementedError
+
+    def replace_reserve(self, resource: str,
+                        previous: Union[Reserve, None],
+                        reserve: Union[Reserve, None]):
+        """Replace a reservation slots by other ones
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            previous:
+                Optional. A stored reservation state to release
+            reserve:
+                Optional. A new reservation state to take
+        """
+        return NotImplementedError
+
+    def append_reserves(self, resource: str, reserves: iter):
+        """Take a slots of new reservations at once
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            reserves:
+                A iterator object of new reservations
+        """
+        return NotImplementedError
+
+    def rebuild(self, resource: str, reserves: iter):
+        """Rebuild a resource occupancy from scratch
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            reserves:
+                A iterator object of all resource reservations
+        """
+        return NotImplementedError
+
+
+class MemoryOccupancyAdapter(OccupancyDataAdapter):
+    """A memory slot occupancy adapter
+
+    An adapter store a day slot counters in a memory allocated dictionary.
+    Child classes use it as a mirror of a persistent storage.
+
+    Without a ttl a loaded day is never reloaded, so the mirror assumes
+    a single process owns the storage. If other processes change it
+    (workers of a cluster, a maintenance rebuild), a ttl limits a time
+    the mirror is stale for: a day is reloaded on a first access after
+    the ttl, own changes are written through before it.
+
+    Attributes:
+        storage:
+            A dictionary of a day slot counters by (resource, day) key
+        ttl:
+            A float time in seconds a loaded day is used for,
+            None to keep loaded days
+    """
+    __storage: dict
+
+    def __init__(self, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = monotonic):
+        self.__storage = {}
+        self.__loaded = {}
+        self.ttl = ttl
+        self.clock = clock
+
+    @property
+    def storage(self):
+        return self.__storage
+
+    def get_day_slots(self, resource: str, day: date) -> list:
+        """Get a slot counters of a day
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            day:
+                A date of occupancy
+
+        Returns:
+            A list of slot_count integer counters
+        """
+        return self.get_day_storage(resource, day).copy()
+
+    def get_day_total(self, resource: str, day: date) -> int:
+        """Get a sum of slot counters of a day
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            day:
+                A date of occupancy
+
+        Returns:
+            An integer count of taken slots
+        """
+        return sum(self.get_day_storage(resource, day))
+
+    def get_day_storage(self, resource: str, day: date) -> list:
+        """Get a stored slot counters of a day, load them if need"""
+        key = (resource, day)
+        loaded = self.__loaded.get(key)
+        if loaded is None or (self.ttl is not None
+                              and self.clock() - loaded >= self.ttl):
+            self.__storage[key] = self.load_day(resource, day)
+            self.__loaded[key] = self.clock()
+
+        return self.__storage[key]
+
+    def get_reserve_slots(self, reserve: Reserve) -> iter:
+        """Get a slots are taken by reservation
+
+        Returns:
+            A iterator object of (day, slot) tuples
+        """
+        start, end = reserve.start_minute, reserve.end_minute
+        if start is None or end is None:
+            return
+
+        first = start // self.slot_minutes
+        last = -(-end // self.slot_minutes)
+        for slot in range(first, last):
+            yield (epoch_minutes_to_date(slot * self.slot_minutes),
+                   slot % self.slot_count)
+
+    def add_changes(self, changes: dict, reserve: Union[Reserve, None],
+                    sign: int = 1):
+        """Add a reservation slots to a changes dictionary"""
+        if not reserve or reserve.canceled:
+            return
+
+        for key in self.get_reserve_slots(reserve):
+            changes[key] = changes.get(key, 0) + sign * reserve.count
+
+    def replace_reserve(self, resource: str,
+                        previous: Union[Reserve, None],
+                        reserve: Union[Reserve, None]):
+        """Replace a reservation slots by other ones
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            previous:
+                Optional. A stored reservation state to release
+            reserve:
+                Optional. A new reservation state to take
+        """
+        changes = {}
+        self.add_changes(changes, previous, -1)
+        self.add_changes(changes, reserve)
+        self.apply_changes(resource, changes)
+
+    def append_reserves(self, resource: str, reserves: iter):
+        """Take a slots of new reservations at once
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            reserves:
+                A iterator object of new reservations
+        """
+        changes = {}
+        for reserve in reserves:
+            self.add_changes(changes, reserve)
+        self.apply_changes(resource, changes)
+
+    def rebuild(self, resource: str, reserves: iter):
+        """Rebuild a resource occupancy from scratch
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            reserves:
+                A iterator object of all resource reservations
+        """
+        self.clear(resource)
+
+        changes = {}
+        for reserve in reserves:
+            self.add_changes(changes, reserve)
+        self.apply_changes(resource, changes)
+
+    def apply_changes(self, resource: str, changes: dict):
+        """Apply a slot changes
+
+        Args:
+            resource:
+                A resource (reservation storage) name
+            changes:
+                A dictionary of counter deltas by (day, slot) key
+        """
+        changes = {key: value for key, value in changes.items() if value}
+        for (day, slot), value in changes.items():
+            self.get_day_storage(resource, day)[slot] += value
+
+        self.save_changes(resource, changes)
+
+    def clear(self, resource: str):
+        """Remove all resource slot counters"""
+        for key in [key for key in self.__storage if key[0] == resource]:
+            del self.__storage[key]
+            del self.__loaded[key]
+
+    def load_day(self, resource: str, day: date) -> list:
+        """Load a day slot counters from a persistent storage"""
+        return [0] * self.slot_count
+
+    def save_changes(self, resource: str, changes: dict):
+        """Save a slot changes to a persistent storage"""
+        pass
@@ -0,0 +1,37 @@
+from inspect import signature
+from operator import itemgetter
+from typing import Callable
+
+
+class RowMapper:
+    """Storage row to entity mapper
+
+    Column positions are resolved once by the factory parameter names,
+    so a row mapping costs one itemgetter call and one factory call.
+
+    Attributes:
+        columns:
+            A tuple of selected column names in a row order.
+        factory:
+            A callable creates an entity. Its parameter names
+            have to match column names.
+    """
+
+    def __init__(self, columns: tuple, factory: Callable):
+        self.columns = columns
+        self.factory = factory
+
+        fields = signature(factory).parameters
+        positions = [columns.index(field) for field in fields]
+        self.__getter = itemgetter(*positions)
+
+    def map_row(self, row):
+        """Map a storage row to an entity"""
+        return self.factory(*self.__getter(row))
+
+    def map_rows(self, rows) -> list:
+        """Map a batch of storage rows to a list of entities"""
+        getter = self.__getter
+        factory = self.factory
+
+        return [factory(*getter(row)) for row in rows]
@@ -1,6 +1,8 @@
 from .user import PostgresUserAdapter
 from .wake import PostgressWakeAdapter
 from .supboard import PostgressSupboardAdapter
+from .occupancy import PostgresOccupancyAdapter
 
 if __name__ == "__main__":
     PostgresUserAdapter, PostgressWakeAdapter, PostgressSupboardAdapter
+    PostgresOccupancyAdapter
@@ -0,0 +1,109 @@
+import psycopg2
+from datetime import date
+from typing import Callable, Optional
+from ..data import MemoryOccupancyAdapter
+
+
+class PostgresOccupancyAdapter(MemoryOccupancyAdapter):
+    """Slot occupancy PostgreSQL data adapter class
+
+    The adapter keeps loaded days in a memory mirror and writes
+    every change through to the PostgreSQL table. A table can be shared
+    by processes (cluster workers, a maintenance rebuild), so a loaded
+    day is reloaded after a ttl.
+
+    Attributes:
+        connection:
+            A PostgreSQL connection instance.
+        connection_factory:
+            Optional. A function creates a connection,
+            psycopg2.connect of a database URL by default.
+        ttl:
+            A float time in seconds a loaded day is used for,
+            None to keep loaded days (a single process owns the table).
+    """
+
+    def __init__(self,
+                 connection=None, database_url=None,
+                 table_name="occupancy",
+                 connection_factory: Optional[Callable] = None,
+                 lazy: bool = False,
+                 ttl: Optional[float] = 5.0):
+        super().__init__(ttl)
+        self.__connection = connection
+        self.__database_url = database_url
+        self.__table_name = table_name
+        self.connection_factory = connection_factory
+
+        if not lazy:
+            self.connect()
+            self.create_table()
+
+    @property
+    def connection(self):
+        return self.__connection
+
+    def connect(self):
+        try:
+            with self.__connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            if self.connection_factory:
+                self.__connection = self.connection_factory()
+            else:
+                self.__connection = psycopg2.connect(
+                    self.__database_url)
+
+    def create_table(self):
+        with self.__connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.__table_name}"
+                """ (
+                    resource varchar(40),
+                    day date,
+                    slot integer,
+                    count integer,
+                    PRIMARY KEY (resource, day, slot))""")
+
+        self.__connection.commit()
+
+    def load_day(self, resource: str, day: date) -> list:
+        """Load a day slot counters from the table"""
+        result = [0] * self.slot_count
+
+        with self.__connection.cursor() as cursor:
+            cursor.execute(f"SELECT slot, count FROM {self.__table_name}"
+                           " WHERE resource = %s and day = %s",
+                           (resource, day))
+
+            self.__connection.commit()
+
+            for row in cursor:
+                result[row[0]] = row[1]
+
+        return result
+
+    def save_changes(self, resource: str, changes: dict):
+        """Save a slot changes to the table"""
+        with self.__connection.cursor() as cursor:
+            cursor.executemany(
+                f"  INSERT INTO {self.__table_name}"
+                """     (resource, day, slot, count)
+                    VALUES(%s, %s, %s, %s)
+                    ON CONFLICT (resource, day, slot) DO UPDATE"""
+                f"  SET count = {self.__table_name}.count + EXCLUDED.count",
+                [(resource, day, slot, value)
+                 for (day, slot), value in changes.items()])
+
+            self.__connection.commit()
+
+    def clear(self, resource: str):
+        """Remove all resource slot counters"""
+        super().clear(resource)
+
+        with self.__connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.__table_name} WHERE resource = %s",
+                [resource])
+
+            self.__connection.commit()
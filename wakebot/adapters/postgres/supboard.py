@@ -1,7 +1,10 @@
 import psycopg2
-from datetime import datetime
-from typing import Union
-from ..data import ReserveDataAdapter
+import psycopg2.extras
+from uuid import uuid4
+from datetime import datetime, date
+from typing import Callable, Optional, Union
+from ..mapper import RowMapper
+from ..data import ReserveDataAdapter, OccupancyDataAdapter
 from ...entities import Supboard, User
 
 
@@ -11,21 +14,40 @@ class PostgressSupboardAdapter(ReserveDataAdapter):
     Attributes:
         connection:
             A PostgreSQL connection instance.
+        itersize:
+            An integer count of rows fetched at once by streaming reads.
+        row_mapper:
+            A row to entity mapper with precompiled column positions.
+        occupancy_adapter:
+            Optional. A slot occupancy adapter updated on every change
+        connection_factory:
+            Optional. A function creates a connection,
+            psycopg2.connect of a database URL by default.
     """
     columns = (
         "id", "firstname", "lastname", "middlename", "displayname",
         "telegram_id", "phone_number", "start_time", "end_time",
-        "set_type_id", "set_count", "count")
+        "set_type_id", "set_count", "count",
+        "canceled", "cancel_telegram_id")
 
     def __init__(self,
                  connection=None, database_url=None,
-                 table_name="sup_reserves"):
+                 table_name="sup_reserves",
+                 itersize: int = 2000,
+                 occupancy_adapter: OccupancyDataAdapter = None,
+                 connection_factory: Optional[Callable] = None,
+                 lazy: bool = False):
         self.__connection = connection
         self.__database_url = database_url
         self.__table_name = table_name
+        self.itersize = itersize
+        self.row_mapper = RowMapper(self.columns, self.create_supboard)
+        self.occupancy_adapter = occupancy_adapter
+        self.connection_factory = connection_factory
 
-        self.connect()
-        self.create_table()
+        if not lazy:
+            self.connect()
+            self.create_table()
 
     @property
     def connection(self):
@@ -36,7 +58,11 @@ class PostgressSupboardAdapter(ReserveDataAdapter):
             with self.__connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
         except Exception:
-            self.__connection = psycopg2.connect(self.__database_url)
+            if self.connection_factory:
+                self.__connection = self.connection_factory()
+            else:
+                self.__connection = psycopg2.connect(
+                    self.__database_url)
 
     def create_table(self):
 
@@ -57,58 +83,103 @@ class PostgressSupboardAdapter(ReserveDataAdapter):
                     set_count integer,
                     count integer,
                     canceled boolean DEFAULT false,
-                    cancel_telegram_id integer)""")
+                    cancel_telegram_id integer,
+                    idempotency_key varchar(64))""")
+            cursor.execute(
+                f"ALTER TABLE {self.__table_name}"
+                " ADD COLUMN IF NOT EXISTS idempotency_key varchar(64)")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.__table_name}_start_idx"
+                f" ON {self.__table_name} (start_time, id)")
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS"
+                f" {self.__table_name}_idempotency_key_idx"
+                f" ON {self.__table_name} (idempotency_key)")
 
         self.__connection.commit()
 
-    def get_supboard_from_row(self, row):
-        supboard_id = row[self.columns.index("id")]
-        user = User(row[self.columns.index("firstname")])
-        user.lastname = row[self.columns.index("lastname")]
-        user.middlename = row[self.columns.index("middlename")]
-        user.displayname = row[self.columns.index("displayname")]
-        user.telegram_id = row[self.columns.index("telegram_id")]
-        user.phone_number = row[self.columns.index("phone_number")]
-        start = row[self.columns.index("start_time")]
-        set_type_id = row[self.columns.index("set_type_id")]
-        set_count = row[self.columns.index("set_count")]
-        count = row[self.columns.index("count")]
-
-        return Supboard(id=supboard_id, user=user,
-                        start_date=start.date(), start_time=start.time(),
-                        set_type_id=set_type_id, set_count=set_count,
-                        count=count)
+    @staticmethod
+    def create_supboard(id, firstname, lastname, middlename, displayname,
+                        telegram_id, phone_number, start_time, set_type_id,
+                        set_count, count, canceled,
+                        cancel_telegram_id) -> Supboard:
+        """Create a supboard reservation from a row values"""
+        user = User(firstname, lastname, middlename, displayname,
+                    phone_number, telegram_id)
+
+        return Supboard.from_values(id, user,
+                                    start_time.date(), start_time.time(),
+                                    set_type_id, set_count, count,
+                                    canceled, cancel_telegram_id)
+
+    def get_supboard_from_row(self, row) -> Supboard:
+        return self.row_mapper.map_row(row)
 
     def get_data(self) -> iter:
         """Get a full set of data from storage
 
+        Rows are streamed by a server-side cursor in itersize batches.
+
         Returns:
             A iterator object of given data
         """
-        with self.__connection.cursor() as cursor:
+        cursor_name = f"{self.__table_name}_{uuid4().hex}"
+        with self.__connection.cursor(cursor_name, withhold=True) as cursor:
+            cursor.itersize = self.itersize
             columns_str = ", ".join(self.columns)
             cursor.execute(f"SELECT {columns_str} FROM {self.__table_name}")
 
-            self.__connection.commit()
+            rows = cursor.fetchmany(self.itersize)
+            while rows:
+                yield from self.row_mapper.map_rows(rows)
+                rows = cursor.fetchmany(self.itersize)
 
-            for row in cursor:
-                yield self.get_supboard_from_row(row)
+        self.__connection.commit()
+
+    def get_active_reserves(self,
+                            page_cursor: Optional[tuple] = None,
+                            limit: Optional[int] = None,
+                            backward: bool = False) -> iter:
+        """Get an active Supboard reservations from storage
 
-    def get_active_reserves(self) -> iter:
-        """Get an active supboard reservations from storage
+        Args:
+            page_cursor:
+                Optional. A (start, id) tuple of a page boundary reservation.
+                Reservations after the boundary are returned
+                (or before it if backward).
+            limit:
+                Optional. A maximum count of reservations (a page size).
+            backward:
+                Optional. A boolean indicates to get a page before cursor.
 
         Returns:
-            A iterator object of given data
+            A iterator object of given data ordered by start and id
         """
+        columns_str = ", ".join(self.columns)
+        query = (f"SELECT {columns_str} FROM {self.__table_name}"
+                 " WHERE NOT canceled AND start_time >= %s")
+        params = [datetime.today()]
+
+        if page_cursor:
+            sign = "<" if backward else ">"
+            query += (f" AND (start_time {sign} %s"
+                      f"      OR (start_time = %s AND id {sign} %s))")
+            params += [page_cursor[0], page_cursor[0], page_cursor[1]]
+
+        order = " DESC" if backward else ""
+        query += f" ORDER BY start_time{order}, id{order}"
+
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+
         with self.__connection.cursor() as cursor:
-            columns_str = ", ".join(self.columns)
-            cursor.execute((f"SELECT {columns_str} FROM {self.__table_name}"
-                            " WHERE NOT canceled and start_time >= %s"
-                            " ORDER BY start_time"), [datetime.today()])
+            cursor.execute(query, params)
 
             self.__connection.commit()
 
-            for row in cursor:
+            rows = reversed(list(cursor)) if backward else cursor
+            for row in rows:
                 yield self.get_supboard_from_row(row)
 
     def get_data_by_keys(self, id: int) -> Union[Supboard, None]:
@@ -128,13 +199,78 @@ class PostgressSupboardAdapter(ReserveDataAdapter):
 
             self.__connection.commit()
 
-            rows = list(cursor)
-            if len(rows) == 0:
+            row = cursor.fetchone()
+            if not row:
                 return None
+            return self.get_supboard_from_row(row)
+
+    def get_data_by_idempotency_key(self, key: str) -> Union[Supboard, None]:
+        """Get a reservation stored with an idempotency key
 
-            row = rows[0]
+        Args:
+            key:
+                An idempotency key of a reservation insert
+
+        Returns:
+            A reservation or None if there is no one
+        """
+        with self.__connection.cursor() as cursor:
+            columns_str = ", ".join(self.columns)
+            cursor.execute((f"SELECT {columns_str} FROM {self.__table_name}"
+                            " WHERE idempotency_key = %s"), [key])
+
+            self.__connection.commit()
+
+            row = cursor.fetchone()
+            if not row:
+                return None
             return self.get_supboard_from_row(row)
 
+    def get_ids_by_idempotency_keys(self, keys: list) -> dict:
+        """Get a stored reservation identifiers by idempotency keys
+
+        Returns:
+            A dictionary of integer identifiers by stored keys
+        """
+        with self.__connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT idempotency_key, id FROM {self.__table_name}"
+                " WHERE idempotency_key = ANY(%s)", [list(keys)])
+
+            self.__connection.commit()
+
+            return dict(cursor)
+
+    def get_reserves_between(self, start: datetime, end: datetime,
+                             include_canceled: bool = False) -> iter:
+        """Get a Supboard reservations are started in a time range
+
+        Args:
+            start:
+                A range start datetime (inclusive).
+            end:
+                A range end datetime (exclusive).
+            include_canceled:
+                Optional. A boolean indicates to include canceled reservations.
+
+        Returns:
+            A iterator object of given data ordered by start and id
+        """
+        columns_str = ", ".join(self.columns)
+        query = (f"SELECT {columns_str} FROM {self.__table_name}"
+                 " WHERE start_time >= %s AND start_time < %s")
+        if not include_canceled:
+            query += " AND NOT canceled"
+        query += " ORDER BY start_time, id"
+
+        with self.__connection.cursor() as cursor:
+            cursor.execute(query, (start, end))
+
+            self.__connection.commit()
+
+            for row in cursor:
+                yield self.get_supboard_from_row(row)
+
     def get_concurrent_reserves(self, reserve: Supboard) -> iter:
         """Get an concurrent reservations from storage
 
@@ -180,45 +316,143 @@ class PostgressSupboardAdapter(ReserveDataAdapter):
 
             self.__connection.commit()
 
-            if cursor:
-                row = list(cursor)
-            else:
-                return 0
+            row = cursor.fetchone()
+            return row[0] if row and row[0] else 0
+
+    def get_concurrent_counts(self, reserves: list) -> list:
+        """Get a concurrent reservations counts of a batch by one query
+
+        Args:
+            reserves:
+                A list of reservations (e.g. recurring occurrences)
 
-            return row[0][0] if row[0][0] else 0
+        Returns:
+            A list of integer counts in the reservations order
+        """
+        values_str = ", ".join(["(%s, %s, %s)"] * len(reserves))
+        params = []
+        for position, reserve in enumerate(reserves):
+            params += [position, reserve.start, reserve.end]
 
-    def append_data(self, reserve: Supboard) -> Supboard:
+        with self.__connection.cursor() as cursor:
+            cursor.execute(
+                "   SELECT o.position, SUM(r.count)"
+                f"  FROM (VALUES {values_str})"
+                "   AS o (position, start_time, end_time)"
+                f"  LEFT JOIN {self.__table_name} r"
+                """     ON NOT r.canceled
+                        and r.start_time < o.end_time
+                        and o.start_time < r.end_time
+                    GROUP BY o.position""", params)
+
+            self.__connection.commit()
+
+            result = [0] * len(reserves)
+            for position, count in cursor:
+                result[position] = count or 0
+
+            return result
+
+    def append_data(self, reserve: Supboard,
+                    idempotency_key: Optional[str] = None) -> Supboard:
         """Append new data to storage
 
         Args:
             reserve:
                 An instance of entity Supboard class.
+            idempotency_key:
+                Optional. A unique key of the insert. If a reservation
+                with the key is stored already, it is returned instead
+                of inserting a new one.
         """
         with self.__connection.cursor() as cursor:
             columns_str = ", ".join(self.columns[1:])
             cursor.execute(
-                f"  INSERT INTO {self.__table_name} ({columns_str})"
-                "    VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
-                "    RETURNING id", (
-                    reserve.user.firstname,
-                    reserve.user.lastname,
-                    reserve.user.middlename,
-                    reserve.user.displayname,
-                    reserve.user.telegram_id,
-                    reserve.user.phone_number,
-                    reserve.start,
-                    reserve.end,
-                    reserve.set_type.set_id,
-                    reserve.set_count,
-                    reserve.count
-                ))
+                f"  INSERT INTO {self.__table_name}"
+                f"    ({columns_str}, idempotency_key)"
+                "    VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,"
+                "           %s, %s, %s)"
+                "    ON CONFLICT (idempotency_key) DO NOTHING"
+                "    RETURNING id",
+                self.get_insert_values(reserve, idempotency_key))
+
+            row = cursor.fetchone()
+            self.__connection.commit()
+
+        if not row:
+            return self.get_data_by_idempotency_key(idempotency_key)
+
+        result = reserve.__deepcopy__()
+        result.id = row[0]
+
+        if self.occupancy_adapter:
+            self.occupancy_adapter.replace_reserve(
+                self.__table_name, None, result)
+
+        return result
+
+    def insert_many(self, rows: list) -> dict:
+        """Insert reservations in one transaction
 
-            result = reserve.__deepcopy__()
-            result.id = cursor.fetchone()[0]
+        Args:
+            rows:
+                A list of (idempotency key, reservation) tuples
+
+        Returns:
+            A dictionary of integer identifiers by idempotency keys
+        """
+        with self.__connection.cursor() as cursor:
+            columns_str = ", ".join(self.columns[1:])
+            inserted = dict(psycopg2.extras.execute_values(
+                cursor,
+                f"  INSERT INTO {self.__table_name}"
+                f"    ({columns_str}, idempotency_key)"
+                "    VALUES %s"
+                "    ON CONFLICT (idempotency_key) DO NOTHING"
+                "    RETURNING idempotency_key, id",
+                [self.get_insert_values(reserve, key)
+                 for key, reserve in rows],
+                page_size=len(rows), fetch=True))
 
             self.__connection.commit()
 
-            return result
+        ids = dict(inserted)
+        missing = [key for key, _ in rows if key not in inserted]
+        if missing:
+            # Stored by a concurrent insert of the same batch
+            ids.update(self.get_ids_by_idempotency_keys(missing))
+
+        if self.occupancy_adapter:
+            results = []
+            for key, reserve in rows:
+                if key in inserted:
+                    result = reserve.__deepcopy__()
+                    result.id = inserted[key]
+                    results.append(result)
+            self.occupancy_adapter.append_reserves(self.__table_name,
+                                                   results)
+
+        return ids
+
+    @staticmethod
+    def get_insert_values(reserve: Supboard,
+                          idempotency_key: Optional[str] = None) -> tuple:
+        """Get an insert query parameters of a reservation"""
+        return (
+            reserve.user.firstname,
+            reserve.user.lastname,
+            reserve.user.middlename,
+            reserve.user.displayname,
+            reserve.user.telegram_id,
+            reserve.user.phone_number,
+            reserve.start,
+            reserve.end,
+            reserve.set_type.set_id,
+            reserve.set_count,
+            reserve.count,
+            reserve.canceled,
+            reserve.cancel_telegram_id,
+            idempotency_key)
 
     def update_data(self, reserve: Supboard):
         """Append new data to storage
@@ -227,6 +461,10 @@ class PostgressSupboardAdapter(ReserveDataAdapter):
             reserve:
                 An instance of entity Supboard class.
         """
+        previous = None
+        if self.occupancy_adapter:
+            previous = self.get_data_by_keys(reserve.id)
+
         with self.__connection.cursor() as cursor:
             cursor.execute(
                 f"  UPDATE {self.__table_name} SET"
@@ -253,6 +491,10 @@ class PostgressSupboardAdapter(ReserveDataAdapter):
 
             self.__connection.commit()
 
+        if self.occupancy_adapter:
+            self.occupancy_adapter.replace_reserve(
+                self.__table_name, previous, reserve)
+
     def remove_data_by_keys(self, id: int):
         """Remove data from storage by a keys
 
@@ -263,7 +505,35 @@ class PostgressSupboardAdapter(ReserveDataAdapter):
         Returns:
             A iterator object of given data
         """
+        previous = None
+        if self.occupancy_adapter:
+            previous = self.get_data_by_keys(id)
+
         with self.__connection.cursor() as cursor:
             cursor.execute(
                 f"DELETE FROM {self.__table_name} WHERE id = %s", [id])
             self.__connection.commit()
+
+        if self.occupancy_adapter:
+            self.occupancy_adapter.replace_reserve(
+                self.__table_name, previous, None)
+
+    def rebuild_occupancy(self):
+        """Rebuild slot occupancy of the adapter from scratch"""
+        if self.occupancy_adapter:
+            self.occupancy_adapter.rebuild(self.__table_name, self.get_data())
+
+    def get_day_occupancy(self, day: date) -> Union[list, None]:
+        """Get a day slot occupancy of the adapter
+
+        Args:
+            day:
+                A date of occupancy
+
+        Returns:
+            A list of slot counters or None if occupancy isn't tracked
+        """
+        if not self.occupancy_adapter:
+            return None
+
+        return self.occupancy_adapter.get_day_slots(self.__table_name, day)
@@ -1,5 +1,7 @@
 import psycopg2
-from typing import Union
+from uuid import uuid4
+from typing import Callable, Optional, Union
+from ..mapper import RowMapper
 from ..data import UserDataAdapter
 from ...entities.user import User
 
@@ -10,6 +12,13 @@ class PostgresUserAdapter(UserDataAdapter):
     Attributes:
         connection:
             A SQLite connection instance.
+        itersize:
+            An integer count of rows fetched at once by streaming reads.
+        row_mapper:
+            A row to entity mapper with precompiled column positions.
+        connection_factory:
+            Optional. A function creates a connection,
+            psycopg2.connect of a database URL by default.
     """
     columns = (
         "id", "firstname", "lastname", "middlename", "displayname",
@@ -17,13 +26,20 @@ class PostgresUserAdapter(UserDataAdapter):
 
     def __init__(self,
                  connection=None, database_url=None,
-                 table_name="users"):
+                 table_name="users",
+                 itersize: int = 2000,
+                 connection_factory: Optional[Callable] = None,
+                 lazy: bool = False):
         self.__connection = connection
         self.__database_url = database_url
         self.__table_name = table_name
+        self.itersize = itersize
+        self.row_mapper = RowMapper(self.columns, self.create_user)
+        self.connection_factory = connection_factory
 
-        self.connect()
-        self.create_table()
+        if not lazy:
+            self.connect()
+            self.create_table()
 
     @property
     def connection(self):
@@ -34,7 +50,11 @@ class PostgresUserAdapter(UserDataAdapter):
             with self.__connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
         except Exception:
-            self.__connection = psycopg2.connect(self.__database_url)
+            if self.connection_factory:
+                self.__connection = self.connection_factory()
+            else:
+                self.__connection = psycopg2.connect(
+                    self.__database_url)
 
     def create_table(self):
         with self.__connection.cursor() as cursor:
@@ -51,35 +71,36 @@ class PostgresUserAdapter(UserDataAdapter):
 
             self.connection.commit()
 
-    def get_user_from_row(self, row):
-        user_id = row[self.columns.index("id")]
-        firstname = row[self.columns.index("firstname")]
-        lastname = row[self.columns.index("lastname")]
-        middlename = row[self.columns.index("middlename")]
-        displayname = row[self.columns.index("displayname")]
-        telegram_id = row[self.columns.index("telegram_id")]
-        phone_number = row[self.columns.index("phone_number")]
-        is_admin = row[self.columns.index("is_admin")]
-
-        return User(user_id=user_id, firstname=firstname, lastname=lastname,
-                    middlename=middlename, displayname=displayname,
-                    telegram_id=telegram_id, phone_number=phone_number,
-                    is_admin=is_admin)
+    @staticmethod
+    def create_user(id, firstname, lastname, middlename, displayname,
+                    telegram_id, phone_number, is_admin) -> User:
+        """Create a user from a row values"""
+        return User(firstname, lastname, middlename, displayname,
+                    phone_number, telegram_id, id, bool(is_admin))
+
+    def get_user_from_row(self, row) -> User:
+        return self.row_mapper.map_row(row)
 
     def get_data(self) -> iter:
         """Get a full set of data from storage
 
+        Rows are streamed by a server-side cursor in itersize batches.
+
         Returns:
             A iterator object of given data
         """
-        with self.__connection.cursor() as cursor:
+        cursor_name = f"{self.__table_name}_{uuid4().hex}"
+        with self.__connection.cursor(cursor_name, withhold=True) as cursor:
+            cursor.itersize = self.itersize
             columns_str = ", ".join(self.columns)
             cursor.execute(f"SELECT {columns_str} FROM {self.__table_name}")
 
-            self.__connection.commit()
+            rows = cursor.fetchmany(self.itersize)
+            while rows:
+                yield from self.row_mapper.map_rows(rows)
+                rows = cursor.fetchmany(self.itersize)
 
-            for row in cursor:
-                yield self.get_user_from_row(row)
+        self.__connection.commit()
 
     def get_data_by_keys(self, id: int) -> Union[User, None]:
         """Get a set of data from storage by a keys
@@ -98,11 +119,9 @@ class PostgresUserAdapter(UserDataAdapter):
 
             self.__connection.commit()
 
-            rows = list(cursor)
-            if len(rows) == 0:
+            row = cursor.fetchone()
+            if not row:
                 return None
-
-            row = rows[0]
             cursor.close()
             return self.get_user_from_row(row)
 
@@ -123,11 +142,9 @@ class PostgresUserAdapter(UserDataAdapter):
 
             self.__connection.commit()
 
-            rows = list(cursor)
-            if len(rows) == 0:
+            row = cursor.fetchone()
+            if not row:
                 return None
-
-            row = rows[0]
             cursor.close()
             return self.get_user_from_row(row)
 
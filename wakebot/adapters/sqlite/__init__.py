@@ -1,6 +1,8 @@
 from .user import SqliteUserAdapter
 from .wake import SqliteWakeAdapter
 from .supboard import SqliteSupboardAdapter
+from .occupancy import SqliteOccupancyAdapter
 
 if __name__ == "__main__":
     SqliteUserAdapter, SqliteWakeAdapter, SqliteSupboardAdapter
+    SqliteOccupancyAdapter
@@ -0,0 +1,79 @@
+from sqlite3 import Connection
+from datetime import date
+from typing import Optional
+from ..data import MemoryOccupancyAdapter
+
+
+class SqliteOccupancyAdapter(MemoryOccupancyAdapter):
+    """Slot occupancy SQLite data adapter class
+
+    The adapter keeps loaded days in a memory mirror and writes
+    every change through to the SQLite table.
+
+    Attributes:
+        connection:
+            A SQLite connection instance.
+        ttl:
+            A float time in seconds a loaded day is used for,
+            None to keep loaded days (a single process owns the table).
+    """
+
+    def __init__(self, connection: Connection, table_name="occupancy",
+                 ttl: Optional[float] = None):
+        super().__init__(ttl)
+        self.__connection = connection
+        self.__table_name = table_name
+        self.create_table()
+
+    @property
+    def connection(self):
+        return self.__connection
+
+    def create_table(self):
+        cursor = self.__connection.cursor()
+
+        cursor.execute(
+            f"  CREATE TABLE IF NOT EXISTS {self.__table_name} ("
+            """     resource text,
+                    day text,
+                    slot integer,
+                    count integer,
+                    PRIMARY KEY (resource, day, slot))
+            """)
+
+        self.connection.commit()
+
+    def load_day(self, resource: str, day: date) -> list:
+        """Load a day slot counters from the table"""
+        result = [0] * self.slot_count
+
+        cursor = self.__connection.cursor()
+        cursor = cursor.execute(
+            f"  SELECT slot, count FROM {self.__table_name}"
+            "   WHERE resource = ? and day = ?",
+            (resource, day.isoformat()))
+        for row in cursor:
+            result[row[0]] = row[1]
+
+        return result
+
+    def save_changes(self, resource: str, changes: dict):
+        """Save a slot changes to the table"""
+        cursor = self.__connection.cursor()
+        cursor.executemany(
+            f"  INSERT INTO {self.__table_name} (resource, day, slot, count)"
+            """ VALUES(?, ?, ?, ?)
+                ON CONFLICT (resource, day, slot) DO UPDATE"""
+            f"  SET count = {self.__table_name}.count + excluded.count",
+            [(resource, day.isoformat(), slot, value)
+             for (day, slot), value in changes.items()])
+        self.__connection.commit()
+
+    def clear(self, resource: str):
+        """Remove all resource slot counters"""
+        super().clear(resource)
+
+        cursor = self.__connection.cursor()
+        cursor.execute(
+            f"DELETE FROM {self.__table_name} WHERE resource = ?", [resource])
+        self.__connection.commit()
@@ -1,5 +1,6 @@
 from sqlite3 import Connection
 from typing import Union
+from ..mapper import RowMapper
 from ..data import UserDataAdapter
 from ...entities.user import User
 
@@ -10,17 +11,30 @@ class SqliteUserAdapter(UserDataAdapter):
     Attributes:
         connection:
             A SQLite connection instance.
+        row_mapper:
+            A row to entity mapper with precompiled column positions.
     """
+    columns = (
+        "id", "firstname", "lastname", "middlename", "displayname",
+        "telegram_id", "phone_number", "is_admin")
 
     def __init__(self, connection: Connection, table_name="users"):
         self.__connection = connection
         self.__table_name = table_name
+        self.row_mapper = RowMapper(self.columns, self.create_user)
         self.create_table()
 
     @property
     def connection(self):
         return self.__connection
 
+    @staticmethod
+    def create_user(id, firstname, lastname, middlename, displayname,
+                    telegram_id, phone_number, is_admin) -> User:
+        """Create a user from a row values"""
+        return User(firstname, lastname, middlename, displayname,
+                    phone_number, telegram_id, id, bool(is_admin))
+
     def create_table(self):
         cursor = self.__connection.cursor()
 
@@ -44,22 +58,11 @@ class SqliteUserAdapter(UserDataAdapter):
         Returns:
             A iterator object of given data
         """
+        columns_str = ", ".join(self.columns)
         cursor = self.__connection.cursor()
         cursor = cursor.execute(
-            """ SELECT id, firstname, lastname, middlename, displayname,
-                    telegram_id, phone_number, is_admin"""
-            f"  FROM {self.__table_name}")
-        for row in cursor:
-            yield User(
-                user_id=row[0],
-                firstname=row[1],
-                lastname=row[2],
-                middlename=row[3],
-                displayname=row[4],
-                telegram_id=row[5],
-                phone_number=row[6],
-                is_admin=bool(row[7])
-            )
+            f"SELECT {columns_str} FROM {self.__table_name}")
+        yield from map(self.row_mapper.map_row, cursor)
         cursor.close()
 
     def get_data_by_keys(self, id: int) -> Union[User, None]:
@@ -72,27 +75,17 @@ class SqliteUserAdapter(UserDataAdapter):
         Returns:
             A object of given data
         """
+        columns_str = ", ".join(self.columns)
         cursor = self.__connection.cursor()
-        rows = list(cursor.execute(
-            """ SELECT id, firstname, lastname, middlename, displayname,
-                    telegram_id, phone_number, is_admin"""
-            f"  FROM {self.__table_name} WHERE id = ?", [id]))
+        row = cursor.execute(
+            f"SELECT {columns_str} FROM {self.__table_name} WHERE id = ?",
+            [id]).fetchone()
 
-        if len(rows) == 0:
+        if not row:
             return None
 
-        row = rows[0]
         cursor.close()
-        return User(
-            user_id=row[0],
-            firstname=row[1],
-            lastname=row[2],
-            middlename=row[3],
-            displayname=row[4],
-            telegram_id=row[5],
-            phone_number=row[6],
-            is_admin=bool(row[7])
-        )
+        return self.row_mapper.map_row(row)
 
     def get_user_by_telegram_id(self, telegram_id: int) -> Union[User, None]:
         """Get a user from storage by telegram_id
@@ -104,28 +97,18 @@ class SqliteUserAdapter(UserDataAdapter):
         Returns:
             A iterator object of given data
         """
+        columns_str = ", ".join(self.columns)
         cursor = self.__connection.cursor()
-        rows = list(cursor.execute(
-            """ SELECT id, firstname, lastname, middlename, displayname,
-                    telegram_id, phone_number, is_admin"""
-            f"  FROM {self.__table_name} WHERE telegram_id = ?",
-            [telegram_id]))
+        row = cursor.execute(
+            f"SELECT {columns_str} FROM {self.__table_name}"
+            " WHERE telegram_id = ?",
+            [telegram_id]).fetchone()
 
-        if len(rows) == 0:
+        if not row:
             return None
 
-        row = rows[0]
         cursor.close()
-        return User(
-            user_id=row[0],
-            firstname=row[1],
-            lastname=row[2],
-            middlename=row[3],
-            displayname=row[4],
-            telegram_id=row[5],
-            phone_number=row[6],
-            is_admin=bool(row[7])
-        )
+        return self.row_mapper.map_row(row)
 
     def append_data(self, user: User) -> User:
         """Append new data to storage
@@ -201,21 +184,10 @@ class SqliteUserAdapter(UserDataAdapter):
         Returns:
             A iterator object of given data
         """
+        columns_str = ", ".join(self.columns)
         cursor = self.__connection.cursor()
         cursor = cursor.execute(
-            """ SELECT id, firstname, lastname, middlename, displayname,
-                    telegram_id, phone_number, is_admin"""
-            f"  FROM {self.__table_name} WHERE is_admin")
-
-        for row in cursor:
-            yield User(
-                user_id=row[0],
-                firstname=row[1],
-                lastname=row[2],
-                middlename=row[3],
-                displayname=row[4],
-                telegram_id=row[5],
-                phone_number=row[6],
-                is_admin=bool(row[7])
-            )
+            f"SELECT {columns_str} FROM {self.__table_name} WHERE is_admin")
+
+        yield from map(self.row_mapper.map_row, cursor)
         cursor.close()
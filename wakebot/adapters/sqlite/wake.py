@@ -1,7 +1,8 @@
 from sqlite3 import Connection
-from datetime import datetime
-from typing import Union
-from ..data import ReserveDataAdapter
+from datetime import datetime, date
+from typing import Optional, Union
+from ..mapper import RowMapper
+from ..data import ReserveDataAdapter, OccupancyDataAdapter
 from ...entities.wake import Wake
 from ...entities.user import User
 
@@ -12,68 +13,98 @@ class SqliteWakeAdapter(ReserveDataAdapter):
     Attributes:
         connection:
             A SQLite connection instance.
+        occupancy_adapter:
+            Optional. A slot occupancy adapter updated on every change
+        row_mapper:
+            A row to entity mapper with precompiled column positions.
     """
+    columns = (
+        "id", "firstname", "lastname", "middlename", "displayname",
+        "telegram_id", "phone_number", "start", "set_type_id", "set_count",
+        "board", "hydro", "canceled", "cancel_telegram_id")
 
-    def __init__(self, connection: Connection, table_name="wake_reserves"):
+    def __init__(self, connection: Connection, table_name="wake_reserves",
+                 occupancy_adapter: OccupancyDataAdapter = None):
         self.__connection = connection
         self.__table_name = table_name
+        self.occupancy_adapter = occupancy_adapter
+        self.row_mapper = RowMapper(self.columns, self.create_wake)
         self.create_table()
 
     @property
     def connection(self):
         return self.__connection
 
+    @staticmethod
+    def create_wake(id, firstname, lastname, middlename, displayname,
+                    telegram_id, phone_number, start, set_type_id,
+                    set_count, board, hydro, canceled,
+                    cancel_telegram_id) -> Wake:
+        """Create a wakeboard reservation from a row values"""
+        user = User(firstname, lastname, middlename, displayname,
+                    phone_number, telegram_id)
+        start = datetime.fromtimestamp(start)
+
+        return Wake.from_values(id, user, start.date(), start.time(),
+                                set_type_id, set_count, board, hydro,
+                                canceled, cancel_telegram_id)
+
     def get_data(self) -> iter:
         """Get a full set of data from storage
 
         Returns:
             A iterator object of given data
         """
+        columns_str = ", ".join(self.columns)
         cursor = self.__connection.cursor()
         cursor = cursor.execute(
-            """ SELECT id, firstname, lastname, middlename, displayname,
-                    telegram_id, start, set_type_id, set_count, board, hydro"""
-            f"  FROM {self.__table_name}")
-        for row in cursor:
-            user = User(row[1])
-            user.lastname = row[2]
-            user.middlename = row[3]
-            user.displayname = row[4]
-            user.telegram_id = row[5]
-            start = datetime.fromtimestamp(row[6])
-
-            yield Wake(
-                id=row[0], user=user,
-                start_date=start.date(), start_time=start.time(),
-                set_type_id=row[7], set_count=row[8],
-                board=row[9], hydro=row[10])
-
-    def get_active_reserves(self) -> iter:
+            f"SELECT {columns_str} FROM {self.__table_name}")
+
+        yield from map(self.row_mapper.map_row, cursor)
+
+    def get_active_reserves(self,
+                            page_cursor: Optional[tuple] = None,
+                            limit: Optional[int] = None,
+                            backward: bool = False) -> iter:
         """Get an active wakeboard reservations from storage
 
+        Args:
+            page_cursor:
+                Optional. A (start, id) tuple of a page boundary reservation.
+                Reservations after the boundary are returned
+                (or before it if backward).
+            limit:
+                Optional. A maximum count of reservations (a page size).
+            backward:
+                Optional. A boolean indicates to get a page before cursor.
+
         Returns:
-            A iterator object of given data
+            A iterator object of given data ordered by start and id
         """
+        columns_str = ", ".join(self.columns)
+        query = (f"SELECT {columns_str} FROM {self.__table_name}"
+                 " WHERE NOT canceled and start >= ?")
+        params = [datetime.today().timestamp()]
+
+        if page_cursor:
+            sign = "<" if backward else ">"
+            query += f" and (start {sign} ? or (start = ? and id {sign} ?))"
+            start_ts = page_cursor[0].timestamp()
+            params += [start_ts, start_ts, page_cursor[1]]
+
+        order = " DESC" if backward else ""
+        query += f" ORDER BY start{order}, id{order}"
+
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
         cursor = self.__connection.cursor()
-        cursor = cursor.execute(
-            """ SELECT id, firstname, lastname, middlename, displayname,
-                    telegram_id, start, set_type_id, set_count, board, hydro"""
-            f"  FROM {self.__table_name}"
-            """ WHERE NOT canceled and start >= ?
-                ORDER BY start""", [datetime.today().timestamp()])
-        for row in cursor:
-            user = User(row[1])
-            user.lastname = row[2]
-            user.middlename = row[3]
-            user.displayname = row[4]
-            user.telegram_id = row[5]
-            start = datetime.fromtimestamp(row[6])
-
-            yield Wake(
-                id=row[0], user=user,
-                start_date=start.date(), start_time=start.time(),
-                set_type_id=row[7], set_count=row[8],
-                board=row[9], hydro=row[10])
+        rows = cursor.execute(query, params)
+        if backward:
+            yield from reversed(self.row_mapper.map_rows(rows))
+        else:
+            yield from map(self.row_mapper.map_row, rows)
 
     def get_data_by_keys(self, id: int) -> Union[Wake, None]:
         """Get a set of data from storage by a keys
@@ -85,31 +116,78 @@ class SqliteWakeAdapter(ReserveDataAdapter):
         Returns:
             A iterator object of given data
         """
+        columns_str = ", ".join(self.columns)
         cursor = self.__connection.cursor()
-        rows = list(cursor.execute(
-            """SELECT id, firstname, lastname, middlename, displayname,
-                    telegram_id, phone_number, start, set_type_id, set_count,
-                    board, hydro, canceled, cancel_telegram_id"""
-            f" FROM {self.__table_name} WHERE id = ?", [id]))
+        row = cursor.execute(
+            f"SELECT {columns_str} FROM {self.__table_name} WHERE id = ?",
+            [id]).fetchone()
 
-        if len(rows) == 0:
+        if not row:
             return None
 
-        row = rows[0]
-        user = User(row[1])
-        user.lastname = row[2]
-        user.middlename = row[3]
-        user.displayname = row[4]
-        user.telegram_id = row[5]
-        user.phone_number = row[6]
-        start = datetime.fromtimestamp(row[7])
-
-        return Wake(
-            id=row[0], user=user,
-            start_date=start.date(), start_time=start.time(),
-            set_type_id=row[8], set_count=row[9],
-            board=row[10], hydro=row[11],
-            canceled=row[12], cancel_telegram_id=row[13])
+        return self.row_mapper.map_row(row)
+
+    def get_data_by_idempotency_key(self, key: str) -> Union[Wake, None]:
+        """Get a reservation stored with an idempotency key
+
+        Args:
+            key:
+                An idempotency key of a reservation insert
+
+        Returns:
+            A reservation or None if there is no one
+        """
+        columns_str = ", ".join(self.columns)
+        cursor = self.__connection.cursor()
+        row = cursor.execute(
+            f"SELECT {columns_str} FROM {self.__table_name}"
+            " WHERE idempotency_key = ?", [key]).fetchone()
+
+        if not row:
+            return None
+
+        return self.row_mapper.map_row(row)
+
+    def get_ids_by_idempotency_keys(self, keys: list) -> dict:
+        """Get a stored reservation identifiers by idempotency keys
+
+        Returns:
+            A dictionary of integer identifiers by stored keys
+        """
+        keys_str = ", ".join(["?"] * len(keys))
+        cursor = self.__connection.cursor()
+        cursor = cursor.execute(
+            f"SELECT idempotency_key, id FROM {self.__table_name}"
+            f" WHERE idempotency_key IN ({keys_str})", keys)
+
+        return dict(cursor)
+
+    def get_reserves_between(self, start: datetime, end: datetime,
+                             include_canceled: bool = False) -> iter:
+        """Get a wakeboard reservations are started in a time range
+
+        Args:
+            start:
+                A range start datetime (inclusive).
+            end:
+                A range end datetime (exclusive).
+            include_canceled:
+                Optional. A boolean indicates to include canceled reservations.
+
+        Returns:
+            A iterator object of given data ordered by start and id
+        """
+        columns_str = ", ".join(self.columns)
+        query = (f"SELECT {columns_str} FROM {self.__table_name}"
+                 " WHERE start >= ? and start < ?")
+        if not include_canceled:
+            query += " and NOT canceled"
+        query += " ORDER BY start, id"
+
+        cursor = self.__connection.cursor()
+        cursor = cursor.execute(query, (start.timestamp(), end.timestamp()))
+
+        yield from map(self.row_mapper.map_row, cursor)
 
     def get_concurrent_reserves(self, reserve: Wake) -> iter:
         """Get an concurrent reservations from storage
@@ -118,37 +196,22 @@ class SqliteWakeAdapter(ReserveDataAdapter):
             A iterator object of given data
         """
 
+        if not reserve.start:
+            return
+
         start_ts = reserve.start.timestamp()
-        end_ts = reserve.end.timestamp()
+        end_ts = start_ts + reserve.minutes * 60
+        columns_str = ", ".join(self.columns)
         cursor = self.__connection.cursor()
         cursor = cursor.execute(
-            """ SELECT id, firstname, lastname, middlename, displayname,
-                    telegram_id, phone_number, start, end,
-                    set_type_id, set_count, board, hydro, count"""
-            f"  FROM {self.__table_name}"
+            f"SELECT {columns_str} FROM {self.__table_name}"
             """ WHERE NOT canceled
                     and ((? = start) or (? < start and ? > start)
                     or (? > start and ? < end))
                 ORDER BY start""",
             (start_ts, start_ts, end_ts, start_ts, start_ts))
 
-        for row in cursor:
-            user = User(row[1])
-            user.lastname = row[2]
-            user.middlename = row[3]
-            user.displayname = row[4]
-            user.telegram_id = row[5]
-            user.phone_number = row[6]
-            start = datetime.fromtimestamp(row[7]) if row[7] else None
-            start_date = start.date() if start else None
-            start_time = start.time() if start else None
-            _ = datetime.fromtimestamp(row[8])
-
-            yield Wake(
-                id=row[0], user=user,
-                start_date=start_date, start_time=start_time,
-                set_type_id=row[9], set_count=row[10],
-                board=row[11], hydro=row[12])
+        yield from map(self.row_mapper.map_row, cursor)
 
     def get_concurrent_count(self, reserve: Wake) -> int:
         """Get an concurrent reservations count from storage
@@ -157,8 +220,11 @@ class SqliteWakeAdapter(ReserveDataAdapter):
             An integer count of concurrent reservations
         """
 
+        if not reserve.start:
+            return 0
+
         start_ts = reserve.start.timestamp()
-        end_ts = reserve.end.timestamp()
+        end_ts = start_ts + reserve.minutes * 60
         cursor = self.__connection.cursor()
         cursor = cursor.execute(
             "   SELECT SUM(count) AS concurrent_count"
@@ -169,45 +235,128 @@ class SqliteWakeAdapter(ReserveDataAdapter):
                 ORDER BY start""",
             (start_ts, start_ts, end_ts, start_ts, start_ts))
 
-        row = list(cursor)
-        return row[0][0] if row[0][0] else 0
+        row = cursor.fetchone()
+        return row[0] if row[0] else 0
+
+    def get_concurrent_counts(self, reserves: list) -> list:
+        """Get a concurrent reservations counts of a batch by one query
+
+        Args:
+            reserves:
+                A list of reservations (e.g. recurring occurrences)
+
+        Returns:
+            A list of integer counts in the reservations order
+        """
+        values_str = ", ".join(["(?, ?, ?)"] * len(reserves))
+        params = []
+        for position, reserve in enumerate(reserves):
+            params += [position, reserve.start.timestamp(),
+                       reserve.end.timestamp()]
+
+        cursor = self.__connection.cursor()
+        cursor = cursor.execute(
+            "   WITH occurrences (position, start, end)"
+            f"  AS (VALUES {values_str})"
+            "   SELECT o.position, SUM(r.count)"
+            f"  FROM occurrences o LEFT JOIN {self.__table_name} r"
+            """     ON NOT r.canceled and r.start < o.end and o.start < r.end
+                GROUP BY o.position""", params)
+
+        result = [0] * len(reserves)
+        for position, count in cursor:
+            result[position] = count or 0
 
-    def append_data(self, reserve: Wake) -> Wake:
+        return result
+
+    def append_data(self, reserve: Wake,
+                    idempotency_key: Optional[str] = None) -> Wake:
         """Append new data to storage
 
         Args:
             reserve:
                 An instance of entity wake class.
+            idempotency_key:
+                Optional. A unique key of the insert. If a reservation
+                with the key is stored already, it is returned instead
+                of inserting a new one.
         """
         cursor = self.__connection.cursor()
-        cursor.execute(
-            f"  INSERT INTO {self.__table_name} ("
-            """     telegram_id, firstname, lastname,
-                    middlename, displayname, phone_number,
-                    start, end, set_type_id, set_count, board, hydro, count)
-                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                reserve.user.telegram_id,
-                reserve.user.firstname,
-                reserve.user.lastname,
-                reserve.user.middlename,
-                reserve.user.displayname,
-                reserve.user.phone_number,
-                reserve.start.timestamp(),
-                reserve.end.timestamp(),
-                reserve.set_type.set_id,
-                reserve.set_count,
-                reserve.board,
-                reserve.hydro,
-                reserve.count
-            ))
+        cursor.execute(self.insert_query,
+                       self.get_insert_values(reserve, idempotency_key))
         self.__connection.commit()
 
+        if not cursor.rowcount:
+            return self.get_data_by_idempotency_key(idempotency_key)
+
         result = reserve.__deepcopy__()
         result.id = cursor.lastrowid
 
+        if self.occupancy_adapter:
+            self.occupancy_adapter.replace_reserve(
+                self.__table_name, None, result)
+
         return result
 
+    def insert_many(self, rows: list) -> dict:
+        """Insert reservations in one transaction
+
+        Args:
+            rows:
+                A list of (idempotency key, reservation) tuples
+
+        Returns:
+            A dictionary of integer identifiers by idempotency keys
+        """
+        cursor = self.__connection.cursor()
+        cursor.executemany(self.insert_query, [
+            self.get_insert_values(reserve, key) for key, reserve in rows])
+        self.__connection.commit()
+
+        ids = self.get_ids_by_idempotency_keys([key for key, _ in rows])
+        if self.occupancy_adapter:
+            results = []
+            for key, reserve in rows:
+                result = reserve.__deepcopy__()
+                result.id = ids.get(key)
+                results.append(result)
+            self.occupancy_adapter.append_reserves(self.__table_name,
+                                                   results)
+
+        return ids
+
+    @property
+    def insert_query(self) -> str:
+        return (
+            f"  INSERT INTO {self.__table_name} ("
+            """     telegram_id, firstname, lastname,
+                    middlename, displayname, phone_number,
+                    start, end, set_type_id, set_count, board, hydro, count,
+                    idempotency_key)
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (idempotency_key) DO NOTHING
+            """)
+
+    @staticmethod
+    def get_insert_values(reserve: Wake,
+                          idempotency_key: Optional[str] = None) -> tuple:
+        """Get an insert query parameters of a reservation"""
+        return (
+            reserve.user.telegram_id,
+            reserve.user.firstname,
+            reserve.user.lastname,
+            reserve.user.middlename,
+            reserve.user.displayname,
+            reserve.user.phone_number,
+            reserve.start.timestamp(),
+            reserve.end.timestamp(),
+            reserve.set_type.set_id,
+            reserve.set_count,
+            reserve.board,
+            reserve.hydro,
+            reserve.count,
+            idempotency_key)
+
     def update_data(self, reserve: Wake):
         """Append new data to storage
 
@@ -215,6 +364,10 @@ class SqliteWakeAdapter(ReserveDataAdapter):
             reserve:
                 An instance of entity wake class.
         """
+        previous = None
+        if self.occupancy_adapter:
+            previous = self.get_data_by_keys(reserve.id)
+
         cursor = self.__connection.cursor()
         cursor = cursor.execute(
             f"  UPDATE {self.__table_name} SET"
@@ -243,6 +396,10 @@ class SqliteWakeAdapter(ReserveDataAdapter):
                 reserve.id))
         self.__connection.commit()
 
+        if self.occupancy_adapter:
+            self.occupancy_adapter.replace_reserve(
+                self.__table_name, previous, reserve)
+
     def remove_data_by_keys(self, id: int):
         """Remove data from storage by a keys
 
@@ -253,11 +410,39 @@ class SqliteWakeAdapter(ReserveDataAdapter):
         Returns:
             A iterator object of given data
         """
+        previous = None
+        if self.occupancy_adapter:
+            previous = self.get_data_by_keys(id)
+
         cursor = self.__connection.cursor()
         cursor = cursor.execute(
             f" DELETE FROM {self.__table_name} WHERE id = ?", [id])
         self.__connection.commit()
 
+        if self.occupancy_adapter:
+            self.occupancy_adapter.replace_reserve(
+                self.__table_name, previous, None)
+
+    def rebuild_occupancy(self):
+        """Rebuild slot occupancy of the adapter from scratch"""
+        if self.occupancy_adapter:
+            self.occupancy_adapter.rebuild(self.__table_name, self.get_data())
+
+    def get_day_occupancy(self, day: date) -> Union[list, None]:
+        """Get a day slot occupancy of the adapter
+
+        Args:
+            day:
+                A date of occupancy
+
+        Returns:
+            A list of slot counters or None if occupancy isn't tracked
+        """
+        if not self.occupancy_adapter:
+            return None
+
+        return self.occupancy_adapter.get_day_slots(self.__table_name, day)
+
     def create_table(self):
         cursor = self.__connection.cursor()
 
@@ -275,7 +460,20 @@ class SqliteWakeAdapter(ReserveDataAdapter):
                     set_type_id text,
                     set_count integer,
                     board integer, hydro integer, count integer,
-                    canceled integer DEFAULT 0, cancel_telegram_id integer)
+                    canceled integer DEFAULT 0, cancel_telegram_id integer,
+                    idempotency_key text)
             """)
+        columns = [row[1] for row in cursor.execute(
+            f"PRAGMA table_info({self.__table_name})")]
+        if "idempotency_key" not in columns:
+            cursor.execute(f"ALTER TABLE {self.__table_name}"
+                           " ADD COLUMN idempotency_key text")
+        cursor.execute(
+            f"  CREATE INDEX IF NOT EXISTS {self.__table_name}_start_idx"
+            f"  ON {self.__table_name} (start, id)")
+        cursor.execute(
+            "  CREATE UNIQUE INDEX IF NOT EXISTS"
+            f"  {self.__table_name}_idempotency_key_idx"
+            f"  ON {self.__table_name} (idempotency_key)")
 
         self.connection.commit()
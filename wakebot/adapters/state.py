@@ -1,11 +1,32 @@
 # -*- coding: utf-8 -*-
+from contextvars import ContextVar
 from typing import Union, Optional
 from wakebot.adapters.data import BaseDataAdapter
 
 
+class CurrentState:
+    """A state of an update is being processed"""
+
+    __slots__ = ("chat_id", "user_id", "message_id", "state_type", "state",
+                 "data", "params")
+
+    def __init__(self, chat_id=None, user_id=None, message_id=None):
+        self.chat_id = chat_id
+        self.user_id = user_id
+        self.message_id = message_id
+        self.state_type = ""
+        self.state = ""
+        self.data = None
+        self.params = {}
+
+
 class StateManager:
     """Manager of current state
 
+    A current state is kept in a context variable, so updates
+    processed concurrently (in their own tasks) do not see each other
+    state between awaits.
+
     Attributes:
         data_adapter:
             A BaseDataAdapter object of a state storage
@@ -15,12 +36,12 @@ class StateManager:
             A current state type
         state:
             A current state
+        params:
+            A dictionary of current state parameters (e.g. a list page)
     """
 
     __data_adapter: BaseDataAdapter
-    __state_type: Union[str, int]
-    __state: Union[str, int]
-    __data: any
+    __current: ContextVar
 
     def __init__(self,
                  data_adapter: BaseDataAdapter,
@@ -39,56 +60,63 @@ class StateManager:
                 Optinal. An int or str a telegramm message Id
         """
         self.__data_adapter = data_adapter
-        self.__state_type = ""
-        self.__state = ""
-        self.__data = None
+        self.__current = ContextVar(f"state_manager_{id(self)}")
 
         self.get_state(chat_id, user_id, message_id)
 
+    @property
+    def current(self) -> CurrentState:
+        current = self.__current.get(None)
+        if current is None:
+            current = CurrentState()
+            self.__current.set(current)
+        return current
+
     @property
     def data_adapter(self):
         return self.__data_adapter
 
     @property
     def state_id(self):
-        result = str(self.__chat_id)
-        result += f"-{self.__user_id}" if self.__user_id else ""
-        result += f"-{self.__message_id}" if self.__message_id else ""
+        current = self.current
+        result = str(current.chat_id)
+        result += f"-{current.user_id}" if current.user_id else ""
+        result += f"-{current.message_id}" if current.message_id else ""
 
         return result
 
     @property
     def state_type(self):
-        return self.__state_type
+        return self.current.state_type
 
     @property
     def state(self):
-        return self.__state
+        return self.current.state
 
     @property
     def data(self):
-        return self.__data
+        return self.current.data
+
+    @property
+    def params(self):
+        return self.current.params
 
     def get_state(self,
                   chat_id: int,
                   user_id: int,
                   message_id: Optional[int] = None):
         """Get current state from data adapter """
-        self.__chat_id = chat_id
-        self.__user_id = user_id
-        self.__message_id = message_id
+        current = CurrentState(chat_id, user_id, message_id)
+        self.__current.set(current)
 
         if chat_id and user_id:
             state_data: dict = self.__data_adapter.get_data_by_keys(
                 key=self.state_id)
             if state_data:
-                self.__state_type = state_data["state_type"]
-                self.__state = state_data["state"]
-                self.__data = state_data.get("data", None)
-            else:
-                self.__state_type = ""
-                self.__state = ""
-                self.__data = None
+                current.state_type = state_data["state_type"]
+                current.state = state_data["state"]
+                current.data = state_data.get("data", None)
+                current.params = state_data.get("params", {})
 
     def set_state(self,
                   state: Optional[Union[str, int]] = None,
@@ -107,17 +135,21 @@ class StateManager:
                 data:
                     Optional. A dictionary that contains a state data
         """
-        self.__state = state or self.__state
-        self.__state_type = state_type or self.__state_type
-        self.__message_id = message_id or self.__message_id
-        self.__data = data or self.__data
+        current = self.current
+        current.state = state or current.state
+        current.state_type = state_type or current.state_type
+        current.message_id = message_id or current.message_id
+        current.data = data or current.data
 
         state_data = {}
-        state_data["state"] = self.__state
-        state_data["state_type"] = self.__state_type
+        state_data["state"] = current.state
+        state_data["state_type"] = current.state_type
 
-        if self.__data:
-            state_data["data"] = self.__data
+        if current.data:
+            state_data["data"] = current.data
+
+        if current.params:
+            state_data["params"] = current.params
 
         self.data_adapter.update_data(self.state_id, state_data)
 
@@ -128,7 +160,16 @@ class StateManager:
                 data:
                     A dictionary that contains a state data
         """
-        self.__data = data
+        self.current.data = data
+
+    def set_params(self, params: dict):
+        """Set state parameters
+
+            Args:
+                params:
+                    A dictionary that contains a state parameters
+        """
+        self.current.params = params
 
     def finish(self):
         """Remove current state from storage"""
@@ -0,0 +1,217 @@
+from bisect import bisect_left
+from datetime import date
+from itertools import accumulate
+from typing import Optional
+from ..entities.epoch import day_to_epoch_minutes, MINUTES_PER_DAY
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ReserveTimeline:
+    """Reservation occupancy and conflict computation
+
+    A timeline keeps reservation starts, ends and counts (in epoch minutes)
+    as arrays and computes occupancy with cumulative sums. NumPy is used
+    if it is installed, a pure-Python implementation otherwise.
+
+    The admin list view shows a day load (a peak and overlapping pairs)
+    of a timeline, a booking conflict check stays in the data adapters.
+    NumPy is an optional speed-up, not a requirement of the bot.
+
+    Attributes:
+        starts:
+            An array of reservation start minutes.
+        ends:
+            An array of reservation end minutes.
+        counts:
+            An array of reservation counts.
+        reserves:
+            A list of reservations the arrays are built of (can be empty).
+        slot_minutes:
+            An integer duration of an occupancy slot.
+        use_numpy:
+            A boolean indicates the NumPy implementation is used.
+    """
+
+    def __init__(self, starts: list, ends: list, counts: list,
+                 slot_minutes: int = 5, use_numpy: Optional[bool] = None):
+        """Reservation occupancy and conflict computation
+
+        Args:
+            starts:
+                A sequence of reservation start epoch minutes.
+            ends:
+                A sequence of reservation end epoch minutes.
+            counts:
+                A sequence of reservation counts.
+            slot_minutes:
+                Optional. An integer duration of an occupancy slot.
+            use_numpy:
+                Optional. A boolean to force or disable NumPy usage.
+                NumPy is used when it is available by default.
+        """
+        self.use_numpy = bool(numpy) and use_numpy is not False
+        self.slot_minutes = slot_minutes
+        self.reserves = []
+
+        if self.use_numpy:
+            self.starts = numpy.asarray(starts, dtype=numpy.int64)
+            self.ends = numpy.asarray(ends, dtype=numpy.int64)
+            self.counts = numpy.asarray(counts, dtype=numpy.int64)
+        else:
+            self.starts = list(starts)
+            self.ends = list(ends)
+            self.counts = list(counts)
+
+    @classmethod
+    def from_reserves(cls, reserves: iter, slot_minutes: int = 5,
+                      use_numpy: Optional[bool] = None):
+        """Create a timeline of a reservations
+
+        Canceled and incomplete (without start or duration) reservations
+        are skipped.
+
+        Args:
+            reserves:
+                A iterator object of wake or supboard reservations.
+            slot_minutes:
+                Optional. An integer duration of an occupancy slot.
+            use_numpy:
+                Optional. A boolean to force or disable NumPy usage.
+
+        Returns:
+            A timeline instance
+        """
+        reserves = [reserve for reserve in reserves
+                    if not reserve.canceled
+                    and reserve.start_minute is not None
+                    and reserve.end_minute is not None]
+
+        timeline = cls([reserve.start_minute for reserve in reserves],
+                       [reserve.end_minute for reserve in reserves],
+                       [reserve.count for reserve in reserves],
+                       slot_minutes, use_numpy)
+        timeline.reserves = reserves
+
+        return timeline
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def get_occupancy(self, start: int, end: int) -> list:
+        """Get a per-slot occupancy of a time range
+
+        A reservation takes every slot it is overlapped with.
+
+        Args:
+            start:
+                A range start epoch minute (aligned to a slot).
+            end:
+                A range end epoch minute (exclusive).
+
+        Returns:
+            A list of integer slot counters
+        """
+        base = start // self.slot_minutes
+        size = -(-end // self.slot_minutes) - base
+
+        if self.use_numpy:
+            first = numpy.clip(self.starts // self.slot_minutes - base,
+                               0, size)
+            last = numpy.clip(-(-self.ends // self.slot_minutes) - base,
+                              0, size)
+            delta = (numpy.bincount(first, self.counts, size + 1)
+                     - numpy.bincount(last, self.counts, size + 1))
+
+            return numpy.cumsum(delta[:size]).astype(numpy.int64).tolist()
+
+        delta = [0] * (size + 1)
+        for reserve_start, reserve_end, count in zip(self.starts, self.ends,
+                                                     self.counts):
+            first = min(max(reserve_start // self.slot_minutes - base, 0),
+                        size)
+            last = min(max(-(-reserve_end // self.slot_minutes) - base, 0),
+                       size)
+            if first < last:
+                delta[first] += count
+                delta[last] -= count
+
+        return list(accumulate(delta[:size]))
+
+    def get_day_occupancy(self, day: date, days: int = 1) -> list:
+        """Get a per-slot occupancy of a days
+
+        Args:
+            day:
+                A first day date.
+            days:
+                Optional. An integer count of days.
+
+        Returns:
+            A list of integer slot counters
+        """
+        start = day_to_epoch_minutes(day)
+        return self.get_occupancy(start, start + days * MINUTES_PER_DAY)
+
+    def get_peak(self) -> int:
+        """Get a maximum count of simultaneous reservations
+
+        A reservation ending at the same minute other one starts
+        is not simultaneous with it.
+        """
+        if not len(self):
+            return 0
+
+        if self.use_numpy:
+            times = numpy.concatenate((self.starts, self.ends))
+            deltas = numpy.concatenate((self.counts, -self.counts))
+            order = numpy.lexsort((deltas, times))
+
+            return max(int(numpy.cumsum(deltas[order]).max()), 0)
+
+        events = sorted(
+            [(start, count) for start, count in zip(self.starts, self.counts)]
+            + [(end, -count) for end, count in zip(self.ends, self.counts)])
+
+        return max(max(accumulate(delta for _, delta in events)), 0)
+
+    def get_conflicts(self) -> list:
+        """Get a conflicting reservation pairs
+
+        Two reservations conflict if they start at the same minute
+        or one starts before other one ends.
+
+        Returns:
+            A sorted list of (i, j) index pairs where i < j
+        """
+        size = len(self)
+        if self.use_numpy:
+            order = numpy.argsort(self.starts, kind="stable")
+            starts = self.starts[order]
+            limits = numpy.searchsorted(starts, self.ends[order], "left")
+            lengths = numpy.maximum(limits - numpy.arange(size) - 1, 0)
+
+            first = numpy.repeat(numpy.arange(size), lengths)
+            offsets = (numpy.arange(lengths.sum())
+                       - numpy.repeat(numpy.cumsum(lengths) - lengths,
+                                      lengths))
+            first, second = order[first], order[first + 1 + offsets]
+            first, second = (numpy.minimum(first, second),
+                             numpy.maximum(first, second))
+            pair_order = numpy.lexsort((second, first))
+
+            return list(zip(first[pair_order].tolist(),
+                            second[pair_order].tolist()))
+
+        order = sorted(range(size), key=self.starts.__getitem__)
+        starts = [self.starts[i] for i in order]
+        result = []
+        for position, i in enumerate(order):
+            limit = bisect_left(starts, self.ends[i])
+            for j in order[position + 1:limit]:
+                result.append((min(i, j), max(i, j)))
+
+        return sorted(result)
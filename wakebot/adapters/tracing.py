@@ -0,0 +1,342 @@
+import logging
+import re
+import sys
+from collections import deque
+from functools import lru_cache
+from time import perf_counter
+from typing import Optional
+from .data import BaseDataAdapter, ReserveDataAdapter, UserDataAdapter
+from .data import OccupancyDataAdapter
+
+log = logging.getLogger("wakebot.sql")
+
+LITERAL_RE = re.compile(
+    r"'(?:[^']|'')*'"               # a string literal
+    r"|%\(\w+\)s|%s"                # a pyformat parameter
+    r"|\b\d+(?:\.\d+)?\b")          # a number literal
+SPACE_RE = re.compile(r"\s+")
+ADAPTER_CLASSES = (BaseDataAdapter, ReserveDataAdapter, UserDataAdapter,
+                   OccupancyDataAdapter)
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(statement: str) -> str:
+    """Get a statement with literals and parameters replaced by "?"
+
+    Whitespaces are collapsed, so statements are differed by a structure.
+    """
+    statement = LITERAL_RE.sub("?", statement)
+    return SPACE_RE.sub(" ", statement).strip()
+
+
+def get_caller(depth: int = 2, limit: int = 8) -> str:
+    """Get a name of a nearest data adapter method in a call stack
+
+    Returns:
+        A "ClassName.method" string or an empty string
+    """
+    frame = sys._getframe(depth)
+    while frame and limit:
+        owner = frame.f_locals.get("self")
+        if isinstance(owner, ADAPTER_CLASSES):
+            return f"{type(owner).__name__}.{frame.f_code.co_name}"
+        frame = frame.f_back
+        limit -= 1
+
+    return ""
+
+
+class QueryRecord:
+    """An executed statement record
+
+    Attributes:
+        statement:
+            A normalized statement.
+        caller:
+            A calling adapter method name.
+        duration:
+            A float execution and fetching time in seconds.
+        rows:
+            An integer count of affected or fetched rows.
+    """
+
+    __slots__ = ("statement", "caller", "duration", "rows")
+
+    def __init__(self, statement: str, caller: str, duration: float,
+                 rows: int = 0):
+        self.statement = statement
+        self.caller = caller
+        self.duration = duration
+        self.rows = rows
+
+    def __repr__(self):
+        return (f"QueryRecord({self.caller}, {self.duration * 1000:.3f} ms,"
+                f" {self.rows} rows: {self.statement})")
+
+
+class QueryTracer:
+    """Adapter query tracer
+
+    Keeps a ring buffer of recent queries and aggregated statistics
+    per a normalized statement, and logs slow queries to
+    the "wakebot.sql" logger.
+
+    Attributes:
+        recent:
+            A deque of recent query records.
+        stats:
+            A dictionary of statement statistics by a normalized statement.
+        slow_threshold:
+            A float duration in seconds a query is logged as slow above.
+            Slow queries are not logged if None.
+        explain:
+            A boolean indicates to log a query plan of slow SELECT
+            statements (a development mode, a query is executed twice).
+        slow_count:
+            An integer count of slow queries.
+    """
+
+    def __init__(self, size: int = 1000,
+                 slow_threshold: Optional[float] = 0.1,
+                 explain: bool = False):
+        """Adapter query tracer
+
+        Args:
+            size:
+                Optional. A maximum count of recent query records.
+            slow_threshold:
+                Optional. A float slow query duration in seconds.
+            explain:
+                Optional. A boolean indicates to log a slow query plan.
+        """
+        self.recent = deque(maxlen=size)
+        self.stats = {}
+        self.slow_threshold = slow_threshold
+        self.explain = explain
+        self.slow_count = 0
+
+    def record(self, statement: str, caller: str, duration: float,
+               rows: int = 0) -> QueryRecord:
+        """Register an executed statement
+
+        Returns:
+            A created query record
+        """
+        record = QueryRecord(normalize_statement(statement), caller,
+                             duration, rows)
+        self.recent.append(record)
+
+        stats = self.stats.get(record.statement)
+        if stats is None:
+            stats = self.stats[record.statement] = {
+                "statement": record.statement, "count": 0, "total": 0.0,
+                "max": 0.0, "rows": 0, "callers": set()}
+        stats["count"] += 1
+        stats["total"] += duration
+        stats["max"] = max(stats["max"], duration)
+        stats["rows"] += rows
+        stats["callers"].add(caller)
+
+        return record
+
+    def add_rows(self, record: QueryRecord, rows: int,
+                 duration: float = 0.0):
+        """Count rows fetched after a statement execution
+
+        Args:
+            record:
+                An executed statement record.
+            rows:
+                An integer count of fetched rows.
+            duration:
+                Optional. A float fetching time in seconds.
+        """
+        record.rows += rows
+        record.duration += duration
+
+        stats = self.stats[record.statement]
+        stats["rows"] += rows
+        stats["total"] += duration
+
+    def is_slow(self, duration: float) -> bool:
+        return (self.slow_threshold is not None
+                and duration >= self.slow_threshold)
+
+    def log_slow(self, record: QueryRecord, plan: Optional[list] = None):
+        self.slow_count += 1
+        message = (f"Slow query {record.duration * 1000:.1f} ms"
+                   f" in {record.caller or '?'}: {record.statement}")
+        if plan:
+            message += "\n" + "\n".join(str(row) for row in plan)
+        log.warning(message)
+
+    def get_stats(self, limit: Optional[int] = None) -> list:
+        """Get a statement statistics ordered by a total time
+
+        Returns:
+            A list of dictionaries with statement, count, total, mean,
+            max, rows and callers keys
+        """
+        result = [dict(stats, mean=stats["total"] / stats["count"],
+                       callers=sorted(stats["callers"]))
+                  for stats in self.stats.values()]
+        result.sort(key=lambda stats: stats["total"], reverse=True)
+
+        return result[:limit] if limit else result
+
+    def reset(self):
+        self.recent.clear()
+        self.stats.clear()
+        self.slow_count = 0
+
+
+class TracedCursor:
+    """A DB-API cursor proxy reporting executed statements to a tracer"""
+
+    def __init__(self, cursor, connection):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_connection", connection)
+        object.__setattr__(self, "_record", None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        return self._cursor.__exit__(*args)
+
+    def __iter__(self):
+        rows = iter(self._cursor)
+        while True:
+            start = perf_counter()
+            row = next(rows, None)
+            if row is None:
+                return
+            self.count_rows(1, start)
+            yield row
+
+    def trace(self, method, statement, params, caller: str):
+        tracer = self._connection.tracer
+        start = perf_counter()
+        if params is None:
+            method(statement)
+        else:
+            method(statement, params)
+        duration = perf_counter() - start
+
+        statement = self._connection.get_statement_text(statement)
+        record = tracer.record(statement, caller, duration)
+        # Selected rows are counted on fetching, a row count of
+        # a SELECT statement is not reliable before it.
+        selected = record.statement.upper().startswith("SELECT")
+        if not selected and self._cursor.rowcount > 0:
+            tracer.add_rows(record, self._cursor.rowcount)
+        object.__setattr__(self, "_record", record if selected else None)
+
+        if tracer.is_slow(duration):
+            plan = None
+            if tracer.explain and selected:
+                plan = self._connection.explain(statement, params)
+            tracer.log_slow(record, plan)
+
+        return self
+
+    def execute(self, statement, params=None):
+        return self.trace(self._cursor.execute, statement, params,
+                          get_caller())
+
+    def executemany(self, statement, params):
+        return self.trace(self._cursor.executemany, statement, params,
+                          get_caller())
+
+    def count_rows(self, rows: int, start: float):
+        if self._record:
+            self._connection.tracer.add_rows(self._record, rows,
+                                             perf_counter() - start)
+
+    def fetchone(self):
+        start = perf_counter()
+        row = self._cursor.fetchone()
+        self.count_rows(0 if row is None else 1, start)
+        return row
+
+    def fetchmany(self, *args):
+        start = perf_counter()
+        rows = self._cursor.fetchmany(*args)
+        self.count_rows(len(rows), start)
+        return rows
+
+    def fetchall(self):
+        start = perf_counter()
+        rows = self._cursor.fetchall()
+        self.count_rows(len(rows), start)
+        return rows
+
+
+class TracedConnection:
+    """A DB-API connection proxy tracing queries of its cursors
+
+    SQLite and PostgreSQL (psycopg2) connections are supported.
+    Adapters get a traced connection instead of a plain one:
+
+        connection = TracedConnection(sqlite3.connect(path), tracer)
+        adapter = SqliteWakeAdapter(connection)
+
+    Attributes:
+        connection:
+            A wrapped connection.
+        tracer:
+            A query tracer the statements are reported to.
+    """
+
+    def __init__(self, connection, tracer: QueryTracer):
+        self.connection = connection
+        self.tracer = tracer
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    @property
+    def is_sqlite(self) -> bool:
+        return type(self.connection).__module__.startswith("sqlite3")
+
+    def cursor(self, *args, **kwargs) -> TracedCursor:
+        return TracedCursor(self.connection.cursor(*args, **kwargs), self)
+
+    def get_statement_text(self, statement) -> str:
+        """Get a text of an executed statement
+
+        psycopg2 helpers (e.g. extras.execute_values) execute bytes
+        encoded with a connection encoding, a psycopg2.sql.Composable
+        is rendered with the connection.
+        """
+        if isinstance(statement, (bytes, bytearray, memoryview)):
+            from psycopg2.extensions import encodings
+            encoding = encodings.get(self.connection.encoding, "utf-8")
+            return bytes(statement).decode(encoding, "replace")
+        if not isinstance(statement, str) and hasattr(statement,
+                                                      "as_string"):
+            return statement.as_string(self.connection)
+
+        return statement
+
+    def explain(self, statement: str, params=None) -> list:
+        """Get a query plan rows of a statement"""
+        prefix = "EXPLAIN QUERY PLAN " if self.is_sqlite else "EXPLAIN "
+        cursor = self.connection.cursor()
+        try:
+            if params is None:
+                cursor.execute(prefix + statement)
+            else:
+                cursor.execute(prefix + statement, params)
+            return cursor.fetchall()
+        except Exception as error:
+            return [f"EXPLAIN failed: {error}"]
+        finally:
+            cursor.close()
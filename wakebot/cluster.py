@@ -0,0 +1,241 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Optional
+
+from aiogram import Bot, Dispatcher, types
+
+log = logging.getLogger("wakebot.cluster")
+
+UPDATE_CHAT_PATHS = (
+    ("message", "chat"),
+    ("edited_message", "chat"),
+    ("channel_post", "chat"),
+    ("edited_channel_post", "chat"),
+    ("callback_query", "message", "chat"),
+    ("callback_query", "from"),
+    ("inline_query", "from"),
+    ("chosen_inline_result", "from"),
+    ("shipping_query", "from"),
+    ("pre_checkout_query", "from"),
+    ("poll_answer", "user"),
+)
+
+
+def get_chat_id(update: dict) -> int:
+    """Get a conversation identifier of a raw update
+
+    A chat identifier is used if an update has a chat,
+    a user identifier otherwise (0 if there is no one).
+    """
+    for path in UPDATE_CHAT_PATHS:
+        value = update
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if isinstance(value, dict) and "id" in value:
+            return value["id"]
+
+    return 0
+
+
+def get_worker_index(chat_id: int, worker_count: int) -> int:
+    """Get a worker index a chat is owned by"""
+    return chat_id % worker_count
+
+
+class ChatSequencer:
+    """Per-chat ordered concurrent execution
+
+    Items of one chat are handled one by one in a submit order,
+    items of different chats are handled concurrently.
+
+    Attributes:
+        handler:
+            A coroutine function handles an item - f(item).
+    """
+
+    def __init__(self, handler: Callable[[object], Awaitable]):
+        self.handler = handler
+        self.__queues = {}
+        self.__tasks = set()
+
+    def submit(self, chat_id: int, item):
+        """Schedule an item handling after previous items of the chat"""
+        queue = self.__queues.get(chat_id)
+        if queue is not None:
+            queue.append(item)
+            return
+
+        self.__queues[chat_id] = deque([item])
+        task = asyncio.ensure_future(self.consume(chat_id))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def consume(self, chat_id: int):
+        queue = self.__queues[chat_id]
+        try:
+            while queue:
+                try:
+                    await self.handler(queue[0])
+                except Exception:
+                    log.exception(f"Update handling failed in chat {chat_id}")
+                queue.popleft()
+        finally:
+            del self.__queues[chat_id]
+
+    @property
+    def pending(self) -> int:
+        """A count of submitted and not handled items"""
+        return sum(len(queue) for queue in self.__queues.values())
+
+    async def join(self):
+        """Wait for all submitted items are handled"""
+        while self.__tasks:
+            await asyncio.gather(*list(self.__tasks))
+
+
+async def run_worker(dispatcher: Dispatcher, connection):
+    """Handle updates received from a front-end until a stop signal
+
+    Args:
+        dispatcher:
+            A dispatcher with registered processors.
+        connection:
+            A multiprocessing connection end the updates are received from
+            (as JSON bytes, an empty message is a stop signal).
+    """
+    Bot.set_current(dispatcher.bot)
+    Dispatcher.set_current(dispatcher)
+
+    async def process(update: dict):
+        await dispatcher.process_updates([types.Update.to_object(update)])
+
+    loop = asyncio.get_running_loop()
+    sequencer = ChatSequencer(process)
+    stopped = loop.create_future()
+
+    def receive():
+        try:
+            data = connection.recv_bytes()
+        except EOFError:
+            data = b""
+        if not data:
+            loop.remove_reader(connection.fileno())
+            stopped.set_result(True)
+            return
+
+        update = json.loads(data)
+        sequencer.submit(get_chat_id(update), update)
+
+    loop.add_reader(connection.fileno(), receive)
+    await stopped
+    await sequencer.join()
+    await dispatcher.bot.close()
+
+
+class WorkerPool:
+    """Update worker processes partitioned by a chat
+
+    Each worker owns a chat partition (chat_id % worker_count),
+    so state of a conversation lives in one process and updates
+    of a chat are handled in a received order.
+
+    Attributes:
+        worker_count:
+            An integer count of worker processes.
+        processes:
+            A list of worker processes.
+        connections:
+            A list of connection ends updates are sent to the workers by.
+        writers:
+            A list of single thread executors writing to the connections,
+            so a full pipe doesn't block the front-end event loop.
+        dispatched:
+            A list of dispatched update counters by a worker.
+    """
+
+    def __init__(self, target: Callable, worker_count: int,
+                 args: tuple = (), context: Optional[str] = "spawn"):
+        """Update worker processes partitioned by a chat
+
+        Args:
+            target:
+                A picklable function runs a worker - f(connection, *args).
+                It should run run_worker with its own dispatcher.
+            worker_count:
+                An integer count of worker processes.
+            args:
+                Optional. A tuple of additional target arguments.
+            context:
+                Optional. A multiprocessing start method, "spawn"
+                by default, so workers open their own connections.
+        """
+        self.worker_count = worker_count
+        self.target = target
+        self.args = args
+        self.context = multiprocessing.get_context(context)
+        self.processes = []
+        self.connections = []
+        self.writers = []
+        self.dispatched = [0] * worker_count
+
+    def start(self):
+        for index in range(self.worker_count):
+            reader, writer = self.context.Pipe(duplex=False)
+            process = self.context.Process(
+                target=self.target, args=(reader,) + tuple(self.args),
+                name=f"wakebot-worker-{index}", daemon=True)
+            process.start()
+            reader.close()
+
+            self.processes.append(process)
+            self.connections.append(writer)
+            self.writers.append(ThreadPoolExecutor(
+                1, thread_name_prefix=f"wakebot-writer-{index}"))
+
+    async def dispatch(self, update: dict) -> int:
+        """Send an update to an owner worker of its chat
+
+        An update is written by a worker writer thread, updates
+        of one worker are written in a dispatch order.
+
+        Returns:
+            A worker index
+        """
+        index = get_worker_index(get_chat_id(update), self.worker_count)
+        loop = asyncio.get_running_loop()
+        self.dispatched[index] += 1
+        await loop.run_in_executor(self.writers[index],
+                                   self.connections[index].send_bytes,
+                                   json.dumps(update).encode())
+        return index
+
+    def stop(self, timeout: Optional[float] = None):
+        """Send a stop signal and wait for the workers finish"""
+        for writer in self.writers:
+            writer.shutdown(wait=True)
+        for connection in self.connections:
+            connection.send_bytes(b"")
+            connection.close()
+        for process in self.processes:
+            process.join(timeout)
+
+        self.processes = []
+        self.connections = []
+        self.writers = []
+
+
+def create_webhook_app(pool: WorkerPool, path: str = "/webhook"):
+    """Create a front-end web application routing updates to workers"""
+    from aiohttp import web
+
+    async def handle_update(request: web.Request) -> web.Response:
+        await pool.dispatch(await request.json())
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(path, handle_update)
+    return app
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from typing import Optional
+
+from aiogram.utils.exceptions import MessageNotModified, RetryAfter
+
+log = logging.getLogger("wakebot.coalescing")
+
+COALESCED_METHODS = ("editMessageText", "editMessageReplyMarkup")
+
+
+def get_message_key(data: dict) -> Optional[tuple]:
+    """Get an edited message key of a request payload
+
+    Returns:
+        A (chat_id, message_id) or (inline_message_id,) tuple,
+        None if a payload has no message
+    """
+    if data.get("inline_message_id"):
+        return (data["inline_message_id"],)
+    if data.get("chat_id") is not None and data.get("message_id"):
+        return (data["chat_id"], data["message_id"])
+
+    return None
+
+
+class PendingEdit:
+    """A delayed message edit
+
+    Attributes:
+        method:
+            A Bot API method name.
+        data:
+            A latest request payload.
+        task:
+            A task sends the edit after a window.
+    """
+
+    __slots__ = ("method", "data", "task")
+
+    def __init__(self, method: str, data: dict):
+        self.method = method
+        self.data = data
+        self.task = None
+
+
+class EditCoalescer:
+    """Per-message coalescing of outbound message edits
+
+    Quick taps through inline keyboards produce an edit per callback,
+    while only the last one is visible. An edit is delayed for a window,
+    an edit of the same message within the window replaces it (the last
+    write wins), so one Bot API request is sent per window. An edit call
+    returns at once, so callback queries are still answered promptly.
+
+    Other requests are passed through. An edit of another method
+    (a text after a keyboard) sends a pending edit first to keep
+    the order. A message deletion drops a pending edit of the message.
+
+    Attributes:
+        window:
+            A float coalescing window in seconds.
+        requested:
+            An integer count of requested edits.
+        sent:
+            An integer count of edits sent to the Bot API.
+    """
+
+    def __init__(self, window: float = 0.25):
+        """Per-message coalescing of outbound message edits
+
+        Args:
+            window:
+                Optional. A float coalescing window in seconds.
+        """
+        self.window = window
+        self.requested = 0
+        self.sent = 0
+
+        self.__request = None
+        self.__pending = {}
+        self.__sending = set()
+
+    @property
+    def coalesced(self) -> int:
+        """A count of edits replaced by a later edit of the same message"""
+        return self.requested - self.sent - len(self.__pending)
+
+    @property
+    def pending(self) -> int:
+        return len(self.__pending)
+
+    def install(self, bot):
+        """Route message edits of a bot through the coalescer
+
+        Args:
+            bot:
+                An aiogram.Bot instance, its request method is wrapped.
+
+        Returns:
+            The bot
+        """
+        self.__request = bot.request
+
+        async def coalesced_request(method, data=None, files=None,
+                                    **kwargs):
+            key = None
+            if method == "deleteMessage":
+                self.drop(get_message_key(data or {}))
+            elif method in COALESCED_METHODS and not files and not kwargs:
+                key = get_message_key(data or {})
+            if key is None:
+                return await self.__request(method, data, files, **kwargs)
+
+            await self.push(key, method, data)
+            return True
+
+        bot.request = coalesced_request
+        return bot
+
+    async def push(self, key: tuple, method: str, data: dict):
+        self.requested += 1
+
+        edit = self.__pending.get(key)
+        if edit and edit.method != method:
+            edit.task.cancel()
+            await self.send(key, edit)
+            edit = None
+
+        if edit:
+            edit.data = data
+            return
+
+        edit = self.__pending[key] = PendingEdit(method, data)
+        edit.task = asyncio.ensure_future(self.send_later(key, edit,
+                                                          self.window))
+
+    def drop(self, key: Optional[tuple]):
+        """Cancel a pending edit of a message"""
+        edit = self.__pending.pop(key, None)
+        if edit:
+            edit.task.cancel()
+
+    async def send_later(self, key: tuple, edit: PendingEdit, delay: float):
+        await asyncio.sleep(delay)
+        await self.send(key, edit)
+
+    async def send(self, key: tuple, edit: PendingEdit):
+        if self.__pending.get(key) is edit:
+            del self.__pending[key]
+
+        self.sent += 1
+        task = asyncio.current_task()
+        self.__sending.add(task)
+        try:
+            await self.__request(edit.method, edit.data)
+        except MessageNotModified:
+            pass
+        except RetryAfter as error:
+            # Retry unless a newer edit of the message is pending
+            if key not in self.__pending:
+                self.sent -= 1
+                self.__pending[key] = edit
+                edit.task = asyncio.ensure_future(
+                    self.send_later(key, edit, error.timeout))
+        except Exception:
+            log.exception(f"Message edit {edit.method} {key} failed")
+        finally:
+            self.__sending.discard(task)
+
+    async def flush(self):
+        """Send pending edits at once and wait for sending edits"""
+        pending = list(self.__pending.items())
+        for key, edit in pending:
+            edit.task.cancel()
+        sending = list(self.__sending)
+        await asyncio.gather(*(self.send(key, edit) for key, edit in pending),
+                             *sending, return_exceptions=True)
@@ -0,0 +1,117 @@
+import logging
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Hashable
+
+from aiogram import types
+from aiogram.dispatcher.handler import CancelHandler
+from aiogram.dispatcher.middlewares import BaseMiddleware
+
+log = logging.getLogger("wakebot.dedup")
+
+
+class RecentSet:
+    """A bounded set of recently seen keys
+
+    A key is forgotten after a time window or when the set is full
+    (the oldest key first), so memory is bounded under any update rate.
+
+    Attributes:
+        size:
+            An integer maximum count of kept keys.
+        ttl:
+            A float time window in seconds a key is kept for.
+    """
+
+    def __init__(self, size: int = 10000, ttl: float = 600.0,
+                 clock: Callable[[], float] = monotonic):
+        """A bounded set of recently seen keys
+
+        Args:
+            size:
+                Optional. An integer maximum count of kept keys.
+            ttl:
+                Optional. A float time window in seconds.
+            clock:
+                Optional. A function returns a current time in seconds.
+        """
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self.__keys = OrderedDict()
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        self.expire()
+        return key in self.__keys
+
+    def expire(self):
+        """Forget keys are older than the time window"""
+        deadline = self.clock() - self.ttl
+        keys = self.__keys
+        while keys and next(iter(keys.values())) < deadline:
+            keys.popitem(last=False)
+
+    def add(self, key: Hashable) -> bool:
+        """Remember a key
+
+        Returns:
+            True if the key is new, False if it is seen in the window
+        """
+        self.expire()
+        if key in self.__keys:
+            return False
+
+        self.__keys[key] = self.clock()
+        if len(self.__keys) > self.size:
+            self.__keys.popitem(last=False)
+
+        return True
+
+
+class DeduplicationMiddleware(BaseMiddleware):
+    """Drop redelivered updates and repeated callback queries
+
+    Telegram redelivers an update if a webhook response or
+    a getUpdates confirmation is lost, and a client may resend
+    a callback query on a slow answer. A repeated update_id or
+    callback query id is not processed twice within a time window.
+
+    Attributes:
+        updates:
+            A recent set of processed update identifiers.
+        callback_queries:
+            A recent set of processed callback query identifiers.
+        dropped:
+            An integer count of dropped duplicates.
+    """
+
+    def __init__(self, size: int = 10000, ttl: float = 600.0):
+        """Drop redelivered updates and repeated callback queries
+
+        Args:
+            size:
+                Optional. An integer maximum count of kept identifiers.
+            ttl:
+                Optional. A float time window in seconds.
+        """
+        super().__init__()
+        self.updates = RecentSet(size, ttl)
+        self.callback_queries = RecentSet(size, ttl)
+        self.dropped = 0
+
+    def drop(self, kind: str, key: Hashable):
+        self.dropped += 1
+        log.info(f"Duplicate {kind} {key} is dropped")
+        raise CancelHandler()
+
+    async def on_pre_process_update(self, update: types.Update, data: dict):
+        if not self.updates.add(update.update_id):
+            self.drop("update", update.update_id)
+
+    async def on_pre_process_callback_query(
+            self, callback_query: types.CallbackQuery, data: dict):
+        if not self.callback_queries.add(callback_query.id):
+            self.drop("callback query", callback_query.id)
@@ -2,6 +2,11 @@ from .reserve import Reserve, ReserveSetType
 from .user import User
 from .wake import Wake
 from .supboard import Supboard
+from .recurrence import Recurrence
+from .epoch import to_epoch_minutes, from_epoch_minutes
+from .epoch import day_to_epoch_minutes, epoch_minutes_to_date
 
 if __name__ == "__main__":
-    Reserve, User, Wake, Supboard, ReserveSetType
+    Reserve, User, Wake, Supboard, ReserveSetType, Recurrence
+    to_epoch_minutes, from_epoch_minutes
+    day_to_epoch_minutes, epoch_minutes_to_date
@@ -0,0 +1,37 @@
+from datetime import date, datetime, timedelta
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_epoch_minutes(value: datetime) -> int:
+    """Convert a station-local datetime to minutes since epoch
+
+    Seconds are dropped, reservations are minute-granular.
+
+    Args:
+        value:
+            A naive station-local datetime.
+
+    Returns:
+        An integer count of minutes since 1970-01-01 00:00
+    """
+    return ((value.toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY
+            + value.hour * 60 + value.minute)
+
+
+def day_to_epoch_minutes(day: date) -> int:
+    """Convert a date to minutes since epoch of the day start"""
+    return (day.toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY
+
+
+def from_epoch_minutes(value: int) -> datetime:
+    """Convert minutes since epoch to a station-local datetime"""
+    day = epoch_minutes_to_date(value)
+    return datetime(day.year, day.month, day.day) + timedelta(
+        minutes=value % MINUTES_PER_DAY)
+
+
+def epoch_minutes_to_date(value: int) -> date:
+    """Get a date of minutes since epoch"""
+    return date.fromordinal(value // MINUTES_PER_DAY + EPOCH_ORDINAL)
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from typing import Iterable
+from .reserve import Reserve
+
+
+class Recurrence:
+    """A weekly recurrence rule of a reservation
+
+    E.g. every Tuesday and Thursday until the end of June:
+
+        Recurrence((1, 3), date(2021, 6, 30))
+
+    Attributes:
+        weekdays:
+            A sorted tuple of weekday numbers (Monday is 0).
+        until:
+            A last date of occurrences (inclusive).
+        max_occurrences:
+            An integer maximum count of occurrences of a one rule.
+    """
+
+    __slots__ = ("weekdays", "until")
+
+    max_occurrences: int = 100
+
+    def __init__(self, weekdays: Iterable[int], until: date):
+        """A weekly recurrence rule of a reservation
+
+        Args:
+            weekdays:
+                Weekday numbers (Monday is 0).
+            until:
+                A last date of occurrences (inclusive).
+        """
+        self.weekdays = tuple(sorted(set(weekdays)))
+        self.until = until
+
+    def get_dates(self, start: date) -> list:
+        """Get occurrence dates from a start date
+
+        Args:
+            start:
+                A first date of occurrences (inclusive).
+
+        Returns:
+            A list of dates in ascending order
+        """
+        result = []
+        day = start
+        while day <= self.until:
+            if day.weekday() in self.weekdays:
+                result.append(day)
+            day += timedelta(days=1)
+
+        return result
+
+    def expand(self, reserve: Reserve) -> list:
+        """Expand a reservation to its occurrences
+
+        Occurrences start from a reservation date, a start time
+        and a set are copied.
+
+        Returns:
+            A list of new (not stored) reservations ordered by a start
+        """
+        result = []
+        for day in self.get_dates(reserve.start_date):
+            occurrence = reserve.__deepcopy__()
+            occurrence.id = None
+            occurrence.start_date = day
+            result.append(occurrence)
+
+        return result
+
+    def __repr__(self):
+        return f"Recurrence({self.weekdays!r}, {self.until!r})"
@@ -1,15 +1,44 @@
 from typing import Optional, Union
 from datetime import datetime, timedelta, date, time
 from .user import User
+from .epoch import to_epoch_minutes
 
 
 class ReserveSetType():
-    """Reservation set type class defines reservation time duration"""
+    """Reservation set type class defines reservation time duration
+
+    Set types are shared by reservations, use the get method
+    to obtain a registered instance instead of creating a new one.
+    """
+
+    __slots__ = ("set_id", "minutes")
+    __registry = {}
 
     def __init__(self, set_id="minute", minutes=1):
         self.set_id = set_id
         self.minutes = minutes
 
+    @classmethod
+    def get(cls, set_id: str = "minute", minutes: int = 1):
+        """Get a shared set type instance
+
+        Args:
+            set_id:
+                A set type identifier ("set", "hour").
+            minutes:
+                An integer duration of a one set.
+
+        Returns:
+            A registered set type instance
+        """
+        key = (set_id, minutes)
+        set_type = cls.__registry.get(key)
+        if not set_type:
+            set_type = cls(set_id, minutes)
+            cls.__registry[key] = set_type
+
+        return set_type
+
 
 class Reserve:
     """Reservation data class
@@ -31,6 +60,10 @@ class Reserve:
             Reservation end date only.
         end_time:
             Reservation end time only.
+        start_minute:
+            An integer reservation start in minutes since epoch.
+        end_minute:
+            An integer reservation end in minutes since epoch.
         set_type:
             A reservation set type instances.
         set_count:
@@ -43,8 +76,16 @@ class Reserve:
             A boolean meaning that a reserevation is canceled
         cancel_telegram_id:
             An integer telegram identifier of user canceled a reserevation
+        default_set_minutes:
+            An integer duration of a one set unless it is an hour set.
     """
 
+    __slots__ = ("__set_type", "__user", "__start_date", "__start_time",
+                 "__set_count", "__times", "count", "id", "canceled",
+                 "cancel_telegram_id")
+
+    default_set_minutes: int = 5
+
     user: Optional[User]
     start_date: Optional[date]
     start_time: Optional[time]
@@ -86,20 +127,50 @@ class Reserve:
                 Optional. An integer telegram identifier
                 of user canceled a reserevation
         """
-        if set_type_id == "hour":
-            self.set_type = ReserveSetType(set_type_id, 60)
-        else:
-            self.set_type = ReserveSetType(set_type_id, 5)
-
+        self.__times = None
+        self.__set_type = self.get_set_type(set_type_id)
         self.__user = user
         self.__start_date = start_date if start_date else date.today()
         self.__start_time = start_time
-        self.set_count = set_count
+        self.__set_count = set_count
         self.count = count
         self.id = id
         self.canceled = bool(canceled)
         self.cancel_telegram_id = cancel_telegram_id
 
+    @classmethod
+    def get_set_type(cls, set_type_id: str) -> ReserveSetType:
+        """Get a reservation set type by identifier"""
+        if set_type_id == "hour":
+            return ReserveSetType.get(set_type_id, 60)
+
+        return ReserveSetType.get(set_type_id, cls.default_set_minutes)
+
+    @classmethod
+    def from_values(cls, id: Union[int, None], user: Optional[User],
+                    start_date: Optional[date], start_time: Optional[time],
+                    set_type_id: str, set_count: int, count: int = 1,
+                    canceled: Union[bool, None] = False,
+                    cancel_telegram_id: Union[int, None] = None):
+        """Create a reservation from stored values
+
+        It is a fast path for data adapters, the values are assigned
+        as is without defaults resolving.
+        """
+        reserve = cls.__new__(cls)
+        reserve.__times = None
+        reserve.__set_type = cls.get_set_type(set_type_id)
+        reserve.__user = user
+        reserve.__start_date = start_date
+        reserve.__start_time = start_time
+        reserve.__set_count = set_count
+        reserve.count = count
+        reserve.id = id
+        reserve.canceled = bool(canceled)
+        reserve.cancel_telegram_id = cancel_telegram_id
+
+        return reserve
+
     @property
     def is_complete(self) -> bool:
         return (self.__start_date
@@ -115,17 +186,35 @@ class Reserve:
     def user(self, value: Optional[User]):
         self.__user = value
 
+    def __get_times(self) -> tuple:
+        """Get cached start and end datetimes and epoch minutes
+
+        The values are computed once and reset by start_date, start_time,
+        set_type and set_count changes.
+        """
+        if self.__times:
+            return self.__times
+
+        start = end = start_minute = end_minute = None
+        if self.__start_date and self.__start_time:
+            start = datetime.combine(self.__start_date, self.__start_time)
+            start_minute = to_epoch_minutes(start)
+            if self.minutes:
+                end = start + timedelta(minutes=self.minutes)
+                end_minute = start_minute + self.minutes
+
+        self.__times = (start, end, start_minute, end_minute)
+        return self.__times
+
     @property
     def start(self) -> Optional[datetime]:
-        if not (self.__start_date and self.__start_time):
-            return None
-
-        return datetime.combine(self.__start_date, self.__start_time)
+        return self.__get_times()[0]
 
     @start.setter
     def start(self, value: Optional[datetime]):
         self.__start_date = value.date()
         self.__start_time = value.time()
+        self.__times = None
 
     @property
     def start_date(self) -> Optional[date]:
@@ -134,6 +223,7 @@ class Reserve:
     @start_date.setter
     def start_date(self, value: Optional[date]):
         self.__start_date = value
+        self.__times = None
 
     @property
     def start_time(self) -> Optional[time]:
@@ -142,39 +232,56 @@ class Reserve:
     @start_time.setter
     def start_time(self, value: Optional[time]):
         self.__start_time = value
+        self.__times = None
+
+    @property
+    def set_type(self) -> ReserveSetType:
+        return self.__set_type
+
+    @set_type.setter
+    def set_type(self, value: ReserveSetType):
+        self.__set_type = value
+        self.__times = None
+
+    @property
+    def set_count(self) -> int:
+        return self.__set_count
+
+    @set_count.setter
+    def set_count(self, value: int):
+        self.__set_count = value
+        self.__times = None
 
     @property
     def minutes(self) -> int:
-        return self.set_type.minutes * self.set_count
+        return self.__set_type.minutes * self.__set_count
 
     @property
     def end(self) -> Optional[datetime]:
-        result = None
-        if self.is_complete:
-            result = datetime.combine(self.__start_date, self.__start_time)
-            result += timedelta(minutes=self.minutes)
+        if not self.is_complete:
+            return None
 
-        return result
+        return self.__get_times()[1]
 
     @property
     def end_date(self) -> Optional[date]:
-        result = None
-        if self.is_complete:
-            result = datetime.combine(self.__start_date, self.__start_time)
-            result += timedelta(minutes=self.minutes)
-            result = result.date()
+        if not self.is_complete:
+            return None
 
-        return result
+        return self.__get_times()[1].date()
 
     @property
     def end_time(self) -> Optional[time]:
-        result = None
-        if self.__start_date and self.__start_time and self.minutes:
-            result = datetime.combine(self.__start_date, self.__start_time)
-            result += timedelta(minutes=self.minutes)
-            result = result.time()
+        end = self.__get_times()[1]
+        return end.time() if end else None
 
-        return result
+    @property
+    def start_minute(self) -> Optional[int]:
+        return self.__get_times()[2]
+
+    @property
+    def end_minute(self) -> Optional[int]:
+        return self.__get_times()[3]
 
     def check_concurrent(self, other) -> int:
         """Check reservation time conflict
@@ -182,14 +289,17 @@ class Reserve:
         Returns:
             Count of reservations is conflicted.
         """
-        if self.start == other.start:
+        start, end = self.start_minute, self.end_minute
+        other_start, other_end = other.start_minute, other.end_minute
+
+        if start == other_start:
             return self.count + other.count
 
-        if (self.start < other.start and self.end > other.start):
+        if (start < other_start and end > other_start):
             return self.count + other.count
 
-        if (self.start > other.start and
-                self.start < other.end):
+        if (start > other_start and
+                start < other_end):
             return self.count + other.count
 
         return self.count
@@ -1,6 +1,6 @@
 from typing import Optional, Union
 from datetime import date, time
-from .reserve import Reserve, ReserveSetType
+from .reserve import Reserve
 from .user import User
 
 
@@ -39,6 +39,10 @@ class Supboard(Reserve):
             of user canceled a reserevation
     """
 
+    __slots__ = ()
+
+    default_set_minutes: int = 30
+
     def __init__(self,
                  user: Optional[User] = None,
                  start_date: Optional[date] = None,
@@ -79,11 +83,6 @@ class Supboard(Reserve):
                          canceled=canceled,
                          cancel_telegram_id=cancel_telegram_id)
 
-        if set_type_id == "hour":
-            self.set_type = ReserveSetType(set_type_id, 60)
-        else:
-            self.set_type = ReserveSetType(set_type_id, 30)
-
     def __copy__(self):
         return Supboard(self.user, self.start_date, self.start_time,
                         self.set_type.set_id, self.set_count,
@@ -24,6 +24,9 @@ class User:
             A boolean flag of user admin role.
     """
 
+    __slots__ = ("firstname", "lastname", "middlename", "_displayname",
+                 "phone_number", "telegram_id", "user_id", "is_admin")
+
     firstname: str
     lastname: Optional[str]
     middlename: Optional[str]
@@ -1,6 +1,6 @@
 from typing import Optional, Union
 from datetime import date, time
-from .reserve import Reserve, ReserveSetType
+from .reserve import Reserve
 from .user import User
 
 
@@ -39,6 +39,10 @@ class Wake(Reserve):
             of user canceled a reserevation
     """
 
+    __slots__ = ("board", "hydro")
+
+    default_set_minutes: int = 10
+
     def __init__(self,
                  user: Optional[User] = None,
                  start_date: Optional[date] = None,
@@ -83,14 +87,25 @@ class Wake(Reserve):
                          canceled=canceled,
                          cancel_telegram_id=cancel_telegram_id)
 
-        if set_type_id == "hour":
-            self.set_type = ReserveSetType(set_type_id, 60)
-        else:
-            self.set_type = ReserveSetType(set_type_id, 10)
-
         self.board = board
         self.hydro = hydro
 
+    @classmethod
+    def from_values(cls, id: Union[int, None], user: Optional[User],
+                    start_date: Optional[date], start_time: Optional[time],
+                    set_type_id: str, set_count: int,
+                    board: Optional[int] = 0, hydro: Optional[int] = 0,
+                    canceled: Union[bool, None] = False,
+                    cancel_telegram_id: Union[int, None] = None):
+        """Create a wakeboard reservation from stored values"""
+        reserve = super().from_values(id, user, start_date, start_time,
+                                      set_type_id, set_count, 1,
+                                      canceled, cancel_telegram_id)
+        reserve.board = board
+        reserve.hydro = hydro
+
+        return reserve
+
     def __copy__(self):
         return Wake(self.user, self.start_date, self.start_time,
                     self.set_type.set_id, self.set_count, self.id,
@@ -0,0 +1,10 @@
+from .registry import MetricsRegistry, Counter, Gauge, Histogram
+from .middleware import MetricsMiddleware, instrument_bot
+from .server import MetricsServer
+from .watchdog import LoopWatchdog
+from .profiler import SamplingProfiler
+
+if __name__ == "__main__":
+    MetricsRegistry, Counter, Gauge, Histogram
+    MetricsMiddleware, instrument_bot, MetricsServer, LoopWatchdog
+    SamplingProfiler
@@ -0,0 +1,143 @@
+import sys
+from time import perf_counter
+
+from aiogram import types
+from aiogram.dispatcher.handler import current_handler
+from aiogram.dispatcher.middlewares import BaseMiddleware
+from .registry import MetricsRegistry
+
+
+def get_handler_name(handler) -> str:
+    """Get a processor qualified name of a handler"""
+    owner = getattr(handler, "__self__", None)
+    if owner is not None:
+        return f"{type(owner).__name__}.{handler.__name__}"
+
+    return getattr(handler, "__qualname__", repr(handler))
+
+
+def get_callback_action(data: str) -> str:
+    """Get a low-cardinality action label of a callback data
+
+    Numbers and identifiers are collapsed: "12" is "#",
+    "cancel-12" is "cancel".
+    """
+    if not data:
+        return ""
+
+    action = data.split("-")[0]
+    return "#" if action.isdigit() else action
+
+
+def get_message_action(message: types.Message) -> str:
+    """Get a command label of a message or "text" for a plain text"""
+    text = message.text or ""
+    if text.startswith("/"):
+        return text.split(" ")[0].split("@")[0]
+
+    return "text"
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Per-handler latency, error and in-flight metrics
+
+    A handler label is a processor and its method name (every processor
+    method serves its own state), an action label is a collapsed callback
+    data or a message command. The middleware costs nothing unless it is
+    set up in a dispatcher.
+
+    Attributes:
+        registry:
+            A metrics registry the metrics are stored in.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        super().__init__()
+        self.registry = registry
+
+        labels = ("update", "handler", "action")
+        self.latency = registry.histogram(
+            "wakebot_handler_seconds",
+            "Update handler latency in seconds", labels)
+        self.errors = registry.counter(
+            "wakebot_handler_errors_total",
+            "Update handler unhandled exceptions", labels)
+        self.in_flight = registry.gauge(
+            "wakebot_handlers_in_flight",
+            "Update handlers are being executed", ("update", "handler"))
+        self.unhandled = registry.counter(
+            "wakebot_updates_unhandled_total",
+            "Updates without a matched handler", ("update",))
+
+    def start(self, update: str, action: str, data: dict):
+        labels = {"update": update,
+                  "handler": get_handler_name(current_handler.get()),
+                  "action": action}
+        data["metrics_labels"] = labels
+        data["metrics_start"] = perf_counter()
+        self.in_flight.inc(update=update, handler=labels["handler"])
+
+    def finish(self, update: str, data: dict):
+        labels = data.get("metrics_labels")
+        if not labels:
+            self.unhandled.inc(update=update)
+            return
+
+        self.latency.observe(perf_counter() - data["metrics_start"],
+                             **labels)
+        self.in_flight.dec(**labels)
+        # Post-process is triggered in a finally block of the dispatcher,
+        # so a handler exception is still being propagated here.
+        if sys.exc_info()[1] is not None:
+            self.errors.inc(**labels)
+
+    async def on_process_message(self, message: types.Message, data: dict):
+        self.start("message", get_message_action(message), data)
+
+    async def on_post_process_message(self, message: types.Message,
+                                      results: list, data: dict):
+        self.finish("message", data)
+
+    async def on_process_callback_query(self,
+                                        callback_query: types.CallbackQuery,
+                                        data: dict):
+        self.start("callback_query",
+                   get_callback_action(callback_query.data), data)
+
+    async def on_post_process_callback_query(
+            self, callback_query: types.CallbackQuery, results: list,
+            data: dict):
+        self.finish("callback_query", data)
+
+
+def instrument_bot(bot, registry: MetricsRegistry):
+    """Measure Bot API call durations and errors of a bot
+
+    Args:
+        bot:
+            An aiogram.Bot instance, its request method is wrapped.
+        registry:
+            A metrics registry the metrics are stored in.
+
+    Returns:
+        The instrumented bot
+    """
+    latency = registry.histogram("wakebot_bot_api_seconds",
+                                 "Bot API call duration in seconds",
+                                 ("method",))
+    errors = registry.counter("wakebot_bot_api_errors_total",
+                              "Bot API call errors", ("method",))
+    request = bot.request
+
+    async def timed_request(method, data=None, files=None, **kwargs):
+        start = perf_counter()
+        try:
+            return await request(method, data, files, **kwargs)
+        except Exception:
+            errors.inc(method=method)
+            raise
+        finally:
+            latency.observe(perf_counter() - start, method=method)
+
+    bot.request = timed_request
+    return bot
@@ -0,0 +1,225 @@
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from aiogram import types
+from aiogram.dispatcher.middlewares import BaseMiddleware
+from .watchdog import PROCESSOR_CLASSES
+
+
+def get_frame_name(frame) -> str:
+    code = frame.f_code
+    owner = frame.f_locals.get("self")
+    if owner is not None:
+        return f"{type(owner).__name__}.{code.co_name}"
+
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}.{code.co_name}"
+
+
+def collapse_stack(frame) -> tuple:
+    """Get a handler name and a collapsed stack of a frame stack
+
+    A stack starts at the outermost processor frame, frames
+    outside of a handler (an event loop and a dispatcher) are dropped.
+
+    Returns:
+        A (handler, "frame;frame;...") tuple or (None, None)
+        if there is no processor frame in the stack
+    """
+    names = []
+    handler_depth = None
+    while frame:
+        names.append(get_frame_name(frame))
+        if isinstance(frame.f_locals.get("self"), PROCESSOR_CLASSES):
+            handler_depth = len(names)
+        frame = frame.f_back
+
+    if handler_depth is None:
+        return None, None
+
+    names = names[:handler_depth]
+    names.reverse()
+    return names[0], ";".join(names)
+
+
+class SamplingProfiler(BaseMiddleware):
+    """Opt-in sampling stack profiler of update handlers
+
+    Every sample_rate-th update is profiled: while a profiled update
+    is handled, a sampler thread takes stacks of the event loop thread
+    every interval. Samples are aggregated per a processor handler
+    in the collapsed stack format (a flamegraph.pl/speedscope input),
+    so they can be dumped at any time without a restart.
+
+    Attributes:
+        sample_rate:
+            An integer N to profile one in every N updates.
+        interval:
+            A float sampling interval in seconds.
+        path:
+            A directory the profiles are dumped to.
+        stacks:
+            A dictionary of collapsed stack counters by a handler name.
+        updates:
+            An integer count of processed updates.
+        sampled:
+            An integer count of profiled updates.
+    """
+
+    def __init__(self, sample_rate: int = 100, interval: float = 0.005,
+                 path: str = "profiles"):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.path = path
+        self.stacks = {}
+        self.updates = 0
+        self.sampled = 0
+
+        self.__lock = threading.Lock()
+        self.__active = 0
+        self.__thread = None
+        self.__thread_id = None
+        self.__sampling = threading.Event()
+        self.__stopped = threading.Event()
+
+    def start(self, data: dict):
+        self.updates += 1
+        if self.updates % self.sample_rate:
+            return
+
+        self.sampled += 1
+        data["profiler_sampled"] = True
+        self.__active += 1
+        self.__sampling.set()
+
+        if not self.__thread:
+            self.__thread_id = threading.get_ident()
+            self.__stopped.clear()
+            self.__thread = threading.Thread(target=self.run,
+                                             name="sampling-profiler",
+                                             daemon=True)
+            self.__thread.start()
+
+    def finish(self, data: dict):
+        if data.get("profiler_sampled"):
+            self.__active -= 1
+            if not self.__active:
+                self.__sampling.clear()
+
+    def run(self):
+        while True:
+            self.__sampling.wait()
+            if self.__stopped.wait(self.interval):
+                return
+            if self.__sampling.is_set():
+                self.sample()
+
+    def sample(self):
+        """Take a stack sample of the event loop thread"""
+        frame = sys._current_frames().get(self.__thread_id)
+        if frame is None:
+            return
+
+        handler, stack = collapse_stack(frame)
+        del frame
+        if handler:
+            with self.__lock:
+                self.stacks.setdefault(handler, Counter())[stack] += 1
+
+    def stop(self):
+        """Stop a sampler thread"""
+        self.__stopped.set()
+        self.__sampling.set()
+        if self.__thread:
+            self.__thread.join()
+            self.__thread = None
+        self.__sampling.clear()
+
+    def get_summary(self) -> dict:
+        """Get a count of samples by a handler"""
+        with self.__lock:
+            return {handler: sum(stacks.values())
+                    for handler, stacks in self.stacks.items()}
+
+    def dump(self, filename: Optional[str] = None) -> str:
+        """Write collected samples to a collapsed stack file
+
+        Args:
+            filename:
+                Optional. A file name in the profiles directory,
+                a timestamped name is used by default.
+
+        Returns:
+            A written file path
+        """
+        os.makedirs(self.path, exist_ok=True)
+        filename = filename or time.strftime("profile-%Y%m%d-%H%M%S.txt")
+        path = os.path.join(self.path, filename)
+
+        with self.__lock:
+            lines = [f"{stack} {count}\n"
+                     for handler in sorted(self.stacks)
+                     for stack, count in self.stacks[handler].most_common()]
+
+        with open(path, "w") as output:
+            output.writelines(lines)
+
+        return path
+
+    def reset(self):
+        with self.__lock:
+            self.stacks = {}
+
+    def install_signal(self, loop, signum: int = signal.SIGUSR2):
+        """Dump a profile on a signal (POSIX only)"""
+        loop.add_signal_handler(signum, self.dump)
+
+    def register_command(self, dispatcher, admin_telegram_ids: list,
+                         command: str = "profile"):
+        """Register an admin command to dump a profile
+
+        "/profile" dumps samples and sends the file back,
+        "/profile reset" drops collected samples.
+        """
+        async def cmd_profile(message: types.Message):
+            if message.get_args() == "reset":
+                self.reset()
+                await message.answer("Profile is reset")
+                return
+
+            summary = "\n".join(
+                f"{handler}: {count}" for handler, count in sorted(
+                    self.get_summary().items(),
+                    key=lambda item: item[1], reverse=True))
+            await message.answer(
+                f"Updates: {self.updates}, profiled: {self.sampled}\n"
+                + summary)
+            await message.answer_document(types.InputFile(self.dump()))
+
+        dispatcher.register_message_handler(
+            cmd_profile,
+            lambda message: message.from_user.id in admin_telegram_ids,
+            commands=[command])
+
+    async def on_process_message(self, message: types.Message, data: dict):
+        self.start(data)
+
+    async def on_post_process_message(self, message: types.Message,
+                                      results: list, data: dict):
+        self.finish(data)
+
+    async def on_process_callback_query(self,
+                                        callback_query: types.CallbackQuery,
+                                        data: dict):
+        self.start(data)
+
+    async def on_post_process_callback_query(
+            self, callback_query: types.CallbackQuery, results: list,
+            data: dict):
+        self.finish(data)
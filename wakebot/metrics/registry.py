@@ -0,0 +1,197 @@
+from bisect import bisect_left
+from typing import Optional
+
+
+def format_value(value: float) -> str:
+    """Format a sample value in the Prometheus text format"""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value) -> str:
+    return (str(value).replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+class Metric:
+    """A base labeled metric class
+
+    Attributes:
+        name:
+            A metric name.
+        documentation:
+            A metric description (a HELP line).
+        labelnames:
+            A tuple of label names.
+        values:
+            A dictionary of sample values by a label values tuple.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def get_key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def format_labels(self, key: tuple, extra: Optional[dict] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs += extra.items()
+        if not pairs:
+            return ""
+
+        return "{" + ",".join(f'{name}="{escape_label(value)}"'
+                              for name, value in pairs) + "}"
+
+    def get(self, **labels) -> float:
+        """Get a current value of a labeled sample"""
+        return self.values.get(self.get_key(labels), 0)
+
+    def collect(self) -> iter:
+        """Get a text exposition lines of the metric"""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type}"
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}{self.format_labels(key)} {format_value(value)}"
+
+
+class Counter(Metric):
+    """A monotonically increasing labeled counter"""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.get_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """A labeled value which can go up and down"""
+
+    type = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.get_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        self.values[self.get_key(labels)] = value
+
+
+class Histogram(Metric):
+    """A labeled histogram of observed values
+
+    Every sample value is a [bucket counters, sum, count] list,
+    bucket counters are not cumulative until collected.
+
+    Attributes:
+        buckets:
+            A sorted tuple of bucket upper bounds.
+    """
+
+    type = "histogram"
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                       1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: tuple = (), buckets: Optional[tuple] = None):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets or self.default_buckets))
+
+    def observe(self, value: float, **labels):
+        key = self.get_key(labels)
+        sample = self.values.get(key)
+        if sample is None:
+            sample = self.values[key] = [[0] * (len(self.buckets) + 1), 0, 0]
+
+        sample[0][bisect_left(self.buckets, value)] += 1
+        sample[1] += value
+        sample[2] += 1
+
+    def get(self, **labels) -> float:
+        """Get a count of observed values of a labeled sample"""
+        sample = self.values.get(self.get_key(labels))
+        return sample[2] if sample else 0
+
+    def get_sum(self, **labels) -> float:
+        """Get a sum of observed values of a labeled sample"""
+        sample = self.values.get(self.get_key(labels))
+        return sample[1] if sample else 0
+
+    def collect(self) -> iter:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type}"
+        for key, (counters, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, counter in zip(self.buckets + (float("inf"),),
+                                      counters):
+                cumulative += counter
+                labels = self.format_labels(key, {"le": format_value(bound)})
+                yield f"{self.name}_bucket{labels} {cumulative}"
+
+            labels = self.format_labels(key)
+            yield f"{self.name}_sum{labels} {format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """A collection of metrics exposed together
+
+    Metrics are created on a first request and shared by name,
+    so independent components can register the same metric.
+
+    Attributes:
+        metrics:
+            A dictionary of metrics by a name.
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self.metrics = {}
+
+    def get_metric(self, metric_class, name: str, documentation: str,
+                   labelnames: tuple = (), **kwargs) -> Metric:
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = metric_class(
+                name, documentation, labelnames, **kwargs)
+        elif not isinstance(metric, metric_class):
+            raise ValueError(f"Metric {name} is already registered"
+                             f" as a {metric.type}")
+
+        return metric
+
+    def counter(self, name: str, documentation: str,
+                labelnames: tuple = ()) -> Counter:
+        return self.get_metric(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str,
+              labelnames: tuple = ()) -> Gauge:
+        return self.get_metric(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str,
+                  labelnames: tuple = (),
+                  buckets: Optional[tuple] = None) -> Histogram:
+        return self.get_metric(Histogram, name, documentation, labelnames,
+                               buckets=buckets)
+
+    def render(self) -> str:
+        """Get a Prometheus text exposition of all metrics"""
+        lines = []
+        for name in sorted(self.metrics):
+            lines.extend(self.metrics[name].collect())
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,47 @@
+from aiohttp import web
+from .registry import MetricsRegistry
+
+
+class MetricsServer:
+    """Prometheus metrics HTTP endpoint served in the bot event loop
+
+    Attributes:
+        registry:
+            A metrics registry to expose.
+        host:
+            A listened host.
+        port:
+            A listened port (0 to pick a free one on start).
+        path:
+            An endpoint path.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "0.0.0.0",
+                 port: int = 9100, path: str = "/metrics"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.path = path
+        self.__runner = None
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.registry.render().encode(),
+                            headers={"Content-Type":
+                                     self.registry.content_type})
+
+    async def start(self):
+        """Start listening, a bound port is stored in the port attribute"""
+        app = web.Application()
+        app.router.add_get(self.path, self.handle_metrics)
+
+        self.__runner = web.AppRunner(app)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, self.host, self.port)
+        await site.start()
+
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.__runner:
+            await self.__runner.cleanup()
+            self.__runner = None
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+from collections import deque
+from time import perf_counter
+from typing import Optional
+
+from ..processors.common import StatedProcessor
+from ..processors.default import DefaultProcessor
+from .registry import MetricsRegistry
+
+log = logging.getLogger("wakebot.watchdog")
+
+PROCESSOR_CLASSES = (StatedProcessor, DefaultProcessor)
+
+
+def get_handler(frame) -> str:
+    """Get an outermost processor method name of a frame stack
+
+    Returns:
+        A "ProcessorClass.method" string or an empty string
+    """
+    handler = ""
+    while frame:
+        owner = frame.f_locals.get("self")
+        if isinstance(owner, PROCESSOR_CLASSES):
+            handler = f"{type(owner).__name__}.{frame.f_code.co_name}"
+        frame = frame.f_back
+
+    return handler
+
+
+class LoopStall:
+    """A detected event loop stall
+
+    Attributes:
+        lag:
+            A float time in seconds the loop was blocked for
+            when the stall was detected.
+        handler:
+            A blocking processor handler name (empty if unknown).
+        stack:
+            A list of formatted stack lines of the blocking code.
+    """
+
+    __slots__ = ("lag", "handler", "stack")
+
+    def __init__(self, lag: float, handler: str, stack: list):
+        self.lag = lag
+        self.handler = handler
+        self.stack = stack
+
+    def __repr__(self):
+        return (f"LoopStall({self.handler or '?'},"
+                f" {self.lag * 1000:.1f} ms)")
+
+
+class LoopWatchdog:
+    """Event loop stall detector
+
+    A heartbeat task measures an event loop lag (a sleep overshoot)
+    continuously. A watcher thread captures a stack of the loop thread
+    once the heartbeat is late for more than a threshold, so the blocking
+    code is caught while it is still running.
+
+    Attributes:
+        interval:
+            A float heartbeat interval in seconds.
+        threshold:
+            A float loop lag in seconds a stall is reported above.
+        stalls:
+            A deque of recent detected stalls.
+        stack_limit:
+            An integer maximum count of captured stack frames.
+    """
+
+    stack_limit = 30
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None,
+                 interval: float = 0.05, threshold: float = 0.25,
+                 size: int = 100):
+        """Event loop stall detector
+
+        Args:
+            registry:
+                Optional. A metrics registry lag histograms and stall
+                counters are stored in.
+            interval:
+                Optional. A float heartbeat interval in seconds.
+            threshold:
+                Optional. A float stall threshold in seconds.
+            size:
+                Optional. A maximum count of kept stalls.
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = deque(maxlen=size)
+
+        registry = registry or MetricsRegistry()
+        self.lag = registry.histogram(
+            "wakebot_loop_lag_seconds", "Event loop lag in seconds",
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                     1.0, 2.5, 5.0))
+        self.stall_count = registry.counter(
+            "wakebot_loop_stalls_total", "Event loop stalls by a handler",
+            ("handler",))
+
+        self.__heartbeat = perf_counter()
+        self.__beats = 0
+        self.__task = None
+        self.__thread = None
+        self.__stopped = threading.Event()
+
+    async def start(self):
+        """Start a heartbeat task and a watcher thread in a running loop"""
+        self.__stopped.clear()
+        self.__heartbeat = perf_counter()
+        self.__task = asyncio.ensure_future(self.beat())
+        self.__thread = threading.Thread(
+            target=self.watch, args=(threading.get_ident(),),
+            name="loop-watchdog", daemon=True)
+        self.__thread.start()
+
+    async def stop(self):
+        self.__stopped.set()
+        if self.__task:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+        if self.__thread:
+            self.__thread.join()
+            self.__thread = None
+
+    async def beat(self):
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(self.interval)
+            self.__heartbeat = perf_counter()
+            self.__beats += 1
+            self.lag.observe(max(self.__heartbeat - start - self.interval,
+                                 0.0))
+
+    def watch(self, thread_id: int):
+        reported = None
+        while not self.__stopped.wait(self.interval):
+            beats = self.__beats
+            lag = perf_counter() - self.__heartbeat - self.interval
+            if lag > self.threshold and beats != reported:
+                reported = beats
+                self.report(thread_id, lag)
+
+    def report(self, thread_id: int, lag: float):
+        """Capture a stack of a blocked loop thread and register a stall"""
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            return
+
+        stack = traceback.format_stack(frame, self.stack_limit)
+        stall = LoopStall(lag, get_handler(frame), stack)
+        del frame
+
+        self.stalls.append(stall)
+        self.stall_count.inc(handler=stall.handler)
+        log.warning(f"Event loop is blocked for {lag * 1000:.0f} ms"
+                    f" in {stall.handler or '?'}:\n" + "".join(stack))
@@ -109,9 +109,14 @@ class RuReserve(RuGeneral):
     list_text = f"Список {books_text}"
     list_button = list_text
     list_button_callback = list_text
+    prev_button = "◀️ Предыдущие"
+    next_button = "Следующие ▶️"
 
     details_button_callback = "Информация по бронированию"
 
+    load_header = "*Загрузка по дням:*"
+    load_text = "{day}: пик {peak} из {max_count}, пересечений {conflicts}"
+
     cancel_button = f"❌ Отменить {book_text.lower()}"
     cancel_button_callback = f"{book_text} отменено"
     cancel_notify_header = f"❌ *Отменено {book_text.lower()}*"
@@ -152,6 +157,37 @@ class RuReserve(RuGeneral):
     apply_header = ""
     apply_footer = ""
 
+    reminder_header = f"{icon_hour} *Напоминание*"
+    reminder_message = "{service} начинается через {minutes} минут"
+
+    waitlist_text = "Лист ожидания"
+    waitlist_button = f"⏳ Встать в {waitlist_text.lower()}"
+    waitlist_button_callback = f"{waitlist_text}: Вы в очереди"
+    waitlist_header = ("⏳ *Вы в листе ожидания*"
+                       "\nМы сообщим, если время освободится.")
+    claim_header = "🔔 *Время освободилось!*"
+    claim_message = "Подтвердите бронирование в течение {minutes} минут"
+    claim_expired_callback = "Предложение больше не действует"
+
+    icon_apply = "✅"
+    icon_repeat = "🔁"
+    repeat_text = "Повторять по дням недели"
+    repeat_button = f"{icon_repeat} {repeat_text}"
+    repeat_button_callback = "Введите дни недели и дату окончания"
+    repeat_weekdays = ("пн", "вт", "ср", "чт", "пт", "сб", "вс")
+    repeat_message = (
+        "*Введите дни недели и дату окончания повтора:*"
+        "\nпн вт ср чт пт сб вс"
+        "\n\nНапример: вт чт 30.06.2021")
+    repeat_error_message = (
+        f"{icon_stop} *Правило повтора указано в неверном формате*"
+        "\n\nНапример: вт чт 30.06.2021"
+        "\nДата окончания не раньше даты бронирования,"
+        " не более 100 бронирований.")
+    repeat_header = f"{icon_repeat} *Повторяющееся бронирование*"
+    repeat_footer = ("Забронировано: {appended}"
+                     f"\n{icon_stop} Нет мест: {{conflicts}}")
+
 
 class RuWake(RuReserve):
     hello_message = ("*Вейкборд - великолепный выбор!*"
@@ -1,6 +1,7 @@
+import asyncio
 import re
-from typing import Union
-from datetime import date, time, timedelta
+from typing import Iterable, Optional, Union
+from datetime import date, datetime, time, timedelta
 
 from aiogram.dispatcher import Dispatcher
 from aiogram.types import Message, CallbackQuery
@@ -12,7 +13,9 @@ from wakebot.adapters.state import StateManager
 from wakebot.processors.common import StatedProcessor
 from ..entities.user import User
 from ..entities.reserve import Reserve, ReserveSetType
+from ..entities.recurrence import Recurrence
 from ..adapters.data import ReserveDataAdapter, UserDataAdapter
+from ..adapters.timeline import ReserveTimeline
 
 
 class ReserveProcessor(StatedProcessor):
@@ -29,6 +32,10 @@ class ReserveProcessor(StatedProcessor):
             A reservation storage data adapter
         user_data_adapter:
             An user storage data adapter
+        reminder_scheduler:
+            Optional. A scheduler of upcoming reservation reminders.
+        waitlist:
+            Optional. A waitlist of drafts conflicted with reservations.
         book_handlers:
             A dictionary of book menu handlers.
             A key matches InlineKeyboardButton.data value of book menu.
@@ -38,7 +45,13 @@ class ReserveProcessor(StatedProcessor):
     book_handlers: dict
     reserve_set_types: dict
     user_data_adapter: UserDataAdapter
+    reminder_scheduler = None
+    waitlist = None
     minute_step: int = 5
+    first_hour: int = 9
+    work_hours: int = 15
+    list_page_size: int = 20
+    date_count: int = 6
 
     def __init__(self,
                  dispatcher: Dispatcher,
@@ -46,7 +59,8 @@ class ReserveProcessor(StatedProcessor):
                  strings: any,
                  data_adapter: Union[ReserveDataAdapter, None] = None,
                  user_data_adapter: Union[UserDataAdapter, None] = None,
-                 state_type: Union[str, int, None] = "reserve"):
+                 state_type: Union[str, int, None] = "reserve",
+                 lazy: bool = False):
         """Initialize a class instance
 
         Args:
@@ -63,6 +77,9 @@ class ReserveProcessor(StatedProcessor):
             state_type:
                 Optional. A default state type.
                 Default value: "reserve"
+            lazy:
+                Optional. Do not load administrators on initialization,
+                load_admins is called when a storage is ready.
         """
         super().__init__(dispatcher, state_manager, state_type,
                          strings.parse_mode)
@@ -72,13 +89,11 @@ class ReserveProcessor(StatedProcessor):
         self.max_count = 1
 
         self.admin_telegram_ids = []
-        if user_data_adapter:
-            self.admin_telegram_ids = [user.telegram_id
-                                       for user
-                                       in user_data_adapter.get_admins()]
+        if not lazy:
+            self.load_admins()
         self.reserve_set_types = {}
-        self.reserve_set_types["set"] = ReserveSetType("set", 5)
-        self.reserve_set_types["hour"] = ReserveSetType("hour", 60)
+        self.reserve_set_types["set"] = ReserveSetType.get("set", 5)
+        self.reserve_set_types["hour"] = ReserveSetType.get("hour", 60)
 
         self.register_callback_query_handler(self.callback_main, "main")
         self.register_callback_query_handler(self.callback_list, "list")
@@ -92,6 +107,12 @@ class ReserveProcessor(StatedProcessor):
         self.register_callback_query_handler(self.callback_set_hour,
                                              "set_hour")
         self.register_message_handler(self.message_phone, state="phone")
+        self.register_message_handler(self.message_repeat, state="repeat")
+        # An offer message has no state, it is matched by callback data
+        self.dispatcher.register_callback_query_handler(
+            self.callback_claim,
+            lambda callback_query: (callback_query.data or "").startswith(
+                f"claim-{self.state_type}-"))
 
         self.book_handlers = {}
         self.book_handlers["back"] = self.book_back
@@ -102,6 +123,24 @@ class ReserveProcessor(StatedProcessor):
         self.book_handlers["set"] = self.book_set
         self.book_handlers["set_hour"] = self.book_set_hour
         self.book_handlers["apply"] = self.book_apply
+        self.book_handlers["waitlist"] = self.book_waitlist
+        self.book_handlers["repeat"] = self.book_repeat
+
+    def load_admins(self) -> list:
+        """Load administrator telegram identifiers
+
+        The list is updated in place, so its references (e.g. command
+        filters) see the loaded identifiers.
+
+        Returns:
+            A list of administrator telegram identifiers
+        """
+        if self.user_data_adapter:
+            self.admin_telegram_ids[:] = [
+                user.telegram_id
+                for user in self.user_data_adapter.get_admins()]
+
+        return self.admin_telegram_ids
 
     async def message_phone(self, message: Message):
         """Phone number reply message handler"""
@@ -135,23 +174,69 @@ class ReserveProcessor(StatedProcessor):
             state=state,
             data=reserve)
 
+    async def message_repeat(self, message: Message):
+        """Recurrence rule reply message handler"""
+        reserve: Reserve = self.state_manager.data
+        recurrence = self.parse_recurrence(message.text, reserve.start_date)
+        self.state_manager.finish()
+
+        if message.reply_to_message:
+            await message.reply_to_message.delete()
+        await message.delete()
+
+        if not recurrence:
+            text, reply_markup, state, answer = self.create_book_message()
+            answer = await message.answer(text, reply_markup=reply_markup,
+                                          parse_mode=self.parse_mode)
+            await message.answer(text=self.strings.repeat_error_message,
+                                 reply_markup=ReplyKeyboardRemove(),
+                                 parse_mode=self.parse_mode)
+
+            self.update_state(answer, message_state=True)
+            self.state_manager.set_state(state_type=self.state_type,
+                                         state=state, data=reserve)
+            return
+
+        # All occurrences are checked by one query and inserted
+        # in one transaction, the reply message is a key of the batch
+        appended, conflicts = self.data_adapter.append_many(
+            recurrence.expand(reserve), self.max_count,
+            idempotency_key=f"{message.chat.id}-{message.message_id}")
+
+        if (not reserve.user.user_id) and self.user_data_adapter:
+            reserve.user = self.user_data_adapter.append_data(reserve.user)
+        for occurrence in appended:
+            self.schedule_reminder(occurrence)
+
+        text = self.create_repeat_text(reserve, appended, conflicts)
+        await message.answer(text, reply_markup=ReplyKeyboardRemove(),
+                             parse_mode=self.parse_mode)
+        if appended:
+            await self.notify_admins(message, text)
+
     async def book_apply(self, callback_query: CallbackQuery):
         """Proceed Apply button in Book menu"""
         text = reply_markup = state = answer = None
 
         reserve: Reserve = self.state_manager.data
-        concurrent_count = self.data_adapter.get_concurrent_count(reserve)
-        if concurrent_count + reserve.count > self.max_count:
+        if not self.is_available(reserve):
             text, reply_markup, state, _ = self.create_book_message()
             answer = self.strings.apply_error_callback
             await self.callback_query_action(
                 callback_query, text, reply_markup, state, answer)
             return
 
-        self.state_manager.set_data(self.data_adapter.append_data(reserve))
+        # A redelivered Apply callback belongs to the same book message,
+        # so the message is a key of the reservation insert
+        message = callback_query.message
+        idempotency_key = f"{message.chat.id}-{message.message_id}"
+        reserve = self.data_adapter.append_data(
+            reserve, idempotency_key=idempotency_key)
+        self.state_manager.set_data(reserve)
 
         if (not reserve.user.user_id) and self.user_data_adapter:
             reserve.user = self.user_data_adapter.append_data(reserve.user)
+        self.schedule_reminder(reserve)
 
         book_text = self.create_book_text(reserve, check=False,
                                           show_contact=True)
@@ -166,18 +251,57 @@ class ReserveProcessor(StatedProcessor):
                                                reply_markup=reply_markup,
                                                parse_mode=self.parse_mode)
         await callback_query.answer(answer)
+        await self.notify_admins(callback_query, book_text)
 
-        for telegram_id in self.admin_telegram_ids:
-            if not telegram_id == callback_query.from_user.id:
-                try:
-                    await callback_query.bot.send_message(
-                        telegram_id, book_text,
-                        reply_markup=None,
-                        parse_mode=self.parse_mode)
-                except ChatNotFound:
-                    await self.send_to_logger(f"ChatNotFound: {telegram_id}")
-                except BotBlocked:
-                    await self.send_to_logger(f"BotBlocked: {telegram_id}")
+    async def book_waitlist(self, callback_query: CallbackQuery):
+        """Proceed Waitlist button in Book menu"""
+        reserve: Reserve = self.state_manager.data
+        self.waitlist.add(self.state_type, reserve,
+                          callback_query.from_user.id)
+        self.state_manager.finish()
+
+        book_text = self.create_book_text(reserve, check=False,
+                                          show_contact=True)
+        await callback_query.message.edit_text(
+            f"{self.strings.waitlist_header}\n{book_text}",
+            reply_markup=None, parse_mode=self.parse_mode)
+        await callback_query.answer(self.strings.waitlist_button_callback)
+
+    async def callback_claim(self, callback_query: CallbackQuery):
+        """Waitlist offer CallbackQuery handler"""
+        entry_id = int(callback_query.data.rsplit("-", 1)[1])
+        entry = self.waitlist.get_offer(entry_id) if self.waitlist else None
+        if not entry:
+            await callback_query.message.edit_reply_markup(None)
+            await callback_query.answer(self.strings.claim_expired_callback)
+            return
+
+        reserve = entry.reserve
+        if not self.is_available(reserve):
+            # The entry keeps its place until a next cancellation
+            self.waitlist.withdraw(entry.id)
+            await callback_query.message.edit_reply_markup(None)
+            await callback_query.answer(self.strings.apply_error_callback)
+            return
+
+        self.waitlist.claim(entry.id)
+        message = callback_query.message
+        reserve = self.data_adapter.append_data(
+            reserve, idempotency_key=f"{message.chat.id}-{message.message_id}")
+        if (not reserve.user.user_id) and self.user_data_adapter:
+            reserve.user = self.user_data_adapter.append_data(reserve.user)
+        self.schedule_reminder(reserve)
+
+        book_text = self.create_book_text(reserve, check=False,
+                                          show_contact=True)
+        await message.edit_text(
+            f"{self.strings.apply_header}\n"
+            f"{book_text}{self.strings.apply_footer}",
+            reply_markup=None, parse_mode=self.parse_mode)
+        await callback_query.answer(self.strings.apply_button_callback)
+        await self.notify_admins(callback_query, book_text)
+        # A freed capacity may be left for a smaller draft
+        await self.promote_waitlist(reserve)
 
     async def callback_main(self, callback_query: CallbackQuery):
         """Main menu CallbackQuery handler"""
@@ -365,6 +489,11 @@ class ReserveProcessor(StatedProcessor):
         if callback_query.data == "back":
             text, reply_markup, state, answer = self.create_main_message(True)
 
+        elif callback_query.data in ("next", "prev"):
+            admin_menu = callback_query.from_user.id in self.admin_telegram_ids
+            text, reply_markup, state, answer = self.create_list_message(
+                admin_menu, callback_query.data)
+
         else:
             text, reply_markup, state, answer = self.create_detail_message(
                                                 int(callback_query.data))
@@ -382,12 +511,14 @@ class ReserveProcessor(StatedProcessor):
         text = reply_markup = state = None
 
         if callback_query.data == "back":
-            text, reply_markup, state, answer = self.create_list_message(True)
+            text, reply_markup, state, answer = self.create_list_message(
+                True, "current")
 
         elif callback_query.data.startswith("cancel-"):
             reserve_id = int(callback_query.data[7:])
             await self.cancel_reserve(callback_query, reserve_id)
-            text, reply_markup, state, answer = self.create_list_message(True)
+            text, reply_markup, state, answer = self.create_list_message(
+                True, "current")
             answer = self.strings.cancel_button_callback
 
         elif callback_query.data.startswith("notify-"):
@@ -400,7 +531,8 @@ class ReserveProcessor(StatedProcessor):
                                                   notify_text,
                                                   parse_mode=self.parse_mode)
 
-            text, reply_markup, state, answer = self.create_list_message(True)
+            text, reply_markup, state, answer = self.create_list_message(
+                True, "current")
             answer = self.strings.notify_button_callback
 
         await callback_query.message.edit_text(text,
@@ -459,6 +591,28 @@ class ReserveProcessor(StatedProcessor):
         self.state_manager.set_state(state_type=self.state_type, state=state,
                                      data=reserve)
 
+    async def book_repeat(self, callback_query: CallbackQuery):
+        """Proceed Repeat button in Book menu"""
+        if callback_query.from_user.id not in self.admin_telegram_ids:
+            await callback_query.answer()
+            return
+
+        reserve = self.state_manager.data
+
+        await callback_query.message.delete()
+        self.state_manager.finish()
+
+        text, reply_markup, state, answer = self.create_repeat_message()
+
+        await self.dispatcher.bot.send_message(callback_query.message.chat.id,
+                                               reply_markup=reply_markup,
+                                               text=text,
+                                               parse_mode=self.parse_mode)
+        self.state_manager.get_state(callback_query.message.chat.id,
+                                     reserve.user.telegram_id)
+        self.state_manager.set_state(state_type=self.state_type, state=state,
+                                     data=reserve)
+
     async def callback_query_action(self,
                                     callback_query: CallbackQuery,
                                     text: str,
@@ -503,6 +657,8 @@ class ReserveProcessor(StatedProcessor):
         reserve.canceled = True
         reserve.cancel_telegram_id = telegram_id
         self.data_adapter.update_data(reserve)
+        if self.reminder_scheduler:
+            self.reminder_scheduler.cancel(self.get_reminder_key(reserve))
 
         notify_text = self.strings.cancel_notify_header
         if self.user_data_adapter:
@@ -512,21 +668,104 @@ class ReserveProcessor(StatedProcessor):
 
         notify_text += f"\n\n{self.create_book_text(reserve)}"
 
+        await self.notify_admins(callback_query, notify_text)
+        await callback_query.bot.send_message(
+            reserve.user.telegram_id, notify_text,
+            reply_markup=None,
+            parse_mode=self.parse_mode)
+        await self.promote_waitlist(reserve)
+
+    async def notify_admins(self,
+                            callback_query: Union[CallbackQuery, Message],
+                            text: str):
+        """Send a text to administrators except a callback query sender"""
         for telegram_id in self.admin_telegram_ids:
             if not telegram_id == callback_query.from_user.id:
                 try:
                     await callback_query.bot.send_message(
-                        telegram_id, notify_text,
+                        telegram_id, text,
                         reply_markup=None,
                         parse_mode=self.parse_mode)
                 except ChatNotFound:
                     await self.send_to_logger(f"ChatNotFound: {telegram_id}")
                 except BotBlocked:
                     await self.send_to_logger(f"BotBlocked: {telegram_id}")
-        await callback_query.bot.send_message(
-            reserve.user.telegram_id, notify_text,
-            reply_markup=None,
-            parse_mode=self.parse_mode)
+
+    def is_available(self, reserve: Reserve) -> bool:
+        """Check a reservation fits a capacity"""
+        concurrent_count = self.data_adapter.get_concurrent_count(reserve)
+        return concurrent_count + reserve.count <= self.max_count
+
+    async def promote_waitlist(self, freed: Reserve):
+        """Offer a freed capacity to a first fitting waitlisted draft
+
+        Args:
+            freed:
+                A cancelled (or claimed) reservation, drafts overlapped
+                with it are checked in a waitlist order.
+        """
+        if not self.waitlist:
+            return
+
+        for entry in self.waitlist.get_candidates(self.state_type, freed):
+            if not self.is_available(entry.reserve):
+                continue
+
+            self.waitlist.offer(entry, self.on_offer_expired)
+            text = self.create_claim_text(entry.reserve)
+            reply_markup = InlineKeyboardMarkup()
+            reply_markup.add(InlineKeyboardButton(
+                self.strings.apply_button,
+                callback_data=f"claim-{self.state_type}-{entry.id}"))
+            try:
+                await self.dispatcher.bot.send_message(
+                    entry.chat_id, text, reply_markup=reply_markup,
+                    parse_mode=self.parse_mode)
+            except (ChatNotFound, BotBlocked):
+                self.waitlist.remove(entry.id)
+                continue
+            return
+
+    def on_offer_expired(self, entry):
+        asyncio.ensure_future(self.promote_waitlist(entry.reserve))
+
+    def get_reminder_key(self, reserve: Reserve) -> tuple:
+        """Get a reminder key, reservation identifiers are per resource"""
+        return (self.state_type, reserve.id)
+
+    def schedule_reminder(self, reserve: Reserve) -> bool:
+        """Schedule a reminder of an upcoming reservation
+
+        Returns:
+            True if the reminder is scheduled
+        """
+        if not (self.reminder_scheduler and reserve.user
+                and reserve.user.telegram_id):
+            return False
+
+        return self.reminder_scheduler.schedule(
+            self.get_reminder_key(reserve), reserve.start,
+            reserve.user.telegram_id, self.create_reminder_text(reserve))
+
+    def load_reminders(self, reserves: Optional[iter] = None) -> int:
+        """Schedule reminders of active reservations
+
+        Args:
+            reserves:
+                Optional. Active reservations read beforehand (e.g. in
+                an executor thread), they are read from the data adapter
+                by default.
+
+        Returns:
+            An integer count of scheduled reminders
+        """
+        if not self.reminder_scheduler:
+            return 0
+
+        if reserves is None:
+            reserves = self.data_adapter.get_active_reserves()
+
+        return sum(self.schedule_reminder(reserve) for reserve in reserves)
 
     async def send_to_logger(self, text):
         if self.logger_id:
@@ -594,17 +833,31 @@ class ReserveProcessor(StatedProcessor):
 
         ready = reserve.is_complete and not conflicted
         reply_markup = self.create_book_keyboard(ready)
+        if conflicted and reserve.is_complete and self.waitlist:
+            # Before the Back button
+            reply_markup.inline_keyboard.insert(-1, [InlineKeyboardButton(
+                self.strings.waitlist_button, callback_data="waitlist")])
+        if ready and reserve.user.telegram_id in self.admin_telegram_ids:
+            reply_markup.inline_keyboard.insert(-1, [InlineKeyboardButton(
+                self.strings.repeat_button, callback_data="repeat")])
 
         answer = self.strings.start_book_button_callback
         state = "book"
 
         return (text, reply_markup, state, answer)
 
-    def create_list_message(self, admin_menu: bool = False):
+    def create_list_message(self, admin_menu: bool = False,
+                            page: Optional[str] = None):
         """Prepare a list menu message
         Args:
             admin_menu:
                 A boolean indicates to show admin menu
+            page:
+                Optional. A page of the list to show:
+                    None - the first page
+                    "current" - a page is stored in the state
+                    "next" - a page after the stored one
+                    "prev" - a page before the stored one
 
         Returns:
             text:
@@ -617,16 +870,94 @@ class ReserveProcessor(StatedProcessor):
                 A callback answer text.
         """
         reserve_list = None
+        has_prev = has_next = False
         if self.data_adapter:
-            reserve_list = list(self.data_adapter.get_active_reserves())
+            reserve_list, has_prev, has_next = self.get_list_page(page)
 
         text = self.create_list_text(reserve_list)
-        reply_markup = self.create_list_keyboard(reserve_list, admin_menu)
+        if admin_menu and reserve_list:
+            text += self.create_load_text(
+                reserve.start_date for reserve in reserve_list)
+        reply_markup = self.create_list_keyboard(reserve_list, admin_menu,
+                                                 has_prev, has_next)
         state = "list"
         answer = self.strings.list_button_callback
 
         return (text, reply_markup, state, answer)
 
+    def get_list_page(self, page: Optional[str] = None):
+        """Get a page of active reservations
+
+        A page is fetched by a (start, id) keyset cursor that is stored
+        in the state parameters along with the page boundaries.
+
+        Args:
+            page:
+                Optional. A page of the list (see create_list_message)
+
+        Returns:
+            reserve_list:
+                A list of reservation instances of the page.
+            has_prev:
+                A boolean indicates there is a previous page.
+            has_next:
+                A boolean indicates there is a next page.
+        """
+        params = dict(self.state_manager.params)
+        size = self.list_page_size
+
+        page_cursor = None
+        if page == "current":
+            page_cursor = params.get("list_cursor")
+        elif page == "next":
+            page_cursor = (params.get("list_last")
+                           or params.get("list_cursor"))
+        elif page == "prev" and params.get("list_first"):
+            previous = list(self.data_adapter.get_active_reserves(
+                page_cursor=params["list_first"], limit=size + 1,
+                backward=True))
+            if len(previous) > size:
+                page_cursor = self.get_page_key(previous[0])
+
+        reserve_list = list(self.data_adapter.get_active_reserves(
+            page_cursor=page_cursor, limit=size + 1))
+        has_next = len(reserve_list) > size
+        reserve_list = reserve_list[:size]
+
+        params["list_cursor"] = page_cursor
+        params["list_first"] = (self.get_page_key(reserve_list[0])
+                                if reserve_list else None)
+        params["list_last"] = (self.get_page_key(reserve_list[-1])
+                               if reserve_list else None)
+        self.state_manager.set_params(params)
+
+        return (reserve_list, page_cursor is not None, has_next)
+
+    def get_days_reserves(self, start_date: date, days: int = 1) -> list:
+        """Get an active reservations of a days range
+
+        Args:
+            start_date:
+                A first date of the range
+            days:
+                Optional. An integer count of days in the range
+
+        Returns:
+            A list of reservation instances
+        """
+        start = max(datetime.combine(start_date, time()), datetime.today())
+        end = datetime.combine(start_date + timedelta(days), time())
+
+        return list(self.data_adapter.get_reserves_between(start, end))
+
+    def get_page_key(self, reserve: Reserve) -> tuple:
+        """Get a keyset cursor of a reservation
+
+        Returns:
+            A (start, id) tuple.
+        """
+        return (reserve.start, reserve.id)
+
     def create_detail_message(self, reserve_id: int):
         reserve: Reserve = self.data_adapter.get_data_by_keys(reserve_id)
         text = self.create_book_text(reserve, show_contact=True)
@@ -651,7 +982,8 @@ class ReserveProcessor(StatedProcessor):
         """
         reserve_list = None
         if self.data_adapter:
-            reserve_list = list(self.data_adapter.get_active_reserves())
+            reserve_list = self.get_days_reserves(date.today(),
+                                                  self.date_count)
 
         text = self.create_list_text(reserve_list)
         reply_markup = self.create_date_keyboard()
@@ -675,7 +1007,8 @@ class ReserveProcessor(StatedProcessor):
         """
         reserve_list = None
         if self.data_adapter:
-            reserve_list = list(self.data_adapter.get_active_reserves())
+            reserve_list = self.get_days_reserves(
+                self.state_manager.data.start_date)
 
         text = self.create_list_text(reserve_list)
         reply_markup = self.create_hour_keyboard()
@@ -699,7 +1032,8 @@ class ReserveProcessor(StatedProcessor):
         """
         reserve_list = None
         if self.data_adapter:
-            reserve_list = list(self.data_adapter.get_active_reserves())
+            reserve_list = self.get_days_reserves(
+                self.state_manager.data.start_date)
 
         text = self.create_list_text(reserve_list)
         reply_markup = self.create_minute_keyboard(step=self.minute_step)
@@ -793,6 +1127,28 @@ class ReserveProcessor(StatedProcessor):
 
         return (text, reply_markup, state, answer)
 
+    def create_repeat_message(self):
+        """Prepare a recurrence rule message
+
+        Returns:
+            text:
+                A new message text.
+            reply_markup:
+                A new keyboard reple_markup.
+            state:
+                A new message state.
+            answer:
+                A callback answer text.
+        """
+        reserve: Reserve = self.state_manager.data
+        text = (f"{self.create_book_text(reserve, show_contact=True)}\n"
+                f"{self.strings.repeat_message}")
+        reply_markup = ForceReply()
+        state = "repeat"
+        answer = self.strings.repeat_button_callback
+
+        return (text, reply_markup, state, answer)
+
     def create_main_text(self) -> str:
         """Create a main menu text
 
@@ -875,6 +1231,37 @@ class ReserveProcessor(StatedProcessor):
 
         return result
 
+    def create_load_text(self, days: Iterable[date]) -> str:
+        """Create an admin day load text
+
+        A peak of simultaneous reservations and a count of overlapping
+        reservation pairs are computed by a timeline of a whole day.
+
+        Args:
+            days:
+                Dates of the load (e.g. days of a list page)
+
+        Returns:
+            A load text.
+        """
+        result = f"\n{self.strings.load_header}\n"
+        for day in sorted(set(days)):
+            start = datetime.combine(day, time())
+            timeline = ReserveTimeline.from_reserves(
+                self.data_adapter.get_reserves_between(
+                    start, start + timedelta(1)))
+            peak = timeline.get_peak()
+
+            icon = ""
+            if peak > self.max_count:
+                icon = f"{self.strings.icon_stop} "
+            result += icon + self.strings.load_text.format(
+                day=day.strftime(self.strings.date_format), peak=peak,
+                max_count=self.max_count,
+                conflicts=len(timeline.get_conflicts())) + "\n"
+
+        return result
+
     def create_phone_text(self) -> str:
         """Create a phone message text
 
@@ -885,6 +1272,51 @@ class ReserveProcessor(StatedProcessor):
         return (f"{self.create_book_text(reserve)}\n"
                 f"{self.strings.phone_message}")
 
+    def create_reminder_text(self, reserve: Reserve) -> str:
+        """Create a reminder message text of a reservation"""
+        reminder_text = self.strings.reminder_message.format(
+            service=self.strings.service_type_text,
+            minutes=self.reminder_scheduler.lead_minutes)
+        return (f"{self.strings.reminder_header}\n{reminder_text}"
+                f"\n\n{self.create_book_text(reserve, check=False)}")
+
+    def create_claim_text(self, reserve: Reserve) -> str:
+        """Create a waitlist offer message text of a reservation draft"""
+        claim_text = self.strings.claim_message.format(
+            minutes=int(self.waitlist.claim_timeout // 60))
+        return (f"{self.strings.claim_header}\n{claim_text}"
+                f"\n\n{self.create_book_text(reserve, check=False)}")
+
+    def create_repeat_text(self, reserve: Reserve, appended: list,
+                           conflicts: list) -> str:
+        """Create a recurring reservation report text
+
+        Args:
+            reserve:
+                A reservation draft occurrences are expanded from.
+            appended, conflicts:
+                Lists of appended and conflicting occurrences.
+
+        Returns:
+            A message text.
+        """
+        book_text = self.create_book_text(reserve, check=False,
+                                          show_contact=True)
+        result = f"{self.strings.repeat_header}\n{book_text}"
+
+        occurrences = ([(occurrence.start, self.strings.icon_apply)
+                        for occurrence in appended]
+                       + [(occurrence.start, self.strings.icon_stop)
+                          for occurrence in conflicts])
+        for start, icon in sorted(occurrences):
+            day = start.strftime(self.strings.date_format)
+            start_time = start.strftime(self.strings.time_format)
+            result += f"\n{icon} {day} {start_time}"
+
+        result += "\n\n" + self.strings.repeat_footer.format(
+            appended=len(appended), conflicts=len(conflicts))
+        return result
+
     def create_reserve_text(self, reserve: Reserve) -> str:
         result = ""
         start_time = reserve.start_time.strftime(self.strings.time_format)
@@ -912,11 +1344,19 @@ class ReserveProcessor(StatedProcessor):
         return result
 
     def create_list_keyboard(self, reserve_list: list = None,
-                             admin_menu: bool = False) -> InlineKeyboardMarkup:
+                             admin_menu: bool = False,
+                             has_prev: bool = False,
+                             has_next: bool = False) -> InlineKeyboardMarkup:
         """Create list menu InlineKeyboardMarkup
         Args:
             reserve_list:
                 A list of reservation instances
+            admin_menu:
+                A boolean indicates to show admin menu
+            has_prev:
+                A boolean indicates to show previous page button
+            has_next:
+                A boolean indicates to show next page button
 
         Returns:
             A InlineKeyboardMarkup instance.
@@ -932,6 +1372,17 @@ class ReserveProcessor(StatedProcessor):
 
             result.add(*buttons)
 
+        # Adding Prev- and Next- page buttons in one row
+        buttons = []
+        if has_prev:
+            buttons.append(InlineKeyboardButton(self.strings.prev_button,
+                                                callback_data='prev'))
+        if has_next:
+            buttons.append(InlineKeyboardButton(self.strings.next_button,
+                                                callback_data='next'))
+        if buttons:
+            result.row(*buttons)
+
         button = InlineKeyboardButton(self.strings.back_button,
                                       callback_data='back')
         result.add(button)
@@ -1017,9 +1468,9 @@ class ReserveProcessor(StatedProcessor):
         result = InlineKeyboardMarkup(row_width=3)
 
         buttons = [InlineKeyboardButton(
-                   (now + timedelta(i)).strftime(self.strings.date_format),
+                   self.create_date_button_text(now + timedelta(i)),
                    callback_data=str(i))
-                   for i in range(6)]
+                   for i in range(self.date_count)]
 
         result.add(*buttons)
         button = InlineKeyboardButton(self.strings.back_button,
@@ -1028,13 +1479,51 @@ class ReserveProcessor(StatedProcessor):
 
         return result
 
-    def create_hour_keyboard(self, start: int = 9, count: int = 15,
+    def create_date_button_text(self, day: date) -> str:
+        """Create Date menu button text
+
+        A text contains a day occupancy percent if the data adapter
+        tracks slot occupancy.
+
+        Args:
+            day:
+                A date of the button
+
+        Returns:
+            A button text.
+        """
+        result = day.strftime(self.strings.date_format)
+
+        slots = None
+        if self.data_adapter:
+            slots = self.data_adapter.get_day_occupancy(day)
+
+        if slots is not None:
+            slot_minutes = 24 * 60 // len(slots)
+            capacity = self.max_count * self.work_hours * 60 // slot_minutes
+            occupancy = min(100, sum(slots) * 100 // capacity)
+            result += f" ({occupancy}%)"
+
+        return result
+
+    def create_hour_keyboard(self, start: Optional[int] = None,
+                             count: Optional[int] = None,
                              row_width: int = 5) -> InlineKeyboardMarkup:
         """Create Hour menu InlineKeyboardMarkup
 
+        Args:
+            start:
+                Optional. A first hour, first_hour by default.
+            count:
+                Optional. A count of hours, work_hours by default.
+
         Returns:
             A InlineKeyboardMarkup instance.
         """
+        if start is None:
+            start = self.first_hour
+        if count is None:
+            count = self.work_hours
 
         result = InlineKeyboardMarkup(row_width=row_width)
 
@@ -1094,6 +1583,39 @@ class ReserveProcessor(StatedProcessor):
 
         return result
 
+    def parse_recurrence(self, text: str,
+                         start: date) -> Optional[Recurrence]:
+        """Parse a recurrence rule, e.g. "вт чт 30.06.2021"
+
+        Args:
+            text:
+                Weekday names and a last date of occurrences.
+            start:
+                A first date of occurrences.
+
+        Returns:
+            A recurrence or None if the rule is invalid or has no
+            occurrences (or too many ones)
+        """
+        tokens = re.split(r"[\s,]+", (text or "").strip().lower())
+        try:
+            until = datetime.strptime(tokens[-1],
+                                      self.strings.date_format).date()
+        except ValueError:
+            return None
+
+        weekdays = self.strings.repeat_weekdays
+        if not tokens[:-1] or not set(tokens[:-1]) <= set(weekdays):
+            return None
+
+        recurrence = Recurrence(
+            [weekdays.index(token) for token in tokens[:-1]], until)
+        count = len(recurrence.get_dates(start))
+        if not 0 < count <= recurrence.max_occurrences:
+            return None
+
+        return recurrence
+
     def create_reserve(self, message: Message) -> Reserve:
         """Create new Reserve instance
         An update_state method call this when state hasn't an reservation data.
@@ -35,7 +35,8 @@ class WakeProcessor(ReserveProcessor):
                  strings: any,
                  data_adapter: Union[ReserveDataAdapter, None] = None,
                  user_data_adapter: Union[UserDataAdapter, None] = None,
-                 state_type: Union[str, int, None] = "wake"):
+                 state_type: Union[str, int, None] = "wake",
+                 lazy: bool = False):
         """Initialize a class instance
 
         Args:
@@ -55,13 +56,15 @@ class WakeProcessor(ReserveProcessor):
             parse_mode:
                 Optional. A parse mode of telegram messages (ParseMode).
                 Default value: aiogram.types.ParseMode.MARKDOWN
+            lazy:
+                Optional. Do not load administrators on initialization.
         """
         super().__init__(dispatcher, state_manager, strings,
                          data_adapter=data_adapter,
                          user_data_adapter=user_data_adapter,
-                         state_type=state_type)
+                         state_type=state_type, lazy=lazy)
 
-        self.reserve_set_types["set"] = ReserveSetType("set", 10)
+        self.reserve_set_types["set"] = ReserveSetType.get("set", 10)
 
         dispatcher.register_message_handler(self.cmd_wake, commands=["wake"])
 
@@ -93,9 +96,7 @@ class WakeProcessor(ReserveProcessor):
         user = None
         if self.user_data_adapter:
             user = self.user_data_adapter.get_user_by_telegram_id(from_user.id)
-            self.admin_telegram_ids = [user.telegram_id
-                                       for user
-                                       in self.user_data_adapter.get_admins()]
+            self.load_admins()
 
         if not user:
             user = User(from_user.first_name, from_user.last_name,
@@ -0,0 +1,246 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Callable, Hashable, Optional
+
+from aiogram import Bot
+from aiogram.utils.exceptions import BotBlocked, ChatNotFound, RetryAfter
+from .throttling import TokenBucket
+
+log = logging.getLogger("wakebot.reminders")
+
+
+class Reminder:
+    """A scheduled reminder message
+
+    Attributes:
+        key:
+            A reminder key, e.g. a (resource, reservation id) tuple.
+        remind_at:
+            A datetime the reminder is sent at.
+        chat_id:
+            An integer chat identifier the reminder is sent to.
+        text:
+            A reminder message text.
+    """
+
+    __slots__ = ("key", "remind_at", "chat_id", "text")
+
+    def __init__(self, key: Hashable, remind_at: datetime, chat_id: int,
+                 text: str):
+        self.key = key
+        self.remind_at = remind_at
+        self.chat_id = chat_id
+        self.text = text
+
+    def __repr__(self):
+        return f"Reminder({self.key!r}, {self.remind_at:%Y-%m-%d %H:%M})"
+
+
+class ReminderScheduler:
+    """Reminders of upcoming reservations on a min-heap
+
+    Reminders are kept in a heap ordered by a reminder time, a single
+    timer task sleeps until a heap top is due, so pending reminders
+    cost no storage queries. Scheduling and cancelling is O(log n):
+    a cancelled or rescheduled reminder is left in the heap and skipped
+    when it is popped, stale entries are dropped by a heap rebuild when
+    they outnumber live ones.
+
+    Due reminders are sent through an outbound queue limited by a token
+    bucket, so a burst of reminders (e.g. sets starting at the same
+    time) does not hit Bot API flood limits.
+
+    Times are naive local datetimes as reservation start times are.
+
+    Attributes:
+        bot:
+            A bot reminders are sent with.
+        lead:
+            A timedelta a reminder is sent before a start.
+        parse_mode:
+            A parse mode of reminder messages.
+        sent, failed:
+            Integer counts of sent and failed reminders.
+        pending:
+            An integer count of scheduled reminders.
+    """
+
+    max_sleep = 60.0
+
+    def __init__(self, bot: Bot, lead: timedelta = timedelta(minutes=30),
+                 rate: float = 20.0, capacity: Optional[float] = None,
+                 parse_mode: Optional[str] = None,
+                 clock: Callable[[], datetime] = datetime.now):
+        """Reminders of upcoming reservations on a min-heap
+
+        Args:
+            bot:
+                A bot reminders are sent with.
+            lead:
+                Optional. A timedelta a reminder is sent before a start,
+                30 minutes by default.
+            rate, capacity:
+                Optional. A rate of sent reminders per second
+                and a burst size (the rate by default).
+            parse_mode:
+                Optional. A parse mode of reminder messages.
+            clock:
+                Optional. A function returns a current local datetime.
+        """
+        self.bot = bot
+        self.lead = lead
+        self.parse_mode = parse_mode
+        self.clock = clock
+        self.sent = self.failed = 0
+
+        self.__bucket = TokenBucket(rate, capacity or rate)
+        self.__heap = []
+        self.__reminders = {}
+        self.__sequence = count()
+        self.__changed = None
+        self.__queue = None
+        self.__tasks = []
+
+    @property
+    def pending(self) -> int:
+        """A count of scheduled reminders"""
+        return len(self.__reminders)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__reminders
+
+    @property
+    def lead_minutes(self) -> int:
+        return int(self.lead.total_seconds() // 60)
+
+    def get(self, key: Hashable) -> Optional[Reminder]:
+        return self.__reminders.get(key)
+
+    def schedule(self, key: Hashable, start: datetime, chat_id: int,
+                 text: str) -> bool:
+        """Schedule or reschedule a reminder of a start
+
+        Returns:
+            True if the reminder is scheduled, False if its time is passed
+        """
+        remind_at = start - self.lead
+        if remind_at <= self.clock():
+            self.cancel(key)
+            return False
+
+        reminder = Reminder(key, remind_at, chat_id, text)
+        self.__reminders[key] = reminder
+        heapq.heappush(self.__heap,
+                       (remind_at, next(self.__sequence), reminder))
+        self.compact()
+
+        if self.__changed and self.__heap[0][2] is reminder:
+            # The timer sleeps until a later reminder
+            self.__changed.set()
+        return True
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel a reminder
+
+        Returns:
+            True if the reminder was scheduled
+        """
+        if self.__reminders.pop(key, None) is None:
+            return False
+
+        self.compact()
+        return True
+
+    def compact(self):
+        """Rebuild the heap when stale entries outnumber live ones"""
+        if len(self.__heap) > 2 * len(self.__reminders) + 64:
+            self.__heap = [entry for entry in self.__heap
+                           if self.__reminders.get(entry[2].key)
+                           is entry[2]]
+            heapq.heapify(self.__heap)
+
+    def pop_due(self, now: Optional[datetime] = None) -> list:
+        """Pop reminders are due
+
+        Returns:
+            A list of reminders ordered by a reminder time
+        """
+        now = now or self.clock()
+        result = []
+        heap = self.__heap
+        while heap and heap[0][0] <= now:
+            _, _, reminder = heapq.heappop(heap)
+            if self.__reminders.get(reminder.key) is reminder:
+                del self.__reminders[reminder.key]
+                result.append(reminder)
+
+        return result
+
+    def get_delay(self) -> Optional[float]:
+        """Get seconds until a heap top is due (None if it is empty)"""
+        if not self.__heap:
+            return None
+
+        delay = (self.__heap[0][0] - self.clock()).total_seconds()
+        return max(0.0, delay)
+
+    def start(self):
+        """Start the timer and sender tasks"""
+        if self.__tasks:
+            return
+
+        self.__changed = asyncio.Event()
+        self.__queue = asyncio.Queue()
+        self.__tasks = [asyncio.ensure_future(self.run_timer()),
+                        asyncio.ensure_future(self.run_sender())]
+
+    async def stop(self):
+        """Stop the timer and sender tasks, queued reminders are dropped"""
+        tasks, self.__tasks = self.__tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_timer(self):
+        while True:
+            for reminder in self.pop_due():
+                self.__queue.put_nowait(reminder)
+
+            self.__changed.clear()
+            delay = self.get_delay()
+            # A wall clock may be adjusted, so long sleeps are rechecked
+            timeout = (min(delay, self.max_sleep) if delay is not None
+                       else None)
+            try:
+                await asyncio.wait_for(self.__changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_sender(self):
+        while True:
+            reminder = await self.__queue.get()
+            while not self.__bucket.consume():
+                await asyncio.sleep(1 / self.__bucket.rate)
+            await self.send(reminder)
+
+    async def send(self, reminder: Reminder):
+        for _ in range(3):
+            try:
+                await self.bot.send_message(reminder.chat_id, reminder.text,
+                                            parse_mode=self.parse_mode)
+            except RetryAfter as error:
+                await asyncio.sleep(error.timeout)
+                continue
+            except (BotBlocked, ChatNotFound) as error:
+                log.info(f"{reminder} is not delivered: {error}")
+            except Exception:
+                log.exception(f"{reminder} failed")
+            else:
+                self.sent += 1
+                return
+            break
+
+        self.failed += 1
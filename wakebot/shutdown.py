@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import signal
+import sys
+from time import perf_counter
+from typing import Callable, Optional
+
+from aiogram import types
+from aiogram.dispatcher import Dispatcher
+from aiogram.dispatcher.handler import CancelHandler
+from aiogram.dispatcher.middlewares import BaseMiddleware
+
+log = logging.getLogger("wakebot.shutdown")
+
+
+class ShutdownReport:
+    """A graceful shutdown result
+
+    Attributes:
+        drain_time:
+            A float time in seconds in-flight updates were drained for.
+        drained:
+            An integer count of updates finished during the drain.
+        abandoned:
+            A list of update identifiers cancelled at the deadline.
+        rejected:
+            An integer count of updates rejected after the shutdown start.
+        offset:
+            An update offset confirmed to Telegram (None if not confirmed).
+        errors:
+            A list of flush and close callback error strings.
+    """
+
+    __slots__ = ("drain_time", "drained", "abandoned", "rejected", "offset",
+                 "errors")
+
+    def __init__(self, drain_time: float = 0.0, drained: int = 0,
+                 abandoned: Optional[list] = None, rejected: int = 0,
+                 offset: Optional[int] = None,
+                 errors: Optional[list] = None):
+        self.drain_time = drain_time
+        self.drained = drained
+        self.abandoned = abandoned or []
+        self.rejected = rejected
+        self.offset = offset
+        self.errors = errors or []
+
+    def __repr__(self):
+        return (f"ShutdownReport({self.drain_time * 1000:.0f} ms,"
+                f" drained={self.drained}, abandoned={self.abandoned},"
+                f" rejected={self.rejected})")
+
+
+class GracefulShutdown(BaseMiddleware):
+    """Drain in-flight updates before a process exits
+
+    The middleware tracks updates are being processed. On shutdown it
+    stops polling and rejects new updates, waits for in-flight updates
+    until a deadline (cancelling the rest), confirms handled updates to
+    Telegram, so a next instance does not poll them again, then runs
+    flush and close callbacks in a registration order.
+
+    Attributes:
+        dispatcher:
+            A dispatcher the updates are processed by.
+        timeout:
+            A float drain deadline in seconds.
+        stopping:
+            A boolean indicates the shutdown is started.
+        report:
+            A shutdown report (None until the shutdown is finished).
+    """
+
+    def __init__(self, dispatcher: Dispatcher, timeout: float = 20.0):
+        """Drain in-flight updates before a process exits
+
+        Args:
+            dispatcher:
+                A dispatcher the updates are processed by.
+            timeout:
+                Optional. A float drain deadline in seconds.
+        """
+        super().__init__()
+        self.dispatcher = dispatcher
+        self.timeout = timeout
+        self.stopping = False
+        self.report = None
+
+        self.__in_flight = {}
+        self.__last_update_id = None
+        self.__rejected = 0
+        self.__flush_callbacks = []
+        self.__close_callbacks = []
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.__in_flight)
+
+    def on_flush(self, callback: Callable):
+        """Register a buffered state flush callback (a function or
+        a coroutine function without arguments)"""
+        self.__flush_callbacks.append(callback)
+
+    def on_close(self, callback: Callable):
+        """Register a resource close callback (a function or
+        a coroutine function without arguments)"""
+        self.__close_callbacks.append(callback)
+
+    def add_connection(self, connection):
+        """Close a DB-API connection on shutdown"""
+        self.on_close(connection.close)
+
+    def install_signals(self, loop: asyncio.AbstractEventLoop,
+                        signums: tuple = (signal.SIGTERM,)):
+        """Exit a polling loop on signals (SIGINT is handled already)
+
+        A deploy stops a process with SIGTERM, which kills Python
+        without unwinding. The executor shuts down on SystemExit.
+        """
+        for signum in signums:
+            loop.add_signal_handler(signum, sys.exit)
+
+    async def on_pre_process_update(self, update: types.Update, data: dict):
+        if self.stopping:
+            self.__rejected += 1
+            raise CancelHandler()
+
+        self.__in_flight[asyncio.current_task()] = update.update_id
+        if (self.__last_update_id is None
+                or update.update_id > self.__last_update_id):
+            self.__last_update_id = update.update_id
+
+    async def on_post_process_update(self, update: types.Update,
+                                     results: list, data: dict):
+        self.__in_flight.pop(asyncio.current_task(), None)
+
+    async def drain(self, timeout: float) -> tuple:
+        """Wait for in-flight updates, cancel them at a deadline
+
+        Returns:
+            A (drained count, abandoned update identifiers) tuple
+        """
+        tasks = dict(self.__in_flight)
+        if not tasks:
+            return 0, []
+
+        done, pending = await asyncio.wait(list(tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+        abandoned = sorted(tasks[task] for task in pending)
+        for task in tasks:
+            self.__in_flight.pop(task, None)
+
+        return len(done), abandoned
+
+    async def confirm_offset(self, abandoned: list) -> Optional[int]:
+        """Confirm handled updates, abandoned ones are delivered again
+
+        Returns:
+            A confirmed update offset or None
+        """
+        if self.__last_update_id is None:
+            return None
+
+        offset = (min(abandoned) if abandoned
+                  else self.__last_update_id + 1)
+        await self.dispatcher.bot.get_updates(offset=offset, limit=1,
+                                              timeout=0)
+        return offset
+
+    async def run_callbacks(self, callbacks: list, errors: list):
+        for callback in callbacks:
+            try:
+                result = callback()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as error:
+                log.exception(f"Shutdown callback {callback!r} failed")
+                errors.append(f"{callback!r}: {error}")
+
+    async def shutdown(self, confirm: bool = True) -> ShutdownReport:
+        """Stop accepting updates, drain, flush and close
+
+        Args:
+            confirm:
+                Optional. A boolean indicates to confirm a polling offset
+                (disable in a webhook mode).
+
+        Returns:
+            A shutdown report
+        """
+        if self.report:
+            return self.report
+
+        self.stopping = True
+        self.dispatcher.stop_polling()
+
+        start = perf_counter()
+        drained, abandoned = await self.drain(self.timeout)
+        drain_time = perf_counter() - start
+
+        errors = []
+        offset = None
+        if confirm:
+            try:
+                offset = await self.confirm_offset(abandoned)
+            except Exception as error:
+                log.exception("Update offset confirmation failed")
+                errors.append(f"confirm_offset: {error}")
+
+        await self.run_callbacks(self.__flush_callbacks, errors)
+        await self.run_callbacks(self.__close_callbacks, errors)
+
+        self.report = ShutdownReport(drain_time, drained, abandoned,
+                                     self.__rejected, offset, errors)
+        if abandoned or errors:
+            log.warning(f"Shutdown is not clean: {self.report}"
+                        + "".join(f"\n{error}" for error in errors))
+        else:
+            log.info(f"Shutdown: {self.report}")
+
+        return self.report
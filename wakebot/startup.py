@@ -0,0 +1,201 @@
+import asyncio
+import logging
+from time import perf_counter
+from typing import Callable, Iterable, Optional
+
+from aiogram import types
+from aiogram.dispatcher.handler import current_handler
+from aiogram.dispatcher.middlewares import BaseMiddleware
+from .metrics.registry import MetricsRegistry
+
+log = logging.getLogger("wakebot.startup")
+
+
+class Startup(BaseMiddleware):
+    """Deferred storage startup of a bot
+
+    Storage adapters are created lazily (without a connection), so
+    a process starts polling at once. The startup connects adapters
+    concurrently in executor threads, checks their schema, runs
+    required warmers, then marks a storage ready and warms other caches
+    in the background. A failed step is retried with an exponential
+    backoff, so a database outage at boot delays handlers instead of
+    failing them until a restart.
+
+    Handlers which do not need a storage (e.g. /start and /help) are
+    served immediately, other handlers wait for the storage:
+
+        startup = Startup([user_adapter, wake_adapter])
+        startup.serve_immediately(default_processor.cmd_start)
+        startup.add_warmer("admins", wake_processor.load_admins,
+                           required=True)
+        dp.middleware.setup(startup)
+        ...
+        startup.start()  # in on_startup
+
+    Attributes:
+        adapters:
+            A list of adapters with connect and create_table methods.
+        timings:
+            A dictionary of float phase times in seconds by a phase
+            name ("connect", "schema", "ready", "warm:<name>").
+        waited:
+            An integer count of updates waited for the storage.
+        failures:
+            An integer count of failed startup attempts.
+    """
+
+    def __init__(self, adapters: Iterable,
+                 registry: Optional[MetricsRegistry] = None,
+                 retry_delay: float = 1.0, max_retry_delay: float = 30.0):
+        """Deferred storage startup of a bot
+
+        Args:
+            adapters:
+                Adapters with connect and create_table methods.
+            registry:
+                Optional. A metrics registry startup phase times are
+                stored in.
+            retry_delay:
+                Optional. A float delay in seconds before a first retry
+                of a failed startup, it is doubled on every failure.
+            max_retry_delay:
+                Optional. A float maximum delay in seconds of a retry.
+        """
+        super().__init__()
+        self.adapters = list(adapters)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.timings = {}
+        self.waited = 0
+        self.failures = 0
+
+        self.__created = perf_counter()
+        self.__immediate = set()
+        self.__warmers = []
+        self.__ready = None
+        self.__task = None
+        self.__gauge = None
+        if registry:
+            self.__gauge = registry.gauge(
+                "wakebot_startup_seconds",
+                "Startup phase times in seconds since a process start",
+                ("phase",))
+
+    @property
+    def is_ready(self) -> bool:
+        ready = self.__ready
+        return bool(ready and ready.done())
+
+    def serve_immediately(self, *handlers: Callable):
+        """Serve handlers before a storage is ready"""
+        self.__immediate.update(handlers)
+
+    def add_warmer(self, name: str, callback: Callable,
+                   required: bool = False):
+        """Run a callback on a connected storage
+
+        A blocking callback is run in an executor thread, a coroutine
+        function is awaited in the loop. A required callback (e.g.
+        an administrators list handlers rely on) is run before
+        a storage is ready, its failure is retried as a startup one,
+        other callbacks are run in the background on a ready storage.
+        """
+        self.__warmers.append((name, callback, required))
+
+    def start(self) -> asyncio.Task:
+        """Start the startup task (once)"""
+        if not self.__task:
+            self.__ready = asyncio.get_event_loop().create_future()
+            self.__task = asyncio.ensure_future(self.run())
+        return self.__task
+
+    async def wait_ready(self):
+        """Wait for a ready storage"""
+        self.start()
+        await asyncio.shield(self.__ready)
+
+    def record(self, phase: str, seconds: float):
+        self.timings[phase] = seconds
+        if self.__gauge:
+            self.__gauge.set(seconds, phase=phase)
+
+    async def run_phase(self, phase: str, callbacks: list):
+        """Run blocking callbacks concurrently in executor threads"""
+        loop = asyncio.get_event_loop()
+        start = perf_counter()
+        await asyncio.gather(*[loop.run_in_executor(None, callback)
+                               for callback in callbacks])
+        self.record(phase, perf_counter() - start)
+
+    async def run(self):
+        """Connect adapters, check the schema, then warm caches"""
+        delay = self.retry_delay
+        while True:
+            try:
+                await self.run_phase(
+                    "connect",
+                    [adapter.connect for adapter in self.adapters])
+                # Lazy adapters skip a schema check (DDL) in their
+                # constructors, it runs here in executor threads
+                await self.run_phase(
+                    "schema",
+                    [adapter.create_table for adapter in self.adapters])
+                await asyncio.gather(
+                    *[self.run_warmer(name, callback)
+                      for name, callback, required in self.__warmers
+                      if required])
+                break
+            except Exception:
+                self.failures += 1
+                log.exception(f"Storage startup failed, retry in {delay} s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+        self.record("ready", perf_counter() - self.__created)
+        self.__ready.set_result(True)
+        log.info(f"Storage is ready in {self.timings['ready'] * 1000:.0f} ms"
+                 f" (connect {self.timings['connect'] * 1000:.0f} ms,"
+                 f" schema {self.timings['schema'] * 1000:.0f} ms),"
+                 f" {self.waited} updates waited")
+
+        await asyncio.gather(*[self.warm(name, callback)
+                               for name, callback, required in self.__warmers
+                               if not required])
+
+    async def run_warmer(self, name: str, callback: Callable):
+        if asyncio.iscoroutinefunction(callback):
+            start = perf_counter()
+            await callback()
+            self.record(f"warm:{name}", perf_counter() - start)
+        else:
+            await self.run_phase(f"warm:{name}", [callback])
+
+        log.info(f"Cache {name} is warmed in"
+                 f" {self.timings[f'warm:{name}'] * 1000:.0f} ms")
+
+    async def warm(self, name: str, callback: Callable):
+        try:
+            await self.run_warmer(name, callback)
+        except Exception:
+            log.exception(f"Cache warming {name} failed")
+
+    def close(self):
+        """Close connections of connected adapters"""
+        for adapter in self.adapters:
+            if adapter.connection:
+                adapter.connection.close()
+
+    async def wait_handler(self):
+        if self.is_ready or current_handler.get() in self.__immediate:
+            return
+
+        self.waited += 1
+        await self.wait_ready()
+
+    async def on_process_message(self, message: types.Message, data: dict):
+        await self.wait_handler()
+
+    async def on_process_callback_query(
+            self, callback_query: types.CallbackQuery, data: dict):
+        await self.wait_handler()
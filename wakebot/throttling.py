@@ -0,0 +1,195 @@
+import logging
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Optional
+
+from aiogram import types
+from aiogram.dispatcher.handler import CancelHandler
+from aiogram.dispatcher.middlewares import BaseMiddleware
+from .metrics.middleware import get_callback_action, get_message_action
+from .metrics.registry import MetricsRegistry
+
+log = logging.getLogger("wakebot.throttling")
+
+
+class TokenBucket:
+    """A token bucket rate limiter
+
+    A bucket is refilled with rate tokens per second up to a capacity,
+    every request takes a token, so bursts up to the capacity pass
+    and a sustained rate is limited.
+
+    Attributes:
+        rate:
+            A float count of tokens per second.
+        capacity:
+            A float maximum count of tokens (a burst size).
+        tokens:
+            A float count of available tokens.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "clock")
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def consume(self, tokens: float = 1.0) -> bool:
+        """Take tokens if they are available
+
+        Returns:
+            True if the tokens are taken, False if a request is throttled
+        """
+        now = self.clock()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens < tokens:
+            return False
+
+        self.tokens -= tokens
+        return True
+
+    def refund(self, tokens: float = 1.0):
+        """Return taken tokens of a request throttled elsewhere"""
+        self.tokens = min(self.capacity, self.tokens + tokens)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Per-user and global token bucket throttling of updates
+
+    Updates are checked before filters and handlers, so a throttled tap
+    costs no storage query. A throttled callback query gets a short
+    answer (a client stops a button spinner), a throttled message
+    is dropped silently.
+
+    A category is a collapsed callback data or a message command
+    (see metrics.middleware), a limit of a category is looked up in
+    limits, "*" is a default limit:
+
+        ThrottlingMiddleware({"*": (2, 6), "next": (1, 3)})
+
+    Attributes:
+        limits:
+            A dictionary of per-user (rate, capacity) tuples
+            by a category.
+        global_bucket:
+            A token bucket shared by all users (None if not limited).
+        answer_text:
+            A callback query answer text of a throttled tap.
+        size:
+            An integer maximum count of kept user buckets.
+        throttled:
+            An integer count of throttled updates.
+    """
+
+    answer_text = "Слишком часто, подождите немного"
+
+    def __init__(self, limits: Optional[dict] = None,
+                 global_rate: Optional[float] = None,
+                 global_capacity: Optional[float] = None,
+                 registry: Optional[MetricsRegistry] = None,
+                 answer_text: Optional[str] = None,
+                 size: int = 10000,
+                 clock: Callable[[], float] = monotonic):
+        """Per-user and global token bucket throttling of updates
+
+        Args:
+            limits:
+                Optional. A dictionary of per-user (rate, capacity)
+                tuples by a category, 2 per second with bursts of 6
+                by default.
+            global_rate, global_capacity:
+                Optional. A rate and a capacity of the global bucket,
+                updates are not limited globally by default.
+            registry:
+                Optional. A metrics registry throttling counters
+                are stored in.
+            answer_text:
+                Optional. A callback query answer text of a throttled tap.
+            size:
+                Optional. An integer maximum count of kept user buckets.
+            clock:
+                Optional. A function returns a current time in seconds.
+        """
+        super().__init__()
+        self.limits = limits or {"*": (2.0, 6.0)}
+        self.global_bucket = None
+        if global_rate:
+            self.global_bucket = TokenBucket(
+                global_rate, global_capacity or global_rate, clock)
+        if answer_text:
+            self.answer_text = answer_text
+        self.size = size
+        self.clock = clock
+        self.throttled = 0
+
+        self.__buckets = OrderedDict()
+        self.__counter = None
+        if registry:
+            self.__counter = registry.counter(
+                "wakebot_updates_throttled_total",
+                "Throttled updates by a category and a limit scope",
+                ("update", "category", "scope"))
+
+    def get_bucket(self, user_id: int, category: str) -> Optional[TokenBucket]:
+        limit = self.limits.get(category, self.limits.get("*"))
+        if not limit:
+            return None
+
+        key = (user_id, category if category in self.limits else "*")
+        bucket = self.__buckets.get(key)
+        if bucket is None:
+            bucket = self.__buckets[key] = TokenBucket(*limit, self.clock)
+            if len(self.__buckets) > self.size:
+                # A least recently used bucket is refilled most likely
+                self.__buckets.popitem(last=False)
+        else:
+            self.__buckets.move_to_end(key)
+
+        return bucket
+
+    def check(self, update: str, user_id: int, category: str) -> bool:
+        """Take a token of a user and a global bucket
+
+        A user token is returned if the global bucket throttles
+        an update, so a global burst doesn't drain user buckets.
+
+        Returns:
+            True if an update is allowed, False if it is throttled
+        """
+        scope = None
+        bucket = self.get_bucket(user_id, category)
+        if bucket and not bucket.consume():
+            scope = "user"
+        elif self.global_bucket and not self.global_bucket.consume():
+            scope = "global"
+            if bucket:
+                bucket.refund()
+
+        if not scope:
+            return True
+
+        self.throttled += 1
+        if self.__counter:
+            self.__counter.inc(update=update, category=category, scope=scope)
+        log.debug(f"Throttled {update} {category} of {user_id} ({scope})")
+        return False
+
+    async def on_pre_process_message(self, message: types.Message,
+                                     data: dict):
+        if not self.check("message", message.from_user.id,
+                          get_message_action(message)):
+            raise CancelHandler()
+
+    async def on_pre_process_callback_query(
+            self, callback_query: types.CallbackQuery, data: dict):
+        if not self.check("callback_query", callback_query.from_user.id,
+                          get_callback_action(callback_query.data)):
+            await callback_query.answer(self.answer_text)
+            raise CancelHandler()
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Callable, Optional
+
+from .entities.reserve import Reserve
+
+log = logging.getLogger("wakebot.waitlist")
+
+
+class WaitlistEntry:
+    """A waitlisted reservation draft
+
+    Attributes:
+        id:
+            An integer entry identifier.
+        resource:
+            A resource of the draft (a processor state type).
+        reserve:
+            A complete reservation draft.
+        chat_id:
+            An integer chat identifier an offer is sent to.
+        offered_until:
+            A datetime an open offer expires at (None if not offered).
+    """
+
+    __slots__ = ("id", "resource", "reserve", "chat_id", "offered_until",
+                 "timer")
+
+    def __init__(self, id: int, resource: str, reserve: Reserve,
+                 chat_id: int):
+        self.id = id
+        self.resource = resource
+        self.reserve = reserve
+        self.chat_id = chat_id
+        self.offered_until = None
+        self.timer = None
+
+    @property
+    def key(self) -> tuple:
+        return (self.resource, self.reserve.start_date)
+
+    def __repr__(self):
+        return (f"WaitlistEntry({self.id}, {self.resource!r},"
+                f" {self.reserve.start:%Y-%m-%d %H:%M}, {self.chat_id})")
+
+
+class Waitlist:
+    """Waitlisted reservation drafts by a resource and a day
+
+    Entries are indexed by a resource and a start day in an insertion
+    order, so a cancellation looks up only drafts of its day and offers
+    freed capacity first come, first served. Nothing rescans the list
+    periodically: promotions are driven by cancellations, claims and
+    offer expirations.
+
+    An offer is time-limited, an expired offer drops the entry and
+    calls an expiration callback, so a next entry is promoted.
+
+    Attributes:
+        claim_timeout:
+            A float time in seconds an offer can be claimed for.
+        pending:
+            An integer count of waitlisted entries.
+    """
+
+    def __init__(self, claim_timeout: float = 600.0,
+                 clock: Callable[[], datetime] = datetime.now):
+        """Waitlisted reservation drafts by a resource and a day
+
+        Args:
+            claim_timeout:
+                Optional. A float time in seconds an offer can be
+                claimed for, 10 minutes by default.
+            clock:
+                Optional. A function returns a current local datetime.
+        """
+        self.claim_timeout = claim_timeout
+        self.clock = clock
+
+        self.__entries = {}
+        self.__days = {}
+        self.__ids = count(1)
+
+    @property
+    def pending(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, entry_id: int) -> bool:
+        return entry_id in self.__entries
+
+    def get(self, entry_id: int) -> Optional[WaitlistEntry]:
+        return self.__entries.get(entry_id)
+
+    def add(self, resource: str, reserve: Reserve,
+            chat_id: int) -> WaitlistEntry:
+        """Add a reservation draft to the end of its day list
+
+        A repeated draft of a chat with the same start keeps its place.
+
+        Returns:
+            A waitlist entry
+        """
+        self.purge()
+        day = self.__days.setdefault((resource, reserve.start_date),
+                                     OrderedDict())
+        for entry in day.values():
+            if (entry.chat_id == chat_id
+                    and entry.reserve.start == reserve.start):
+                entry.reserve = reserve
+                return entry
+
+        entry = WaitlistEntry(next(self.__ids), resource, reserve, chat_id)
+        day[entry.id] = entry
+        self.__entries[entry.id] = entry
+        return entry
+
+    def remove(self, entry_id: int) -> Optional[WaitlistEntry]:
+        """Remove an entry and cancel its offer timer"""
+        entry = self.__entries.pop(entry_id, None)
+        if entry is None:
+            return None
+
+        if entry.timer:
+            entry.timer.cancel()
+            entry.timer = None
+        day = self.__days.get(entry.key)
+        if day is not None:
+            day.pop(entry.id, None)
+            if not day:
+                del self.__days[entry.key]
+
+        return entry
+
+    def purge(self):
+        """Remove entries of past days"""
+        now = self.clock()
+        for key in [key for key in self.__days if key[1] < now.date()]:
+            for entry_id in list(self.__days[key]):
+                self.remove(entry_id)
+
+    def get_candidates(self, resource: str, freed: Reserve) -> list:
+        """Get entries are not offered and overlap a freed reservation
+
+        Returns:
+            A list of entries in a waitlist order
+        """
+        day = self.__days.get((resource, freed.start_date))
+        if not day:
+            return []
+
+        now = self.clock()
+        result = []
+        for entry in list(day.values()):
+            reserve = entry.reserve
+            if reserve.start <= now:
+                self.remove(entry.id)
+            elif (entry.offered_until is None
+                  and reserve.start < freed.end
+                  and freed.start < reserve.end):
+                result.append(entry)
+
+        return result
+
+    def offer(self, entry: WaitlistEntry,
+              on_expire: Optional[Callable[[WaitlistEntry], None]] = None):
+        """Open a time-limited offer of an entry
+
+        Args:
+            entry:
+                A waitlist entry.
+            on_expire:
+                Optional. A function is called with an entry when
+                an offer expires unclaimed - f(entry).
+        """
+        loop = asyncio.get_event_loop()
+        entry.offered_until = self.clock() + timedelta(
+            seconds=self.claim_timeout)
+        entry.timer = loop.call_later(self.claim_timeout, self.expire,
+                                      entry.id, on_expire)
+
+    def expire(self, entry_id: int,
+               on_expire: Optional[Callable[[WaitlistEntry], None]] = None):
+        entry = self.__entries.get(entry_id)
+        if entry is None:
+            return
+
+        entry.timer = None
+        self.remove(entry_id)
+        log.info(f"{entry} offer expired")
+        if on_expire:
+            on_expire(entry)
+
+    def get_offer(self, entry_id: int) -> Optional[WaitlistEntry]:
+        """Get an entry of an open offer
+
+        Returns:
+            An entry, None if an offer is expired or not open
+        """
+        entry = self.__entries.get(entry_id)
+        if (entry is None or entry.offered_until is None
+                or entry.offered_until < self.clock()):
+            # An expired entry is removed by its timer
+            return None
+
+        return entry
+
+    def withdraw(self, entry_id: int) -> Optional[WaitlistEntry]:
+        """Close an offer, an entry keeps its place in the day list"""
+        entry = self.__entries.get(entry_id)
+        if entry is None:
+            return None
+
+        if entry.timer:
+            entry.timer.cancel()
+            entry.timer = None
+        entry.offered_until = None
+        return entry
+
+    def claim(self, entry_id: int) -> Optional[WaitlistEntry]:
+        """Claim an open offer
+
+        Returns:
+            A removed entry, None if an offer is expired or not open
+        """
+        if self.get_offer(entry_id) is None:
+            return None
+
+        return self.remove(entry_id)